@@ -1,46 +1,71 @@
 import os
-from flask import Flask, render_template, jsonify, request
+import json
+import time
+from datetime import date
+from flask import Flask, render_template, jsonify, request, Response, stream_with_context, g
 from basketball_simulator_agency.database_agent.tools.CreateSchemasTool import CreateSchemasTool
 from basketball_simulator_agency.web_scraper_agent.tools.ScrapePlayersTool import ScrapePlayersTool
 from basketball_simulator_agency.database_agent.tools.LoadDataTool import LoadDataTool
 from basketball_simulator_agency.web_scraper_agent.tools.ScrapePlayerStatsTool import ScrapePlayerStatsTool
-import psycopg2
-from urllib.parse import urlparse
 from agency_swarm import Agency
 from basketball_simulator_agency.game_simulation_agent.tools.SimulateGameTool import SimulateGameTool
 from basketball_simulator_agency.game_simulation_agent.tools.SimulateDailyGamesTool import SimulateDailyGamesTool
+from basketball_simulator_agency.game_simulation_agent.tools.SimulateSeasonTool import SimulateSeasonTool
+from basketball_simulator_agency.game_simulation_agent.monte_carlo import DEFAULT_ENGINE, ENGINES
+from basketball_simulator_agency.game_simulation_agent.rng import resolve_seed
+from basketball_simulator_agency.game_simulation_agent.result_cache import cache_key, result_cache
+from basketball_simulator_agency.game_simulation_agent.roster_cache import roster_cache
+from basketball_simulator_agency.game_simulation_agent.serialization import CONTENT_TYPES, encode, negotiate
+from basketball_simulator_agency.game_simulation_agent.job_queue import QueueFull, SUCCEEDED, FAILED, job_queue
+from basketball_simulator_agency.game_simulation_agent.job_worker import register_handlers
+from basketball_simulator_agency.game_simulation_agent.simulation_archive import get_archive
+from basketball_simulator_agency.team_names import get_resolver
+from basketball_simulator_agency.database_agent.connection_pool import get_connection
+from basketball_simulator_agency.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, HTTP_REQUEST_SECONDS, registry
+from basketball_simulator_agency import bootstrap
 
 app = Flask(__name__)
 
-# Initialize database and load data on startup
-try:
-    # Verify OpenAI API key
-    openai_key = os.getenv('OPENAI_API_KEY')
-    if not openai_key:
-        print("WARNING: OPENAI_API_KEY not set. Game simulations will not work!")
-    else:
-        print("OpenAI API key verified")
-    
-    print("Initializing database schema...")
-    create_schemas = CreateSchemasTool()
-    create_schemas.run()
-    
-    print("Scraping player data...")
-    players_tool = ScrapePlayersTool()
-    players_tool.run()
-    
-    print("Scraping player statistics...")
-    stats_tool = ScrapePlayerStatsTool()
-    stats_tool.run()
-    
-    print("Loading player data...")
-    load_tool = LoadDataTool()
-    load_tool.run()
-    
-    print("Database initialization complete!")
-except Exception as e:
-    print(f"Error during initialization: {str(e)}")
-    print("Continuing with partial initialization...")
+# Upper bound on Monte Carlo runs for a single matchup request
+MAX_SIMULATION_RUNS = 100000
+
+# Upper bound on simulated seasons for a single season projection request
+MAX_SEASON_RUNS = 100000
+
+# Upper bound on matchups in a single bulk simulation job
+MAX_JOB_GAMES = 100
+
+# Seconds clients are asked to wait before resubmitting to a full job queue
+QUEUE_FULL_RETRY_AFTER = 10
+
+# Upper bound on archived games returned by a single archive query
+MAX_ARCHIVE_GAMES = 1000
+
+# Verify OpenAI API key
+openai_key = os.getenv('OPENAI_API_KEY')
+if not openai_key:
+    print("WARNING: OPENAI_API_KEY not set. Game simulations will not work!")
+else:
+    print("OpenAI API key verified")
+
+# Create the schema and load data once per deployment; by default this runs
+# in a background thread so the worker can serve requests immediately
+bootstrap.start()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    """Observe the request latency by route pattern, so label values stay bounded."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(route, request.method, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+    return response
 
 @app.route('/')
 def index():
@@ -56,7 +81,7 @@ def index():
 
 # Print environment variables for debugging
 print("=== Environment Variables ===")
-print(f"DATABASE_URL: {os.getenv('DATABASE_URL')}")
+print(f"DATABASE_URL set: {bool(os.getenv('DATABASE_URL'))}")
 print(f"RENDER: {os.getenv('RENDER')}")
 print("=== End Environment Variables ===")
 
@@ -124,65 +149,111 @@ def load_data():
             'message': f'Error loading data: {str(e)}'
         }), 500
 
+@app.route('/healthz')
+def healthz():
+    """Liveness check: the process is up, with bootstrap progress for information."""
+    return jsonify({
+        'status': 'ok',
+        'bootstrap': bootstrap.status.snapshot()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Timers and counters of this worker process in the Prometheus text format."""
+    return Response(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/readyz')
+def readyz():
+    """Readiness check: 200 once the data bootstrap has finished, 503 until then."""
+    snapshot = bootstrap.status.snapshot()
+    if not bootstrap.status.ready:
+        return jsonify({'status': 'not_ready', 'bootstrap': snapshot}), 503
+    return jsonify({'status': 'ready', 'bootstrap': snapshot})
+
 def verify_db_connection():
     """Verify database connection is working."""
     try:
-        db_url = os.getenv('DATABASE_URL')
-        if not db_url:
-            raise Exception("DATABASE_URL environment variable not set")
-            
         print(f"Verifying database connection...")
-        result = urlparse(db_url)
-        username = result.username
-        password = result.password
-        database = result.path[1:]
-        hostname = result.hostname
-        
-        conn = psycopg2.connect(
-            database=database,
-            user=username,
-            password=password,
-            host=hostname
-        )
-        conn.close()
+        # Checking out a pooled connection runs its health check
+        with get_connection():
+            pass
         print("Database connection verified successfully")
         return True
     except Exception as e:
         print(f"Database connection verification failed: {str(e)}")
         return False
 
+def cached_response(kind, params, compute, fmt='json'):
+    """
+    Serve compute() encoded as fmt from the result cache, keyed by kind, the
+    format, the request parameters and the current data version, computing
+    it on a miss.
+    """
+    version = roster_cache.version(get_connection)
+    body = result_cache.get_or_compute(
+        cache_key(kind, version, fmt, *params), version,
+        lambda: encode(compute(), fmt)
+    )
+    return Response(body, content_type=CONTENT_TYPES[fmt])
+
 @app.route('/simulate_game/<home_team>/<away_team>')
 def simulate_game(home_team, away_team):
+    """
+    Simulate one game, or with ?runs=K simulate the matchup K times and return
+    win probability and score distributions. Add &stream=true to receive the
+    partial aggregates as newline-delimited JSON while the runs progress.
+    ?mode=possession plays every possession instead of drawing box scores,
+    and ?seed=N reproduces a previous result; the seed used is returned.
+
+    Seeded requests and ?runs=K aggregates are served from the result cache
+    until the player data changes. An unseeded aggregate is a Monte Carlo
+    estimate, so repeats get the first one; an unseeded single game is
+    simulated afresh every time.
+    """
+    runs = request.args.get('runs', type=int)
+    if runs is not None and not 1 <= runs <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"runs must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+    mode = request.args.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    requested_seed = request.args.get('seed', type=int)
+    seed = resolve_seed(requested_seed)
+
     try:
         print(f"\nAttempting to simulate game: {home_team} vs {away_team}")
         
-        # Get database connection details
-        db_url = os.getenv('DATABASE_URL')
-        if not db_url:
-            raise Exception("DATABASE_URL environment variable not set")
-            
-        result = urlparse(db_url)
-        username = result.username
-        password = result.password
-        database = result.path[1:]
-        hostname = result.hostname
-        
-        if not verify_db_connection():
-            raise Exception("Could not connect to database")
-            
-        # Create SimulateGameTool with team names and database details
+        # Create SimulateGameTool with team names; it checks out a pooled
+        # connection only when the roster cache misses
         game_tool = SimulateGameTool(
             home_team=home_team, 
             away_team=away_team,
-            db_name=database,
-            db_user=username,
-            db_password=password,
-            db_host=hostname
+            seed=seed,
+            mode=mode
         )
-        result = game_tool.run()
-        print("Game simulation completed successfully")
-        
-        return jsonify({"result": result})
+
+        if runs is not None:
+            if stream:
+                aggregates = game_tool.simulate_matchup(runs)
+                def generate():
+                    for aggregate in aggregates:
+                        yield json.dumps({**aggregate.summary(), 'seed': seed}) + "\n"
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+            def simulate_runs():
+                for aggregate in game_tool.simulate_matchup(runs):
+                    pass
+                print(f"Simulated {runs} runs successfully")
+                return {"result": aggregate.summary(), "seed": seed}
+            return cached_response('simulate_game', (home_team, away_team, mode, runs, requested_seed), simulate_runs)
+
+        def simulate_one():
+            result = game_tool.simulate(seed)
+            print("Game simulation completed successfully")
+            return {"result": result, "seed": seed}
+        if requested_seed is None:
+            return jsonify(simulate_one())
+        return cached_response('simulate_game', (home_team, away_team, mode, None, requested_seed), simulate_one)
     except Exception as e:
         print(f"Error in simulate_game: {str(e)}")
         print(f"Error type: {type(e)}")
@@ -192,34 +263,20 @@ def simulate_game(home_team, away_team):
 
 @app.route('/simulate_daily')
 def simulate_daily():
+    """Simulate today's slate; ?seed=N reproduces a previous result."""
+    seed = resolve_seed(request.args.get('seed', type=int))
     try:
         print("\nAttempting to simulate daily games")
         
-        # Get database connection details
-        db_url = os.getenv('DATABASE_URL')
-        if not db_url:
-            raise Exception("DATABASE_URL environment variable not set")
-            
-        result = urlparse(db_url)
-        username = result.username
-        password = result.password
-        database = result.path[1:]
-        hostname = result.hostname
-        
         if not verify_db_connection():
             raise Exception("Could not connect to database")
             
-        # Use SimulateDailyGamesTool with database parameters
-        daily_tool = SimulateDailyGamesTool(
-            db_name=database,
-            db_user=username,
-            db_password=password,
-            db_host=hostname
-        )
+        # Use SimulateDailyGamesTool with the shared connection pool
+        daily_tool = SimulateDailyGamesTool(seed=seed)
         result = daily_tool.run()
         print("Daily games simulation completed successfully")
         
-        return jsonify({"result": result})
+        return jsonify({"result": result, "seed": seed})
     except Exception as e:
         print(f"Error in simulate_daily: {str(e)}")
         print(f"Error type: {type(e)}")
@@ -227,6 +284,95 @@ def simulate_daily():
         print(f"Full traceback:\n{traceback.format_exc()}")
         return jsonify({"error": f"Error simulating daily games: {str(e)}"}), 500
 
+def sse_event(event, payload):
+    """One server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/simulate_daily/stream')
+def simulate_daily_stream():
+    """
+    Stream today's slate as server-sent events: 'start' with the schedule,
+    one 'game' per game in schedule order as soon as it is simulated, then
+    'end', or 'failed' with an error message. Accepts seed, replications,
+    mode and date like /api/v2/simulate_daily; each game carries its formatted
+    text and its structured result.
+    """
+    replications = request.args.get('replications', 1, type=int)
+    if not 1 <= replications <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"replications must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    mode = request.args.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    game_date = request.args.get('date')
+    try:
+        if game_date is not None:
+            date.fromisoformat(game_date)
+    except ValueError:
+        return jsonify({"error": "date must be formatted as YYYY-MM-DD"}), 400
+    seed = resolve_seed(request.args.get('seed', type=int))
+    daily_tool = SimulateDailyGamesTool(seed=seed, replications=replications, mode=mode, game_date=game_date)
+
+    def generate():
+        try:
+            print("\nStreaming daily games simulation")
+            games, rosters = daily_tool.schedule()
+            yield sse_event('start', {
+                'title': daily_tool.format_title(),
+                'seed': seed,
+                'games': [{'away_team': away_team, 'home_team': home_team} for away_team, home_team in games]
+            })
+            slate = [None] * len(games)
+            for index, slate_game in daily_tool.iter_games(games, rosters, seed):
+                away_team, home_team = games[index]
+                slate[index] = slate_game
+                yield sse_event('game', {
+                    'index': index,
+                    'text': daily_tool.format_slate_game(rosters, away_team, home_team, slate_game),
+                    **daily_tool.game_payload(rosters, away_team, home_team, slate_game)
+                })
+            daily_tool.archive_slate(games, rosters, slate, seed)
+            yield sse_event('end', {'games': len(games)})
+        except Exception as e:
+            print(f"Error in simulate_daily_stream: {str(e)}")
+            import traceback
+            print(f"Full traceback:\n{traceback.format_exc()}")
+            yield sse_event('failed', {'error': f"Error simulating daily games: {str(e)}"})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/simulate_season')
+def simulate_season():
+    """
+    Simulate the full season ?seasons=N times (default 10000) and return
+    projected standings, seed probabilities and playoff and title odds.
+    Projections are served from the result cache until the player data
+    changes; without ?seed=N repeats get the first projection.
+    """
+    seasons = request.args.get('seasons', 10000, type=int)
+    if not 1 <= seasons <= MAX_SEASON_RUNS:
+        return jsonify({"error": f"seasons must be between 1 and {MAX_SEASON_RUNS}"}), 400
+    requested_seed = request.args.get('seed', type=int)
+    seed = resolve_seed(requested_seed)
+
+    try:
+        def project():
+            print(f"\nAttempting to simulate {seasons} seasons")
+            season_tool = SimulateSeasonTool(seasons=seasons, seed=seed)
+            projection = season_tool.project()
+            print("Season simulation completed successfully")
+            return {"result": projection.summary(), "seed": seed}
+        return cached_response('simulate_season', (seasons, requested_seed), project)
+    except Exception as e:
+        print(f"Error in simulate_season: {str(e)}")
+        print(f"Error type: {type(e)}")
+        import traceback
+        print(f"Full traceback:\n{traceback.format_exc()}")
+        return jsonify({"error": f"Error simulating season: {str(e)}"}), 500
+
 @app.route('/scrape_stats', methods=['POST'])
 def scrape_stats():
     """Scrape player statistics."""
@@ -243,5 +389,268 @@ def scrape_stats():
             'message': f'Error scraping stats: {str(e)}'
         }), 500
 
+@app.route('/api/v2/simulate_game/<home_team>/<away_team>')
+def simulate_game_v2(home_team, away_team):
+    """
+    Structured version of /simulate_game with the same runs, mode and seed
+    parameters. A single game comes back as a GameResult dict whose player
+    rows follow its 'columns'; ?format=msgpack (or an Accept header) picks
+    MessagePack and ?format=text the formatted box scores.
+    """
+    runs = request.args.get('runs', type=int)
+    if runs is not None and not 1 <= runs <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"runs must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    mode = request.args.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    try:
+        fmt = negotiate(request.args.get('format'), request.headers.get('Accept'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if runs is not None and fmt == 'text':
+        return jsonify({"error": "format=text is only available for single games"}), 400
+    requested_seed = request.args.get('seed', type=int)
+    seed = resolve_seed(requested_seed)
+
+    try:
+        game_tool = SimulateGameTool(
+            home_team=home_team,
+            away_team=away_team,
+            seed=seed,
+            mode=mode
+        )
+
+        if runs is not None:
+            def simulate_runs():
+                for aggregate in game_tool.simulate_matchup(runs):
+                    pass
+                return {"aggregate": aggregate.summary(), "seed": seed}
+            return cached_response('v2/simulate_game', (home_team, away_team, mode, runs, requested_seed), simulate_runs, fmt)
+
+        def simulate_one():
+            result = game_tool.simulate_result(seed)
+            if fmt == 'text':
+                return game_tool.format_game(result.as_tuple())
+            return {"game": result.to_dict()}
+        if requested_seed is None:
+            return Response(encode(simulate_one(), fmt), content_type=CONTENT_TYPES[fmt])
+        return cached_response('v2/simulate_game', (home_team, away_team, mode, None, requested_seed), simulate_one, fmt)
+    except Exception as e:
+        print(f"Error in simulate_game_v2: {str(e)}")
+        import traceback
+        print(f"Full traceback:\n{traceback.format_exc()}")
+        return jsonify({"error": f"Error simulating game: {str(e)}"}), 500
+
+@app.route('/api/v2/simulate_daily')
+def simulate_daily_v2():
+    """
+    Structured version of /simulate_daily: one entry per scheduled game with
+    its GameResult dict, plus the aggregate summary when ?replications=K is
+    above one. Accepts seed, mode and format like /api/v2/simulate_game,
+    and ?date=YYYY-MM-DD for another day's schedule.
+    """
+    replications = request.args.get('replications', 1, type=int)
+    if not 1 <= replications <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"replications must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    mode = request.args.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    try:
+        fmt = negotiate(request.args.get('format'), request.headers.get('Accept'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    game_date = request.args.get('date')
+    try:
+        if game_date is not None:
+            date.fromisoformat(game_date)
+    except ValueError:
+        return jsonify({"error": "date must be formatted as YYYY-MM-DD"}), 400
+    seed = resolve_seed(request.args.get('seed', type=int))
+
+    try:
+        daily_tool = SimulateDailyGamesTool(seed=seed, replications=replications, mode=mode, game_date=game_date)
+        games, rosters, slate = daily_tool.simulate(seed)
+        if fmt == 'text':
+            payload = daily_tool.format_slate(games, rosters, slate, seed)
+        else:
+            payload = daily_tool.slate_payload(games, rosters, slate, seed)
+        return Response(encode(payload, fmt), content_type=CONTENT_TYPES[fmt])
+    except Exception as e:
+        print(f"Error in simulate_daily_v2: {str(e)}")
+        import traceback
+        print(f"Full traceback:\n{traceback.format_exc()}")
+        return jsonify({"error": f"Error simulating daily games: {str(e)}"}), 500
+
+register_handlers(job_queue)
+# Jobs run in the job_worker process; inline workers suit a single local process
+if os.getenv('JOB_INLINE_WORKERS', 'false').lower() == 'true':
+    job_queue.start()
+
+def submit_job(kind, params):
+    """Queue a job and answer 202 with where to poll, or 429 when the queue is full."""
+    try:
+        job_id = job_queue.submit(kind, params)
+    except QueueFull as e:
+        response = jsonify({"error": str(e)})
+        response.headers['Retry-After'] = str(QUEUE_FULL_RETRY_AFTER)
+        return response, 429
+    status_url = f"/api/v2/jobs/{job_id}"
+    response = jsonify({
+        "job_id": job_id,
+        "status": job_queue.get(job_id)['status'],
+        "seed": params['seed'],
+        "status_url": status_url,
+        "result_url": f"{status_url}/result"
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+def job_request_values():
+    """Job parameters from a JSON body, or from the query string."""
+    values = request.get_json(silent=True)
+    return values if isinstance(values, dict) else request.args.to_dict()
+
+@app.route('/api/v2/jobs/simulate_daily', methods=['POST'])
+def submit_daily_job():
+    """
+    Queue a slate simulation with the replications, mode, seed and date
+    parameters of /api/v2/simulate_daily, as JSON or in the query string.
+    Returns 202 with the job ID, or 429 when the queue is full.
+    """
+    values = job_request_values()
+    try:
+        replications = int(values.get('replications', 1))
+        seed = values.get('seed')
+        seed = resolve_seed(int(seed) if seed is not None else None)
+    except (TypeError, ValueError):
+        return jsonify({"error": "replications and seed must be integers"}), 400
+    if not 1 <= replications <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"replications must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    mode = values.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    game_date = values.get('date')
+    try:
+        if game_date is not None:
+            date.fromisoformat(game_date)
+    except (TypeError, ValueError):
+        return jsonify({"error": "date must be formatted as YYYY-MM-DD"}), 400
+
+    return submit_job('simulate_daily', {
+        'replications': replications, 'mode': mode, 'date': game_date, 'seed': seed
+    })
+
+@app.route('/api/v2/jobs/simulate_games', methods=['POST'])
+def submit_games_job():
+    """
+    Queue a bulk simulation: a JSON body with 'games', a list of
+    [home_team, away_team] pairs, and optional runs, mode and seed as in
+    /api/v2/simulate_game. Returns 202 with the job ID, or 429 when the
+    queue is full.
+    """
+    values = request.get_json(silent=True)
+    if not isinstance(values, dict):
+        return jsonify({"error": "expected a JSON object body"}), 400
+    games = values.get('games')
+    if (not isinstance(games, list) or not 1 <= len(games) <= MAX_JOB_GAMES or
+            not all(isinstance(game, list) and len(game) == 2 and all(isinstance(team, str) for team in game)
+                    for game in games)):
+        return jsonify({"error": f"games must be a list of 1 to {MAX_JOB_GAMES} [home_team, away_team] pairs"}), 400
+    runs = values.get('runs', 1)
+    if not isinstance(runs, int) or not 1 <= runs <= MAX_SIMULATION_RUNS:
+        return jsonify({"error": f"runs must be between 1 and {MAX_SIMULATION_RUNS}"}), 400
+    mode = values.get('mode', DEFAULT_ENGINE)
+    if mode not in ENGINES:
+        return jsonify({"error": f"mode must be one of {', '.join(ENGINES)}"}), 400
+    seed = values.get('seed')
+    if seed is not None and not isinstance(seed, int):
+        return jsonify({"error": "seed must be an integer"}), 400
+
+    return submit_job('simulate_games', {
+        'games': games, 'runs': runs, 'mode': mode, 'seed': resolve_seed(seed)
+    })
+
+@app.route('/api/v2/jobs/<job_id>')
+def job_status(job_id):
+    """Status of a job: queued (with its position), running, succeeded or failed."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    job['result_url'] = f"/api/v2/jobs/{job_id}/result"
+    return jsonify(job)
+
+@app.route('/api/v2/jobs/<job_id>/result')
+def job_result(job_id):
+    """
+    Result of a finished job, as JSON or MessagePack (?format= or Accept).
+    Answers 202 with the status while the job is queued or running, and
+    500 with the error if it failed.
+    """
+    try:
+        fmt = negotiate(request.args.get('format'), request.headers.get('Accept'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if fmt == 'text':
+        return jsonify({"error": "format=text is not available for job results"}), 400
+
+    found = job_queue.result(job_id)
+    if found is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    status, result, error = found
+    if status == FAILED:
+        return jsonify({"status": status, "error": error}), 500
+    if status != SUCCEEDED:
+        return jsonify({"status": status}), 202
+    return Response(encode(result, fmt), content_type=CONTENT_TYPES[fmt])
+
+@app.route('/api/v2/archive/games')
+def archive_games():
+    """
+    Past daily predictions from the simulation archive, oldest first, as
+    JSON or MessagePack (?format= or Accept). Filters: ?date=, or ?start=
+    and ?end= (YYYY-MM-DD, inclusive), ?team= for either side, ?home_team=,
+    ?away_team= and ?run_id=, with team names resolved like the query
+    tools. Returns at most ?limit= games (default and cap
+    MAX_ARCHIVE_GAMES); ?box_scores=1 adds each game's box scores and
+    replication summary.
+    """
+    try:
+        fmt = negotiate(request.args.get('format'), request.headers.get('Accept'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if fmt == 'text':
+        return jsonify({"error": "format=text is not available for archive queries"}), 400
+    limit = request.args.get('limit', MAX_ARCHIVE_GAMES, type=int)
+    if not 1 <= limit <= MAX_ARCHIVE_GAMES:
+        return jsonify({"error": f"limit must be between 1 and {MAX_ARCHIVE_GAMES}"}), 400
+    start = request.args.get('start', request.args.get('date'))
+    end = request.args.get('end', request.args.get('date'))
+    try:
+        for value in (start, end):
+            if value is not None:
+                date.fromisoformat(value)
+    except ValueError:
+        return jsonify({"error": "dates must be formatted as YYYY-MM-DD"}), 400
+
+    try:
+        teams = get_resolver()
+        filters = {}
+        for name in ('team', 'home_team', 'away_team'):
+            value = request.args.get(name)
+            if value is not None:
+                filters[name] = teams.resolve(value) or value
+        archive = get_archive()
+        games = archive.games(start=start, end=end, run_id=request.args.get('run_id'), limit=limit, **filters)
+        if request.args.get('box_scores', type=int):
+            for row, game in archive.iter_box_scores(games):
+                row['game'] = game
+                row['summary'] = archive.summary(row['run_id'], row['game_index'])
+        return Response(encode({'games': games}, fmt), content_type=CONTENT_TYPES[fmt])
+    except Exception as e:
+        print(f"Error in archive_games: {str(e)}")
+        import traceback
+        print(f"Full traceback:\n{traceback.format_exc()}")
+        return jsonify({"error": f"Error querying the simulation archive: {str(e)}"}), 500
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
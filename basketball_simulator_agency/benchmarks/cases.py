@@ -0,0 +1,126 @@
+import csv
+import os
+from .harness import SkipBenchmark
+from ..game_simulation_agent.tools.SimulateGameTool import SimulateGameTool
+from ..web_scraper_agent.schedule import parse_schedule
+from ..team_names import TeamResolver
+from ..web_scraper_agent.tools.ScrapePlayersTool import ScrapePlayersTool
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+FIXTURES_DIR = os.path.join(DATA_DIR, 'fixtures')
+PLAYERS_CSV = os.path.join(DATA_DIR, 'nba_active_players.csv')
+STATS_CSV = os.path.join(DATA_DIR, 'nba_player_stats.csv')
+
+HOME_TEAM = 'Boston Celtics'
+AWAY_TEAM = 'Los Angeles Lakers'
+
+# Games per call of the batch benchmarks
+BATCH_GAMES = 1000
+
+# Stats CSV columns in the order RosterArrays.from_rows reads them, after name and position
+ROW_COLUMNS = (
+    'minutes_per_game', 'points_per_game', 'rebounds_per_game', 'assists_per_game',
+    'steals_per_game', 'blocks_per_game', 'field_goal_percentage',
+    'three_point_percentage', 'free_throw_percentage', 'turnovers_per_game'
+)
+
+
+def roster_rows(team_name):
+    """
+    The RosterArrays.from_rows player rows of a team, built from the CSVs
+    in data/ so the simulation benchmarks need no database.
+    """
+    with open(STATS_CSV, newline='', encoding='utf-8') as f:
+        stats = {row['name']: row for row in csv.DictReader(f)}
+    with open(PLAYERS_CSV, newline='', encoding='utf-8') as f:
+        players = [row for row in csv.DictReader(f) if row['current_team'] == team_name]
+
+    rows = []
+    for player in players:
+        player_stats = stats.get(player['name'])
+        if player_stats is None or not float(player_stats['minutes_per_game'] or 0) > 0:
+            continue
+        rows.append((player['name'], player['position']) +
+                    tuple(float(player_stats[column] or 0) for column in ROW_COLUMNS))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def game_tool(mode='box'):
+    return SimulateGameTool(home_team=HOME_TEAM, away_team=AWAY_TEAM, seed=1, mode=mode)
+
+
+def simulate_game():
+    """One game through SimulateGameTool.simulate_game, roster arrays included."""
+    tool = game_tool()
+    home, away = roster_rows(HOME_TEAM), roster_rows(AWAY_TEAM)
+    return (lambda: tool.simulate_game(home, away)), 1, 'game'
+
+
+def simulate_games(mode):
+    def setup():
+        tool = game_tool(mode)
+        home, away = roster_rows(HOME_TEAM), roster_rows(AWAY_TEAM)
+        return (lambda: tool.simulate_games(home, away, BATCH_GAMES)), BATCH_GAMES, 'game'
+    setup.__doc__ = f"{BATCH_GAMES} games in one vectorized pass of the {mode} engine."
+    return setup
+
+
+def format_box_score():
+    """Formatting one team's box score of a simulated game."""
+    tool = game_tool()
+    game = tool.simulate_game(roster_rows(HOME_TEAM), roster_rows(AWAY_TEAM))
+    return (lambda: tool.format_box_score(HOME_TEAM, game[2])), 1, 'box score'
+
+
+def load_data():
+    """
+    LoadDataTool.run with the CSVs in data/, against the scratch database
+    at BENCHMARK_DATABASE_URL (it is migrated and overwritten).
+    """
+    database_url = os.getenv('BENCHMARK_DATABASE_URL')
+    if not database_url:
+        raise SkipBenchmark("set BENCHMARK_DATABASE_URL to a scratch database")
+
+    # Imported here so the other benchmarks run without a database driver
+    from ..database_agent import migrations
+    from ..database_agent.connection_pool import get_connection
+    from ..database_agent.tools.LoadDataTool import LoadDataTool
+
+    # The tool connects through the default pool, configured from DATABASE_URL
+    os.environ['DATABASE_URL'] = database_url
+    with get_connection() as conn:
+        migrations.migrate(conn)
+    tool = LoadDataTool(teams_file=PLAYERS_CSV, players_file=PLAYERS_CSV, stats_file=STATS_CSV)
+    return tool.run, 1, 'load'
+
+
+def fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+        return f.read()
+
+
+def parse_roster():
+    """ScrapePlayersTool.parse_roster on the saved roster page."""
+    tool = ScrapePlayersTool()
+    html = fixture('espn_roster.html')
+    return (lambda: tool.parse_roster(html, HOME_TEAM)), 1, 'page'
+
+
+def parse_schedule_page():
+    """parse_schedule on the saved schedule page, with team names resolved without a database."""
+    html = fixture('espn_schedule.html')
+    teams = TeamResolver(ScrapePlayersTool.NBA_TEAMS)
+    return (lambda: parse_schedule(html, teams=teams)), 1, 'page'
+
+
+# name: (setup returning (function, units of work per call, unit), default repeat)
+BENCHMARKS = {
+    'simulate_game': (simulate_game, 300),
+    'simulate_games_box': (simulate_games('box'), 20),
+    'simulate_games_possession': (simulate_games('possession'), 20),
+    'format_box_score': (format_box_score, 1000),
+    'load_data': (load_data, 5),
+    'parse_roster': (parse_roster, 30),
+    'parse_schedule': (parse_schedule_page, 30)
+}
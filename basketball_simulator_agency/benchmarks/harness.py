@@ -0,0 +1,83 @@
+import json
+import os
+import platform
+import time
+import numpy as np
+
+# Percentiles reported for every benchmark
+PERCENTILES = (50, 90, 99)
+
+# Slowdown of the median over the baseline tolerated before a run fails
+DEFAULT_TOLERANCE = 0.3
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark setup that cannot run here, with the reason."""
+
+
+def measure(fn, repeat, warmup=1):
+    """Call fn warmup + repeat times; return the sorted wall times of the last repeat, in seconds."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return sorted(times)
+
+
+def percentile(times, q):
+    """Nearest-rank percentile of sorted times."""
+    index = max(0, min(len(times) - 1, int(round(q / 100 * len(times) + 0.5)) - 1))
+    return times[index]
+
+
+def summarize(times, units=1, unit='call'):
+    """Percentiles and throughput of sorted times; units of work are done per call."""
+    summary = {'repeat': len(times), 'unit': unit, 'units_per_call': units}
+    for q in PERCENTILES:
+        summary[f'p{q}_ms'] = percentile(times, q) * 1000
+    summary['min_ms'] = times[0] * 1000
+    summary['max_ms'] = times[-1] * 1000
+    summary['mean_ms'] = sum(times) / len(times) * 1000
+    summary['per_second'] = units / percentile(times, 50)
+    return summary
+
+
+def environment():
+    """Where the numbers were taken; baselines only compare well on the same machine."""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare the median of every benchmark present in both result sets.
+    Returns [(name, baseline_ms, current_ms, ratio, regressed)], where
+    regressed means the median slowed down by more than tolerance.
+    """
+    rows = []
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None or 'p50_ms' not in current or 'p50_ms' not in previous:
+            continue
+        ratio = current['p50_ms'] / previous['p50_ms']
+        rows.append((name, previous['p50_ms'], current['p50_ms'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
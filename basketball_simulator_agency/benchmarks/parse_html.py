@@ -0,0 +1,58 @@
+"""
+Parse-time benchmark of the scraper HTML backends over the saved ESPN
+fixtures in data/fixtures.
+
+    python -m basketball_simulator_agency.benchmarks.parse_html [--repeat N]
+
+'full tree' is the previous approach: the whole page built by html.parser
+and then searched with find_all.
+"""
+import argparse
+import os
+from bs4 import BeautifulSoup
+from .cases import FIXTURES_DIR
+from .harness import measure, percentile
+from ..web_scraper_agent.html_parser import BACKENDS
+
+FIXTURES = {
+    'roster': 'espn_roster.html',
+    'schedule': 'espn_schedule.html'
+}
+
+
+def full_tree(kind, html):
+    soup = BeautifulSoup(html, 'html.parser')
+    if kind == 'roster':
+        return [row.find_all('td') for row in soup.find_all('tr', class_='Table__TR')]
+    return [table.find_all('tr', class_='Table__TR') for table in soup.find_all('div', class_='ScheduleTables')]
+
+
+def parsers():
+    """(name, function(kind, html)) for the baseline and every installed backend."""
+    yield 'full tree', full_tree
+    for name, backend in BACKENDS.items():
+        yield name, lambda kind, html, backend=backend: (
+            backend.roster_rows(html) if kind == 'roster' else backend.schedule_tables(html)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    for kind, filename in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+            html = f.read()
+        print(f"{filename} ({len(html) / 1024:.0f} KiB)")
+        baseline = None
+        for name, parse in parsers():
+            times = measure(lambda: parse(kind, html), args.repeat)
+            median = percentile(times, 50) * 1000
+            p95 = percentile(times, 95) * 1000
+            baseline = baseline or median
+            print(f"  {name:<12} median {median:7.2f} ms  p95 {p95:7.2f} ms  {baseline / median:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
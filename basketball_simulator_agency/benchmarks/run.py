@@ -0,0 +1,92 @@
+"""
+Benchmark suite for the simulation, formatting, load and scrape hot paths.
+
+    python -m basketball_simulator_agency.benchmarks.run [--only NAME ...]
+        [--output results.json] [--baseline PATH] [--tolerance 0.3] [--save-baseline]
+
+Results are written as JSON and compared with the stored baseline; the run
+exits with status 1 when any median is slower than the baseline by more
+than the tolerance.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from . import harness
+from .cases import BENCHMARKS
+from ..web_scraper_agent.html_parser import backend_name
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def run_benchmarks(names, repeat=None):
+    """Results of the named benchmarks, with skipped ones and their reason."""
+    results = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+               'environment': dict(harness.environment(), html_parser=backend_name()),
+               'benchmarks': {}}
+    for name in names:
+        setup, default_repeat = BENCHMARKS[name]
+        # The tools print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                fn, units, unit = setup()
+                times = harness.measure(fn, repeat or default_repeat)
+            except harness.SkipBenchmark as e:
+                results['benchmarks'][name] = {'skipped': str(e)}
+                continue
+        results['benchmarks'][name] = harness.summarize(times, units, unit)
+    return results
+
+
+def report(results):
+    for name, summary in results['benchmarks'].items():
+        if 'skipped' in summary:
+            print(f"{name:<26} skipped: {summary['skipped']}")
+            continue
+        percentiles = '  '.join(f"p{q} {summary[f'p{q}_ms']:9.3f} ms" for q in harness.PERCENTILES)
+        print(f"{name:<26} {percentiles}  {summary['per_second']:12,.1f} {summary['unit']}s/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, help="timed calls per benchmark (default: per benchmark)")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the results")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline results to compare with")
+    parser.add_argument('--tolerance', type=float, default=harness.DEFAULT_TOLERANCE,
+                        help="allowed median slowdown as a fraction (default: %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.repeat)
+    report(results)
+    harness.save(results, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        harness.save(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    baseline = harness.load(args.baseline)
+    if baseline.get('environment') != results['environment']:
+        print("Note: the baseline was recorded in a different environment")
+    regressions = 0
+    print(f"\nComparison with {args.baseline} (median, tolerance {args.tolerance:.0%}):")
+    for name, previous, current, ratio, regressed in harness.compare(results, baseline, args.tolerance):
+        regressions += regressed
+        status = 'REGRESSION' if regressed else 'ok'
+        print(f"{name:<26} {previous:9.3f} ms -> {current:9.3f} ms  {ratio:5.2f}x  {status}")
+    if regressions:
+        print(f"\n{regressions} benchmark(s) regressed")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
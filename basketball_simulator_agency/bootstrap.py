@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import traceback
+import psycopg2
+from basketball_simulator_agency.database_agent.connection_pool import default_params, get_connection
+from basketball_simulator_agency.database_agent import migrations
+
+# 'background' serves requests while the bootstrap runs in a thread,
+# 'blocking' runs it while the app module is imported, 'off' skips it
+BOOTSTRAP_MODE = os.getenv('BOOTSTRAP_MODE', 'background').lower()
+
+# Bootstrap runs once per deployment; Render sets RENDER_GIT_COMMIT
+DEPLOYMENT_ID = os.getenv('BOOTSTRAP_DEPLOYMENT_ID') or os.getenv('RENDER_GIT_COMMIT') or 'default'
+
+# Key of the Postgres advisory lock held by the process running the bootstrap
+ADVISORY_LOCK_ID = 7410521
+
+# Seconds between lock attempts while another process is bootstrapping
+POLL_INTERVAL = float(os.getenv('BOOTSTRAP_POLL_INTERVAL', '5'))
+
+
+class BootstrapStatus:
+    """Thread-safe progress of the data bootstrap in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {
+            'state': 'pending',
+            'step': None,
+            'deployment': DEPLOYMENT_ID,
+            'started_at': None,
+            'finished_at': None,
+            'error': None
+        }
+
+    def update(self, **changes):
+        with self._lock:
+            self._state.update(changes)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._state)
+
+    @property
+    def ready(self):
+        with self._lock:
+            return self._state['state'] in ('ready', 'skipped')
+
+
+status = BootstrapStatus()
+_started = False
+_start_lock = threading.Lock()
+
+
+def record(cur, run_status, error=None):
+    """Upsert this deployment's bootstrap row."""
+    cur.execute("""
+        INSERT INTO bootstrap_runs (deployment, status, error) VALUES (%s, %s, %s)
+        ON CONFLICT (deployment) DO UPDATE SET
+            status = EXCLUDED.status,
+            error = EXCLUDED.error,
+            started_at = CASE WHEN EXCLUDED.status = 'running' THEN NOW() ELSE bootstrap_runs.started_at END,
+            finished_at = CASE WHEN EXCLUDED.status = 'running' THEN NULL ELSE NOW() END
+    """, (DEPLOYMENT_ID, run_status, error))
+
+
+def recorded_status(cur):
+    """Return this deployment's recorded (status, error), or None."""
+    cur.execute("SELECT status, error FROM bootstrap_runs WHERE deployment = %s", (DEPLOYMENT_ID,))
+    return cur.fetchone()
+
+
+def default_steps():
+    """The scrape and load steps, in order, as (name, callable) pairs."""
+    from basketball_simulator_agency.database_agent.tools.LoadDataTool import LoadDataTool
+    from basketball_simulator_agency.web_scraper_agent.tools.ScrapePlayersTool import ScrapePlayersTool
+    from basketball_simulator_agency.web_scraper_agent.tools.ScrapePlayerStatsTool import ScrapePlayerStatsTool
+    return [
+        ('scrape_players', ScrapePlayersTool().run),
+        ('scrape_stats', ScrapePlayerStatsTool().run),
+        ('load_data', LoadDataTool().run)
+    ]
+
+
+def run_steps(steps):
+    for name, step in steps:
+        print(f"Bootstrap step: {name}")
+        status.update(step=name)
+        result = step()
+        # Tools report failures as an error string instead of raising
+        if isinstance(result, str) and result.startswith('Error'):
+            raise RuntimeError(result)
+
+
+def bootstrap(steps=None):
+    """
+    Run the bootstrap steps once for this deployment. Only the process that
+    holds the advisory lock runs them; other processes wait for the lock and
+    then find the deployment complete, or retry it if the previous run failed.
+    """
+    status.update(state='waiting', started_at=time.time(), finished_at=None, error=None)
+    conn = psycopg2.connect(**default_params())
+    conn.autocommit = True
+    try:
+        cur = conn.cursor()
+        while True:
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            if cur.fetchone()[0]:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            # Migrations are cheap when the schema is current and create bootstrap_runs
+            status.update(step='schema')
+            with get_connection() as migration_conn:
+                migrations.migrate(migration_conn)
+
+            recorded = recorded_status(cur)
+            if recorded is not None and recorded[0] == 'complete':
+                print(f"Bootstrap for deployment {DEPLOYMENT_ID} already complete")
+                status.update(state='ready', step=None, finished_at=time.time())
+                return
+
+            status.update(state='running')
+            record(cur, 'running')
+            try:
+                run_steps(steps if steps is not None else default_steps())
+            except Exception as e:
+                record(cur, 'failed', str(e))
+                raise
+            record(cur, 'complete')
+            status.update(state='ready', step=None, finished_at=time.time())
+            print("Database initialization complete!")
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+    finally:
+        conn.close()
+
+
+def _run(steps):
+    try:
+        bootstrap(steps)
+    except Exception as e:
+        print(f"Error during initialization: {str(e)}")
+        print(traceback.format_exc())
+        status.update(state='failed', error=str(e), finished_at=time.time())
+
+
+def start(mode=BOOTSTRAP_MODE, steps=None):
+    """Start the bootstrap according to mode; safe to call more than once."""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+
+    if mode == 'off':
+        status.update(state='skipped')
+    elif mode == 'blocking':
+        _run(steps)
+    else:
+        threading.Thread(target=_run, args=(steps,), name='bootstrap', daemon=True).start()
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from ..metrics import DB_CONNECTIONS_OPENED, DB_QUERY_SECONDS, timed
+
+# Pool sizing, per process (each gunicorn worker has its own pool)
+POOL_MIN_CONNECTIONS = int(os.getenv('DB_POOL_MIN', '1'))
+POOL_MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX', '10'))
+
+# Seconds to wait for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+# Connections idle longer than this are pinged before being handed out
+HEALTH_CHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the timeout."""
+
+
+def statement_type(cursor, query):
+    """First keyword of a statement, e.g. SELECT, as a low-cardinality metric label."""
+    if not isinstance(query, (str, bytes)):
+        query = query.as_string(cursor)
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    words = query.split(None, 1)
+    return words[0].upper() if words else 'EMPTY'
+
+
+class TimedCursor(extensions.cursor):
+    """Cursor that records the time of every statement in DB_QUERY_SECONDS."""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            DB_QUERY_SECONDS.labels(statement_type(self, query)).observe(time.perf_counter() - started)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            DB_QUERY_SECONDS.labels(statement_type(self, query)).observe(time.perf_counter() - started)
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            DB_QUERY_SECONDS.labels('COPY').observe(time.perf_counter() - started)
+
+
+def connect(params):
+    """Open a new connection whose cursors are timed."""
+    DB_CONNECTIONS_OPENED.inc()
+    return psycopg2.connect(cursor_factory=TimedCursor, **params)
+
+
+def default_params():
+    """Connection settings from DATABASE_URL, or the DB_* variables for local development."""
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return {'dsn': database_url}
+    return {
+        'dbname': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'host': os.getenv('DB_HOST', 'localhost')
+    }
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections.
+
+    Checkouts block while all connections are in use. A connection is
+    discarded and replaced if it is closed, left in a broken transaction, or
+    fails a SELECT 1 after sitting idle for HEALTH_CHECK_INTERVAL.
+    """
+
+    def __init__(self, params, minconn=POOL_MIN_CONNECTIONS, maxconn=POOL_MAX_CONNECTIONS,
+                 timeout=POOL_TIMEOUT):
+        self.params = params
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._pid = os.getpid()
+        for _ in range(minconn):
+            self._idle.append((connect(params), time.monotonic()))
+
+    def _healthy(self, conn, idle_since):
+        if conn.closed or conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - idle_since < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        with timed('db_connect'):
+            return self._checkout()
+
+    def _checkout(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No database connection available after {self.timeout}s")
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                if idle is None:
+                    return connect(self.params)
+                conn, idle_since = idle
+                if self._healthy(conn, idle_since):
+                    return conn
+                print("Discarding unhealthy database connection")
+                conn.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn):
+        try:
+            if not conn.closed and conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if not conn.closed:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        except psycopg2.Error:
+            conn.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection, commit on success and roll back on error."""
+        conn = self.getconn()
+        try:
+            yield conn
+            if not conn.closed:
+                conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+_pools = {}
+_inherited = []
+_pools_lock = threading.Lock()
+
+
+def get_pool(**params):
+    """
+    Return the process-wide pool for the given connection settings, creating
+    it on first use. Without settings, the environment defaults are used.
+    """
+    key = tuple(sorted(params.items()))
+    with _pools_lock:
+        existing = _pools.get(key)
+        if existing is not None and existing._pid == os.getpid():
+            return existing
+        if existing is not None:
+            # Pools inherited through fork share sockets with the parent; keep
+            # them referenced so they are never closed from this process
+            _inherited.append(existing)
+        created = ConnectionPool(params or default_params())
+        _pools[key] = created
+        return created
+
+
+def get_connection(**params):
+    """Context manager yielding a pooled connection."""
+    return get_pool(**params).connection()
@@ -0,0 +1,49 @@
+import psycopg2
+
+# Callbacks run in this process after the players table changes
+_listeners = []
+
+
+def create_table(cur):
+    """Create the single-row counter that tracks changes to the players table."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version BIGINT NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def bump(cur):
+    """Increment the data version inside the caller's transaction."""
+    cur.execute("""
+        INSERT INTO data_version (id, version) VALUES (1, 1)
+        ON CONFLICT (id) DO UPDATE SET
+            version = data_version.version + 1,
+            updated_at = NOW()
+        RETURNING version
+    """)
+    return cur.fetchone()[0]
+
+
+def current(cur):
+    """Return the current data version, or None if the table does not exist yet."""
+    try:
+        cur.execute("SELECT version FROM data_version WHERE id = 1")
+    except psycopg2.errors.UndefinedTable:
+        cur.connection.rollback()
+        return None
+    row = cur.fetchone()
+    return row[0] if row else 0
+
+
+def add_listener(callback):
+    """Register a callback to run after this process changes the players table."""
+    _listeners.append(callback)
+
+
+def notify():
+    """Tell in-process listeners, such as the roster cache, that data changed."""
+    for callback in _listeners:
+        callback()
@@ -0,0 +1,148 @@
+from . import data_version, player_rates
+
+# Key of the transaction-level advisory lock that serializes migrators
+MIGRATION_LOCK_ID = 7410522
+
+# Stat columns on players with their definitions
+PLAYER_STAT_COLUMNS = [
+    ('games_played', 'INTEGER DEFAULT 0'),
+    ('minutes_per_game', 'FLOAT DEFAULT 0'),
+    ('points_per_game', 'FLOAT DEFAULT 0'),
+    ('rebounds_per_game', 'FLOAT DEFAULT 0'),
+    ('assists_per_game', 'FLOAT DEFAULT 0'),
+    ('steals_per_game', 'FLOAT DEFAULT 0'),
+    ('blocks_per_game', 'FLOAT DEFAULT 0'),
+    ('field_goal_percentage', 'FLOAT DEFAULT 0'),
+    ('three_point_percentage', 'FLOAT DEFAULT 0'),
+    ('free_throw_percentage', 'FLOAT DEFAULT 0'),
+    ('turnovers_per_game', 'FLOAT DEFAULT 0')
+]
+
+
+def create_base_tables(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS teams (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) UNIQUE NOT NULL
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS players (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) UNIQUE NOT NULL,
+            current_team VARCHAR(100) REFERENCES teams(name),
+            position VARCHAR(10),
+            height VARCHAR(10),
+            weight INTEGER,  -- Stored without 'lbs' suffix
+            age INTEGER,     -- Stored as integer
+            colleges VARCHAR(100)  -- Renamed from college to colleges to match scraper
+        );
+    """)
+    # Databases created before a stat column existed get it added in place
+    for column, definition in PLAYER_STAT_COLUMNS:
+        cur.execute(f"ALTER TABLE players ADD COLUMN IF NOT EXISTS {column} {definition}")
+
+
+def create_data_version(cur):
+    data_version.create_table(cur)
+
+
+def index_team_players(cur):
+    # Serves the roster query: players of a team ordered by minutes
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS players_team_minutes_idx
+        ON players (current_team, minutes_per_game DESC)
+    """)
+
+
+def create_bootstrap_runs(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS bootstrap_runs (
+            deployment VARCHAR(100) PRIMARY KEY,
+            status VARCHAR(20) NOT NULL,
+            started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            finished_at TIMESTAMP,
+            error TEXT
+        );
+    """)
+
+
+def create_schedule_tables(cur):
+    # Games by date, filled from the ESPN schedule; the unique index serves
+    # lookups by date
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS games (
+            id SERIAL PRIMARY KEY,
+            game_date DATE NOT NULL,
+            away_team VARCHAR(100) NOT NULL,
+            home_team VARCHAR(100) NOT NULL,
+            UNIQUE (game_date, away_team, home_team)
+        );
+    """)
+    # Validators and covered dates of every fetched schedule page
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schedule_fetches (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            fetched_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def create_player_rates(cur):
+    # Filled from the players already loaded; LoadDataTool refreshes it after
+    player_rates.create_table(cur)
+    player_rates.refresh(cur)
+
+
+# Applied in order and recorded in schema_migrations; never edit or reorder
+# a released migration, append a new one instead
+MIGRATIONS = [
+    (1, 'Create teams and players', create_base_tables),
+    (2, 'Create data_version', create_data_version),
+    (3, 'Index players by team and minutes', index_team_players),
+    (4, 'Create bootstrap_runs', create_bootstrap_runs),
+    (5, 'Create games and schedule_fetches', create_schedule_tables),
+    (6, 'Create player_rates', create_player_rates)
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def migrate(conn):
+    """
+    Bring the schema up to LATEST_VERSION without touching existing data.
+    Pending migrations run in one transaction under an advisory lock, so
+    concurrent processes apply each one exactly once. Returns the versions
+    applied by this call; an up-to-date schema costs three statements.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+        );
+    """)
+
+    applied = applied_versions(cur)
+    pending = [migration for migration in MIGRATIONS if migration[0] not in applied]
+    for version, description, apply in pending:
+        print(f"Applying migration {version}: {description}")
+        apply(cur)
+        cur.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (version, description)
+        )
+    conn.commit()
+    cur.close()
+    return [version for version, _, _ in pending]
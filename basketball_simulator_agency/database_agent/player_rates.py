@@ -0,0 +1,63 @@
+from ..game_simulation_agent.batch_engine import MINUTES_SIGMA, STAT_NAMES, STAT_SIGMAS
+
+# Shooting percentages on players, stored as 0-100, kept here as fractions
+SHOOTING_STATS = ('field_goal', 'three_point', 'free_throw')
+
+# Columns of player_rates read into RosterArrays.from_rates, after name and position
+ROSTER_COLUMNS = ', '.join(
+    ['r.minutes_per_game', 'r.minutes_sigma'] +
+    [f'r.{stat}_per_minute' for stat in STAT_NAMES] +
+    [f'r.{stat}_sigma' for stat in STAT_NAMES] +
+    [f'r.{stat}_fraction' for stat in SHOOTING_STATS]
+)
+
+
+def create_table(cur):
+    """
+    Create the per-minute rates and draw deviations of every player with
+    minutes, derived from players by refresh. Columns are REAL so rosters
+    load straight into float32 arrays.
+    """
+    columns = ['minutes_sigma'] + [f'{stat}_per_minute' for stat in STAT_NAMES] + \
+        [f'{stat}_sigma' for stat in STAT_NAMES] + [f'{stat}_fraction' for stat in SHOOTING_STATS]
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS player_rates (
+            player_id INTEGER PRIMARY KEY REFERENCES players(id) ON DELETE CASCADE,
+            current_team VARCHAR(100) NOT NULL,
+            minutes_per_game REAL NOT NULL,
+            {', '.join(f'{column} REAL NOT NULL' for column in columns)}
+        );
+    """)
+    # Serves the roster query: rates of a team ordered by minutes
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS player_rates_team_minutes_idx
+        ON player_rates (current_team, minutes_per_game DESC)
+    """)
+
+
+def refresh(cur):
+    """
+    Recompute player_rates from players inside the caller's transaction and
+    return the number of rows written. Divisions are done in REAL, matching
+    the float32 arithmetic of RosterArrays.from_rows, so both give the same
+    rosters. Deviations start at the engine defaults.
+    """
+    cur.execute("DELETE FROM player_rates")
+    rates = [f"COALESCE({stat}_per_game, 0)::real / minutes_per_game::real" for stat in STAT_NAMES]
+    fractions = [f"COALESCE({stat}_percentage, 0)::real / 100::real" for stat in SHOOTING_STATS]
+    cur.execute(f"""
+        INSERT INTO player_rates (
+            player_id, current_team, minutes_per_game, minutes_sigma,
+            {', '.join(f'{stat}_per_minute' for stat in STAT_NAMES)},
+            {', '.join(f'{stat}_sigma' for stat in STAT_NAMES)},
+            {', '.join(f'{stat}_fraction' for stat in SHOOTING_STATS)}
+        )
+        SELECT id, current_team, minutes_per_game, %s,
+            {', '.join(rates)},
+            {', '.join(['%s'] * len(STAT_NAMES))},
+            {', '.join(fractions)}
+        FROM players
+        WHERE current_team IS NOT NULL
+        AND minutes_per_game > 0
+    """, [MINUTES_SIGMA] + [float(sigma) for sigma in STAT_SIGMAS])
+    return cur.rowcount
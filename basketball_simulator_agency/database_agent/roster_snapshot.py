@@ -0,0 +1,208 @@
+import functools
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+from . import player_rates
+from ..game_simulation_agent.batch_engine import RosterArrays
+
+# Directory holding one v<version> snapshot per data version and the CURRENT pointer
+SNAPSHOT_DIR = os.getenv('ROSTER_SNAPSHOT_DIR') or os.path.join(tempfile.gettempdir(), 'nba_sim_rosters')
+
+# Arrays of a snapshot, one .npy file each, indexed by player. Players are
+# grouped by team and ordered by minutes, so every team is a row range.
+ARRAYS = ('names', 'positions', 'mpg', 'minutes_sigma', 'rates', 'sigmas', 'shooting')
+
+CURRENT_FILE = 'CURRENT'
+INDEX_FILE = 'index.json'
+
+_VERSION_DIR = re.compile(r'^v(\d+)$')
+
+# Snapshots kept on disk, and open in each process: the newest and the one before
+KEEP_VERSIONS = 2
+
+# Open snapshots of this process by path, oldest first; workers reuse them across tasks
+_snapshots = {}
+_lock = threading.Lock()
+
+
+class RosterSnapshot:
+    """
+    Memory-mapped roster arrays of one data version. Rosters are views of
+    the mapped files, so every process reading a snapshot shares one
+    page-cached copy, and a roster sent to a pool worker is pickled as a
+    reference to its snapshot rather than as arrays.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.path = path
+        self.version = index['version']
+        self.teams = {team: tuple(span) for team, span in index['teams'].items()}
+        # asarray drops the memmap subclass, keeping plain zero-copy views
+        self.arrays = {
+            name: np.asarray(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+            for name in ARRAYS
+        }
+
+    def roster(self, team):
+        """RosterArrays of team, or None if it has no players with minutes."""
+        span = self.teams.get(team)
+        if span is None:
+            return None
+        rows = slice(*span)
+        arrays = self.arrays
+        roster = RosterArrays(
+            arrays['names'][rows].tolist(),
+            [position or None for position in arrays['positions'][rows].tolist()],
+            arrays['mpg'][rows],
+            arrays['rates'][rows],
+            arrays['shooting'][rows],
+            minutes_sigma=arrays['minutes_sigma'][rows],
+            sigmas=arrays['sigmas'][rows]
+        )
+        roster.origin = functools.partial(_reference, self.path, team)
+        return roster
+
+    def rosters(self, team_names):
+        """{team: RosterArrays} for the named teams that have players."""
+        found = {}
+        for team in team_names:
+            roster = self.roster(team)
+            if roster is not None:
+                found[team] = roster
+        return found
+
+
+def _open(path):
+    with _lock:
+        snapshot = _snapshots.get(path)
+        if snapshot is None:
+            snapshot = _snapshots[path] = RosterSnapshot(path)
+            while len(_snapshots) > KEEP_VERSIONS:
+                del _snapshots[next(iter(_snapshots))]
+        return snapshot
+
+
+def _reference(path, team):
+    """
+    RosterArrays.origin of a snapshot roster: load_roster of it, or None once
+    export pruned its version, so the roster is pickled as arrays instead.
+    """
+    if not os.path.exists(os.path.join(path, INDEX_FILE)):
+        return None
+    return load_roster, (path, team)
+
+
+def load_roster(path, team):
+    """
+    Rebuild a snapshot roster in this process. If its version was pruned
+    after the roster was pickled, the team is read from the current
+    snapshot instead.
+    """
+    try:
+        snapshot = _open(path)
+    except FileNotFoundError:
+        snapshot = current(os.path.dirname(path))
+        if snapshot is None:
+            raise
+        print(f"Roster snapshot {path} was removed; reading {team} from {snapshot.path}")
+    return snapshot.roster(team)
+
+
+def current(directory=SNAPSHOT_DIR):
+    """The newest snapshot in directory, or None if there is none to read."""
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            name = f.read().strip()
+        return _open(os.path.join(directory, name))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _current_version(directory):
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            match = _VERSION_DIR.match(f.read().strip())
+    except OSError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def _write_arrays(path, version, rows):
+    """Write the arrays and team index of rows, which are grouped by team, into path."""
+    teams = {}
+    for index, row in enumerate(rows):
+        start = teams[row[0]][0] if row[0] in teams else index
+        teams[row[0]] = (start, index + 1)
+
+    roster = RosterArrays.from_rates([row[1:] for row in rows])
+    arrays = {
+        'names': np.array(roster.names, dtype=str),
+        'positions': np.array([position or '' for position in roster.positions], dtype=str),
+        'mpg': roster.mpg,
+        'minutes_sigma': roster.minutes_sigma,
+        'rates': roster.rates,
+        'sigmas': roster.sigmas,
+        'shooting': roster.shooting
+    }
+    for name in ARRAYS:
+        np.save(os.path.join(path, f'{name}.npy'), arrays[name])
+    with open(os.path.join(path, INDEX_FILE), 'w') as f:
+        json.dump({'version': version, 'created_at': time.time(), 'teams': teams}, f)
+
+
+def export(cur, directory=SNAPSHOT_DIR):
+    """
+    Write a snapshot of every team's player_rates for the current data
+    version and point CURRENT at it, unless a newer version is already
+    current. Rows and version come from one statement, so the snapshot is
+    never labelled with a version its data does not belong to. Returns the
+    snapshot, or None when there are no players to export.
+
+    A version is written to a private directory and renamed into place, so
+    processes exporting at once never expose a partial snapshot. The
+    newest KEEP_VERSIONS versions are kept, so readers still on the
+    previous one can finish; older ones are removed.
+    """
+    cur.execute(f"""
+        SELECT (SELECT version FROM data_version WHERE id = 1),
+            r.current_team, p.name, p.position, {player_rates.ROSTER_COLUMNS}
+        FROM player_rates r
+        JOIN players p ON p.id = r.player_id
+        ORDER BY r.current_team, r.minutes_per_game DESC;
+    """)
+    rows = cur.fetchall()
+    if not rows:
+        return None
+    version = rows[0][0] or 0
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'v{version}')
+    if not os.path.isdir(path):
+        staging = tempfile.mkdtemp(prefix=f'v{version}.', dir=directory)
+        try:
+            _write_arrays(staging, version, [row[1:] for row in rows])
+            os.rename(staging, path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            # Another process renamed the same version into place first
+            if not os.path.isdir(path):
+                raise
+
+    latest = _current_version(directory)
+    if latest is None or latest <= version:
+        fd, pointer = tempfile.mkstemp(prefix=f'{CURRENT_FILE}.', dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            f.write(f'v{version}')
+        os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+
+    versions = sorted(int(match.group(1)) for match in map(_VERSION_DIR.match, os.listdir(directory)) if match)
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(directory, f'v{old}'), ignore_errors=True)
+    return _open(path)
@@ -1,13 +1,22 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import psycopg2
-import pandas as pd
+import csv
+import time
+from psycopg2 import sql
 from dotenv import load_dotenv
 import os
 from ..tools.BaseDatabaseTool import BaseDatabaseTool
+from .. import data_version, player_rates, roster_snapshot
 
 load_dotenv()
 
+# Columns of the stats CSV copied onto the players table
+STAT_COLUMNS = (
+    'games_played', 'minutes_per_game', 'points_per_game', 'rebounds_per_game',
+    'assists_per_game', 'steals_per_game', 'blocks_per_game', 'field_goal_percentage',
+    'three_point_percentage', 'free_throw_percentage', 'turnovers_per_game'
+)
+
 class LoadDataTool(BaseDatabaseTool):
     """
     A tool for loading data from CSV files into the PostgreSQL database.
@@ -26,38 +35,94 @@ class LoadDataTool(BaseDatabaseTool):
         description="Path to the CSV file containing player statistics"
     )
 
+    def stage_csv(self, cursor, table, path):
+        """
+        Stream a CSV file into a temporary staging table with COPY. Every CSV
+        column becomes a TEXT column; row_id keeps the file order so the last
+        row wins when a name repeats. Returns the CSV header and the row count.
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader([f.readline()]))
+            cursor.execute(sql.SQL("CREATE TEMP TABLE {} (row_id BIGSERIAL, {}) ON COMMIT DROP").format(
+                sql.Identifier(table),
+                sql.SQL(', ').join(sql.SQL("{} TEXT").format(sql.Identifier(column)) for column in header)
+            ))
+            copy = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                sql.Identifier(table),
+                sql.SQL(', ').join(sql.Identifier(column) for column in header)
+            )
+            cursor.copy_expert(copy.as_string(cursor), f)
+        return header, cursor.rowcount
+
+    def text_column(self, header, column):
+        """Select a staged column as-is, or NULL if the CSV does not have it."""
+        return sql.Identifier(column) if column in header else sql.SQL("NULL")
+
+    def integer_column(self, header, column):
+        """Select a staged column as an integer, or NULL when it is missing or not numeric."""
+        if column not in header:
+            return sql.SQL("NULL")
+        return sql.SQL(r"CASE WHEN {0} ~ '^\s*-?\d+(\.\d+)?\s*$' THEN ROUND({0}::numeric)::integer END").format(
+            sql.Identifier(column)
+        )
+
+    def float_column(self, header, column):
+        """Select a staged column as a float, with 0 for blanks and missing columns."""
+        if column not in header:
+            return sql.SQL("0")
+        return sql.SQL("COALESCE(NULLIF(TRIM({}), '')::float, 0)").format(sql.Identifier(column))
+
     def run(self):
         """Load data from CSV files into the database."""
         try:
             print("Starting data load process...")
+            timings = []
+
+            def record(stage, started, rows=None):
+                elapsed = time.perf_counter() - started
+                summary = f"{stage}: {elapsed:.3f}s" if rows is None else f"{stage}: {rows} rows in {elapsed:.3f}s"
+                timings.append(summary)
+                print(summary)
+
             print("Connecting to database...")
-            conn = self.get_db_connection()
-            print("Database connection successful")
-            
-            # Load teams data
-            print("Loading teams data...")
-            teams_data = pd.read_csv('nba_active_players.csv')
-            teams = teams_data['current_team'].unique()
-            teams = [team for team in teams if isinstance(team, str)]  # Filter out NaN values
-            
-            # Insert teams
-            cursor = conn.cursor()
-            for team in teams:
-                cursor.execute(
-                    "INSERT INTO teams (name) VALUES (%s) ON CONFLICT (name) DO NOTHING",
-                    (team,)
-                )
-            conn.commit()
-            print(f"Loaded {len(teams)} teams")
-            
-            # Load players data
-            print("Loading players data...")
-            players_data = pd.read_csv('nba_active_players.csv')
-            for _, player in players_data.iterrows():
-                cursor.execute(
-                    """
+            with self.get_db_connection() as conn:
+                print("Database connection successful")
+                cursor = conn.cursor()
+
+                # Stream the CSVs into staging tables
+                print("Staging CSV files...")
+                started = time.perf_counter()
+                players_header, rows = self.stage_csv(cursor, 'staging_players', self.players_file)
+                record("Stage players", started, rows)
+
+                teams_table, teams_header = 'staging_players', players_header
+                if self.teams_file != self.players_file:
+                    started = time.perf_counter()
+                    teams_table = 'staging_teams'
+                    teams_header, rows = self.stage_csv(cursor, teams_table, self.teams_file)
+                    record("Stage teams", started, rows)
+
+                # Insert teams
+                print("Loading teams data...")
+                started = time.perf_counter()
+                if 'current_team' in teams_header:
+                    cursor.execute(sql.SQL("""
+                        INSERT INTO teams (name)
+                        SELECT DISTINCT current_team FROM {}
+                        WHERE current_team IS NOT NULL
+                        ON CONFLICT (name) DO NOTHING
+                    """).format(sql.Identifier(teams_table)))
+                    record("Insert teams", started, cursor.rowcount)
+
+                # Upsert players, keeping the last row for a repeated name
+                print("Loading players data...")
+                started = time.perf_counter()
+                cursor.execute(sql.SQL("""
                     INSERT INTO players (name, current_team, position, age, height, weight, colleges)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    SELECT DISTINCT ON (name) name, {current_team}, {position}, {age}, {height}, {weight}, {colleges}
+                    FROM staging_players
+                    WHERE name IS NOT NULL
+                    ORDER BY name, row_id DESC
                     ON CONFLICT (name) DO UPDATE SET
                         current_team = EXCLUDED.current_team,
                         position = EXCLUDED.position,
@@ -65,96 +130,87 @@ class LoadDataTool(BaseDatabaseTool):
                         height = EXCLUDED.height,
                         weight = EXCLUDED.weight,
                         colleges = EXCLUDED.colleges
-                    """,
-                    (
-                        player['name'],
-                        player['current_team'] if pd.notna(player['current_team']) else None,
-                        player['position'] if pd.notna(player['position']) else None,
-                        player['age'] if pd.notna(player['age']) else None,
-                        player['height'] if pd.notna(player['height']) else None,
-                        player['weight'] if pd.notna(player['weight']) else None,
-                        player['colleges'] if pd.notna(player['colleges']) else None
-                    )
-                )
-            conn.commit()
-            print(f"Loaded {len(players_data)} players")
-            
-            # Load player statistics
-            print("Loading player statistics...")
-            try:
-                stats_file = 'nba_player_stats.csv'
-                if not os.path.exists(stats_file):
-                    print(f"WARNING: Stats file not found: {stats_file}")
+                """).format(
+                    current_team=self.text_column(players_header, 'current_team'),
+                    position=self.text_column(players_header, 'position'),
+                    age=self.integer_column(players_header, 'age'),
+                    height=self.text_column(players_header, 'height'),
+                    weight=self.integer_column(players_header, 'weight'),
+                    colleges=self.text_column(players_header, 'colleges')
+                ))
+                record("Upsert players", started, cursor.rowcount)
+
+                # Load player statistics
+                print("Loading player statistics...")
+                if not os.path.exists(self.stats_file):
+                    print(f"WARNING: Stats file not found: {self.stats_file}")
                     print(f"Current directory: {os.getcwd()}")
-                    print(f"Directory contents: {os.listdir()}")
-                    return
-                    
-                stats_data = pd.read_csv(stats_file)
-                print(f"Found stats file: {stats_file}")
-                print(f"Found {len(stats_data)} player statistics records")
-                print(f"Stats file columns: {list(stats_data.columns)}")
-                
-                updated_count = 0
-                for _, stats in stats_data.iterrows():
-                    cursor.execute(
-                        """
-                        UPDATE players SET
-                            games_played = %s,
-                            minutes_per_game = %s,
-                            points_per_game = %s,
-                            rebounds_per_game = %s,
-                            assists_per_game = %s,
-                            steals_per_game = %s,
-                            blocks_per_game = %s,
-                            field_goal_percentage = %s,
-                            three_point_percentage = %s,
-                            free_throw_percentage = %s,
-                            turnovers_per_game = %s
-                        WHERE name = %s
-                        """,
-                        (
-                            float(stats['games_played']),
-                            float(stats['minutes_per_game']),
-                            float(stats['points_per_game']),
-                            float(stats['rebounds_per_game']),
-                            float(stats['assists_per_game']),
-                            float(stats['steals_per_game']),
-                            float(stats['blocks_per_game']),
-                            float(stats['field_goal_percentage']),
-                            float(stats['three_point_percentage']),
-                            float(stats['free_throw_percentage']),
-                            float(stats['turnovers_per_game']),
-                            stats['name']
+                else:
+                    started = time.perf_counter()
+                    stats_header, rows = self.stage_csv(cursor, 'staging_stats', self.stats_file)
+                    record("Stage statistics", started, rows)
+
+                    started = time.perf_counter()
+                    cursor.execute(sql.SQL("""
+                        UPDATE players p SET {assignments}
+                        FROM (
+                            SELECT DISTINCT ON (name) name, {values}
+                            FROM staging_stats
+                            WHERE name IS NOT NULL
+                            ORDER BY name, row_id DESC
+                        ) s
+                        WHERE p.name = s.name
+                    """).format(
+                        assignments=sql.SQL(', ').join(
+                            sql.SQL("{0} = s.{0}").format(sql.Identifier(column)) for column in STAT_COLUMNS
+                        ),
+                        values=sql.SQL(', ').join(
+                            sql.SQL("{} AS {}").format(self.float_column(stats_header, column), sql.Identifier(column))
+                            for column in STAT_COLUMNS
                         )
-                    )
-                    updated_count += 1
-                
+                    ))
+                    record("Update statistics", started, cursor.rowcount)
+
+                # Precompute the per-minute rates rosters are simulated from
+                started = time.perf_counter()
+                rows = player_rates.refresh(cursor)
+                record("Refresh player rates", started, rows)
+
+                # Commit everything in one transaction
+                started = time.perf_counter()
+                data_version.bump(cursor)
                 conn.commit()
-                print(f"Successfully updated statistics for {updated_count} players")
-                
+                record("Commit", started)
+                data_version.notify()
+
+                # Write the roster snapshot simulation workers map instead of querying
+                started = time.perf_counter()
+                try:
+                    snapshot = roster_snapshot.export(cursor)
+                    if snapshot is not None:
+                        record(f"Export roster snapshot v{snapshot.version}", started)
+                except OSError as e:
+                    print(f"WARNING: Roster snapshot not written: {str(e)}")
+
                 # Verify the updates
                 print("Verifying player statistics...")
                 cursor.execute("""
-                    SELECT COUNT(*) FROM players 
-                    WHERE points_per_game > 0 
-                    OR rebounds_per_game > 0 
+                    SELECT COUNT(*) FROM players
+                    WHERE points_per_game > 0
+                    OR rebounds_per_game > 0
                     OR assists_per_game > 0
                 """)
                 non_zero_stats = cursor.fetchone()[0]
                 print(f"Players with non-zero stats: {non_zero_stats}")
-                
-            except Exception as e:
-                print(f"Error loading player statistics: {str(e)}")
-                raise
-            
-            cursor.close()
-            conn.close()
-            return "Data loaded successfully"
-            
+
+                cursor.close()
+
+            return f"Data loaded successfully ({'; '.join(timings)})"
+
         except Exception as e:
             print(f"Error loading data: {str(e)}")
             raise
 
 if __name__ == "__main__":
     tool = LoadDataTool()
-    print(tool.run()) 
\ No newline at end of file
+    print(tool.run())
@@ -6,15 +6,14 @@ class QueryTeamsTool(BaseDatabaseTool):
     def run(self):
         """Query all teams from the database."""
         try:
-            conn = self.get_db_connection()
-            cur = conn.cursor()
-            
-            # Query teams
-            cur.execute("SELECT name FROM teams ORDER BY name")
-            teams = [row[0] for row in cur.fetchall()]
-            
-            cur.close()
-            conn.close()
+            with self.get_db_connection() as conn:
+                cur = conn.cursor()
+                
+                # Query teams
+                cur.execute("SELECT name FROM teams ORDER BY name")
+                teams = [row[0] for row in cur.fetchall()]
+                
+                cur.close()
             
             return teams
         except Exception as e:
@@ -0,0 +1,80 @@
+from .batch_engine import STAT_NAMES, box_score
+
+# Columns of each player row in serialized box scores
+BOX_SCORE_COLUMNS = ('name', 'position', 'minutes') + STAT_NAMES
+
+
+class TeamBoxScore:
+    """One team's side of a simulated game, backed by the batch arrays."""
+
+    __slots__ = ('team', 'score', 'roster', 'minutes', 'stats')
+
+    def __init__(self, team, score, roster, minutes, stats):
+        self.team = team
+        self.score = score
+        self.roster = roster
+        self.minutes = minutes
+        self.stats = stats
+
+    def players(self):
+        """Box score dicts in the format of batch_engine.box_score."""
+        return box_score(self.roster, self.minutes, self.stats)
+
+    def to_dict(self):
+        """Plain types for serialization; players are rows of BOX_SCORE_COLUMNS."""
+        minutes = self.minutes.tolist()
+        stats = self.stats.tolist()
+        return {
+            'team': self.team,
+            'score': self.score,
+            'players': [
+                [name, self.roster.positions[i], minutes[i]] + stats[i]
+                for i, name in enumerate(self.roster.names)
+            ]
+        }
+
+
+class GameResult:
+    """A single simulated game, serialized or formatted only on request."""
+
+    __slots__ = ('home', 'away', 'ot_periods', 'seed', 'mode')
+
+    def __init__(self, home, away, ot_periods, seed=None, mode=None):
+        self.home = home
+        self.away = away
+        self.ot_periods = ot_periods
+        self.seed = seed
+        self.mode = mode
+
+    @classmethod
+    def from_batch(cls, batch, index, home_team, away_team, home, away, seed=None, mode=None):
+        """Take game index of a BatchResult between the home and away rosters."""
+        return cls(
+            TeamBoxScore(home_team, int(batch.home_scores[index]), home,
+                         batch.home_minutes[index], batch.home_stats[index]),
+            TeamBoxScore(away_team, int(batch.away_scores[index]), away,
+                         batch.away_minutes[index], batch.away_stats[index]),
+            int(batch.ot_periods[index]),
+            seed, mode
+        )
+
+    def as_tuple(self):
+        """The tuple format read by SimulateGameTool.format_game."""
+        return (
+            self.home.score,
+            self.away.score,
+            self.home.players(),
+            self.away.players(),
+            self.ot_periods > 0,
+            self.ot_periods
+        )
+
+    def to_dict(self):
+        return {
+            'home': self.home.to_dict(),
+            'away': self.away.to_dict(),
+            'ot_periods': self.ot_periods,
+            'columns': list(BOX_SCORE_COLUMNS),
+            'seed': self.seed,
+            'mode': self.mode
+        }
@@ -0,0 +1,308 @@
+import json
+import os
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from ..metrics import STAGE_SECONDS, Callback, registry, timed
+
+# Unfinished (queued or running) jobs beyond which submissions are refused
+MAX_QUEUE_DEPTH = int(os.getenv('JOB_QUEUE_MAX_DEPTH', '20'))
+
+# Worker threads per worker process
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '1'))
+
+# Seconds a running job may take before it is marked failed, so a job that
+# hangs in a live worker does not hold a queue slot forever
+JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', '1800'))
+
+# Seconds between a worker's heartbeats on the jobs it is running, and
+# seconds without one after which its jobs are handed back to the queue
+HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '10'))
+HEARTBEAT_TIMEOUT = float(os.getenv('JOB_HEARTBEAT_TIMEOUT', '60'))
+
+# Times a job is started before a lost worker fails it instead of re-queueing it
+MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+# Seconds finished jobs are kept for result retrieval
+JOB_RETENTION = float(os.getenv('JOB_RETENTION', '86400'))
+
+# Seconds between queue polls when nothing was submitted in this process
+POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+
+
+class QueueFull(Exception):
+    """Raised by submit when the queue already holds max_depth unfinished jobs."""
+
+
+class JobQueue:
+    """
+    Queue of long simulations in a SQLite file shared by the processes of
+    one host. Web processes submit jobs; worker processes (see job_worker)
+    run them on a few threads each, for the kinds they registered a
+    handler for.
+
+    Submitting returns at once with the job ID; callers poll get() and read
+    result() once the job has succeeded. Each claim, submission and
+    completion is one short IMMEDIATE transaction, so the processes never
+    hand out the same job twice and need no outside broker.
+
+    Running jobs carry their worker's heartbeat. When a worker is killed
+    mid-job, its jobs go back to the front of the queue once the heartbeat
+    is stale, up to max_attempts starts per job.
+    """
+
+    def __init__(self, path, max_depth=MAX_QUEUE_DEPTH, workers=JOB_WORKERS,
+                 timeout=JOB_TIMEOUT, retention=JOB_RETENTION, poll_interval=POLL_INTERVAL,
+                 heartbeat_interval=HEARTBEAT_INTERVAL, heartbeat_timeout=HEARTBEAT_TIMEOUT,
+                 max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_depth = max_depth
+        self.workers = workers
+        self.timeout = timeout
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.handlers = {}
+        # Tags the jobs this process claims, so only it heartbeats and finishes them
+        self.worker_id = uuid.uuid4().hex
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL,
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # Queue files created before heartbeats lack their columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in (('heartbeat_at', 'REAL'), ('worker', 'TEXT'),
+                                   ('attempts', 'INTEGER NOT NULL DEFAULT 0')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at)")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._started = False
+
+    def register(self, kind, handler):
+        """Run jobs of kind with handler(params), which returns a JSON-serializable result."""
+        self.handlers[kind] = handler
+
+    def _transaction(self, work):
+        """Run work(conn) in an IMMEDIATE transaction, which holds the write lock across processes."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = work(self._conn)
+                self._conn.execute("COMMIT")
+                return value
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _expire(self, conn, now):
+        """
+        Fail jobs that outran the timeout, hand jobs of lost workers back to
+        the queue, or fail them once they used up their attempts, and drop
+        finished jobs past retention.
+        """
+        conn.execute("""
+            UPDATE jobs SET status = ?, error = ?, finished_at = ?
+            WHERE status = ? AND started_at < ?
+        """, (FAILED, f"Timed out after {self.timeout:.0f}s", now, RUNNING, now - self.timeout))
+        stale = now - self.heartbeat_timeout
+        conn.execute("""
+            UPDATE jobs SET status = ?, error = ?, finished_at = ?
+            WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ? AND attempts >= ?
+        """, (FAILED, f"Worker lost {self.max_attempts} times", now, RUNNING, stale, self.max_attempts))
+        requeued = conn.execute("""
+            UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL, worker = NULL
+            WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ?
+        """, (QUEUED, RUNNING, stale)).rowcount
+        if requeued:
+            print(f"Re-queued {requeued} jobs of lost workers")
+        conn.execute("DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                     (SUCCEEDED, FAILED, now - self.retention))
+
+    def submit(self, kind, params):
+        """
+        Queue a job and return its ID. Raises QueueFull when max_depth jobs
+        are already queued or running, so callers can shed load instead of
+        letting the backlog grow.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+
+        def insert(conn):
+            now = time.time()
+            self._expire(conn, now)
+            depth = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchone()[0]
+            if depth >= self.max_depth:
+                raise QueueFull(f"Job queue is full ({depth} jobs waiting or running)")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(params), QUEUED, now)
+            )
+
+        self._transaction(insert)
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        """Status of a job as a dict, with its place in line while queued; None if unknown."""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT id, kind, status, error, created_at, started_at, finished_at
+                FROM jobs WHERE id = ?
+            """, (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(zip(('id', 'kind', 'status', 'error', 'created_at', 'started_at', 'finished_at'), row))
+            if job['status'] == QUEUED:
+                job['position'] = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < ?", (QUEUED, job['created_at'])
+                ).fetchone()[0]
+        return job
+
+    def result(self, job_id):
+        """(status, result, error) of a job; result is decoded once the job has succeeded."""
+        with self._lock:
+            row = self._conn.execute("SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        status, result, error = row
+        return status, json.loads(result) if result is not None else None, error
+
+    def stats(self):
+        """Number of jobs in each status."""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+
+    def _claim(self):
+        """Mark the oldest queued job of a registered kind running and return it, or None."""
+        kinds = list(self.handlers)
+
+        def claim(conn):
+            now = time.time()
+            self._expire(conn, now)
+            row = conn.execute(f"""
+                SELECT id, kind, params, created_at FROM jobs
+                WHERE status = ? AND kind IN ({', '.join('?' * len(kinds))})
+                ORDER BY created_at LIMIT 1
+            """, [QUEUED] + kinds).fetchone()
+            if row is not None:
+                conn.execute("""
+                    UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, worker = ?, attempts = attempts + 1
+                    WHERE id = ?
+                """, (RUNNING, now, now, self.worker_id, row[0]))
+                STAGE_SECONDS.labels('job_wait').observe(now - row[3])
+            return row
+
+        return self._transaction(claim) if kinds else None
+
+    def _finish(self, job_id, result=None, error=None):
+        status = FAILED if error is not None else SUCCEEDED
+        self._transaction(lambda conn: conn.execute("""
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?
+            WHERE id = ? AND status = ? AND worker = ?
+        """, (status, json.dumps(result) if error is None else None, error, time.time(), job_id, RUNNING,
+              self.worker_id)))
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(self.heartbeat_interval)
+            try:
+                self._transaction(lambda conn: conn.execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND worker = ?",
+                    (time.time(), RUNNING, self.worker_id)
+                ))
+            except sqlite3.Error as e:
+                print(f"Error recording job heartbeat: {str(e)}")
+
+    def release(self):
+        """Hand the jobs this process is running back to the queue, as on shutdown."""
+        released = self._transaction(lambda conn: conn.execute("""
+            UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL, worker = NULL,
+                attempts = MAX(attempts - 1, 0)
+            WHERE status = ? AND worker = ?
+        """, (QUEUED, RUNNING, self.worker_id)).rowcount)
+        if released:
+            print(f"Re-queued {released} running jobs")
+        return released
+
+    def _work(self):
+        while True:
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"Error claiming job: {str(e)}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            job_id, kind, params, _ = job
+            print(f"Running {kind} job {job_id}")
+            try:
+                with timed(f'job_{kind}'):
+                    result = self.handlers[kind](json.loads(params))
+                self._finish(job_id, result=result)
+            except Exception as e:
+                print(f"Error in {kind} job {job_id}: {str(e)}")
+                print(traceback.format_exc())
+                self._finish(job_id, error=str(e))
+
+    def start(self):
+        """Start this process's worker and heartbeat threads; safe to call more than once."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for index in range(self.workers):
+            threading.Thread(target=self._work, name=f'job-worker-{index}', daemon=True).start()
+        threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True).start()
+
+    def serve(self):
+        """
+        Run the worker threads until SIGTERM or SIGINT, then re-queue the
+        jobs still running, so a restarted worker picks them up at once.
+        """
+        stop = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *args: stop.set())
+        self.start()
+        print(f"Job worker {self.worker_id} running {self.workers} threads for {', '.join(self.handlers)} jobs")
+        while not stop.wait(1):
+            pass
+        self.release()
+
+
+job_queue = JobQueue(os.getenv('JOB_QUEUE_PATH') or os.path.join(tempfile.gettempdir(), 'nba_sim_jobs.sqlite3'))
+registry.register(Callback(
+    'nba_sim_jobs',
+    'Jobs in the queue, by status.',
+    lambda: {(status,): count for status, count in job_queue.stats().items()},
+    ('status',)
+))
@@ -0,0 +1,57 @@
+"""
+Worker process for the background simulation jobs queued by the web app.
+
+    python -m basketball_simulator_agency.game_simulation_agent.job_worker
+
+Runs JOB_WORKERS threads against the JOB_QUEUE_PATH queue until SIGTERM,
+outside the web server, so long simulations never compete with request
+handling and survive web worker restarts.
+"""
+from .job_queue import job_queue
+from .tools.SimulateDailyGamesTool import SimulateDailyGamesTool
+from .tools.SimulateGameTool import SimulateGameTool
+
+
+def run_daily_job(params):
+    """Job handler: the /api/v2/simulate_daily payload of a slate."""
+    daily_tool = SimulateDailyGamesTool(
+        seed=params['seed'],
+        replications=params['replications'],
+        mode=params['mode'],
+        game_date=params['date']
+    )
+    games, rosters, slate = daily_tool.simulate(params['seed'])
+    return daily_tool.slate_payload(games, rosters, slate, params['seed'])
+
+
+def run_games_job(params):
+    """
+    Job handler: simulate every (home_team, away_team) matchup once, or
+    params['runs'] times for an aggregate summary, under one seed.
+    """
+    results = []
+    for home_team, away_team in params['games']:
+        game_tool = SimulateGameTool(home_team=home_team, away_team=away_team, seed=params['seed'], mode=params['mode'])
+        entry = {'home_team': home_team, 'away_team': away_team}
+        try:
+            if params['runs'] > 1:
+                for aggregate in game_tool.simulate_matchup(params['runs']):
+                    pass
+                entry['aggregate'] = aggregate.summary()
+            else:
+                entry['game'] = game_tool.simulate_result(params['seed']).to_dict()
+        except ValueError as e:
+            entry['error'] = str(e)
+        results.append(entry)
+    return {'seed': params['seed'], 'runs': params['runs'], 'mode': params['mode'], 'games': results}
+
+
+def register_handlers(queue=job_queue):
+    """Register the simulation job kinds; submitting needs them as much as running does."""
+    queue.register('simulate_daily', run_daily_job)
+    queue.register('simulate_games', run_games_job)
+
+
+if __name__ == '__main__':
+    register_handlers()
+    job_queue.serve()
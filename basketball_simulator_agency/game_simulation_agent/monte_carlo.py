@@ -0,0 +1,217 @@
+import numpy as np
+from .batch_engine import STAT_NAMES, simulate_games
+from .possession_engine import simulate_possessions
+from .rng import STREAM_CHUNK_SIZE, chunk_sequences, generator, matchup_sequence
+from ..metrics import SIMULATED_GAMES, STAGE_SECONDS
+
+# Quantiles reported for spreads, totals and player stat lines
+QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+PLAYER_QUANTILES = (0.1, 0.5, 0.9)
+
+# Player stats tracked per run; values above the cap share the last bin
+PLAYER_STATS = ('minutes',) + STAT_NAMES
+MAX_PLAYER_STAT = 100
+
+DEFAULT_BATCH_SIZE = STREAM_CHUNK_SIZE
+HISTOGRAM_BIN_WIDTH = 5
+
+# Game engines by mode name; all take (home, away, n_games, rng) and
+# return a BatchResult
+ENGINES = {
+    'box': simulate_games,
+    'possession': simulate_possessions
+}
+DEFAULT_ENGINE = 'box'
+
+
+class IntHistogram:
+    """Counts of integer outcomes in [low, high]; values outside are clamped."""
+
+    def __init__(self, low, high):
+        self.low = low
+        self.counts = np.zeros(high - low + 1, dtype=np.int64)
+        self.total = 0
+        self.n = 0
+
+    def add(self, values):
+        self.counts += np.bincount(
+            np.clip(values - self.low, 0, len(self.counts) - 1),
+            minlength=len(self.counts)
+        )
+        self.total += int(values.sum())
+        self.n += len(values)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.total += other.total
+        self.n += other.n
+
+    def mean(self):
+        return round(self.total / self.n, 2) if self.n else None
+
+    def quantile(self, q):
+        cumulative = np.cumsum(self.counts)
+        return int(np.searchsorted(cumulative, q * self.n)) + self.low
+
+    def summary(self, bin_width=HISTOGRAM_BIN_WIDTH):
+        """Mean, quantiles and a histogram trimmed to the observed range."""
+        if not self.n:
+            return {
+                'mean': None,
+                'quantiles': {},
+                'histogram': {'bin_width': bin_width, 'bins': [], 'counts': []}
+            }
+
+        observed = np.flatnonzero(self.counts)
+        first = observed[0] - observed[0] % bin_width
+        last = observed[-1] + 1
+        padded = np.zeros(-(-(last - first) // bin_width) * bin_width, dtype=np.int64)
+        padded[:last - first] = self.counts[first:last]
+        binned = padded.reshape(-1, bin_width).sum(axis=1)
+
+        return {
+            'mean': self.mean(),
+            'quantiles': {f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES},
+            'histogram': {
+                'bin_width': bin_width,
+                'bins': (np.arange(len(binned)) * bin_width + first + self.low).tolist(),
+                'counts': binned.tolist()
+            }
+        }
+
+
+class PlayerStatCounts:
+    """Per-player histograms of every stat in PLAYER_STATS for one roster."""
+
+    def __init__(self, roster):
+        self.roster = roster
+        self.counts = np.zeros(
+            (len(roster), len(PLAYER_STATS), MAX_PLAYER_STAT + 1),
+            dtype=np.int64
+        )
+        self.n = 0
+
+    def add(self, minutes, stats):
+        values = np.concatenate((minutes[:, :, None], stats), axis=2)
+        np.clip(values, 0, MAX_PLAYER_STAT, out=values)
+
+        # Offset each (player, stat) pair into its own block of bins so a single
+        # bincount updates every histogram at once
+        offsets = np.arange(self.counts.shape[0] * self.counts.shape[1]).reshape(
+            self.counts.shape[:2]
+        ) * (MAX_PLAYER_STAT + 1)
+        self.counts += np.bincount(
+            (values + offsets).ravel(), minlength=self.counts.size
+        ).reshape(self.counts.shape)
+        self.n += len(minutes)
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n += other.n
+
+    def summary(self):
+        if not self.n:
+            return []
+
+        cumulative = np.cumsum(self.counts, axis=2)
+        percentiles = np.stack(
+            [(cumulative < q * self.n).sum(axis=2) for q in PLAYER_QUANTILES],
+            axis=2
+        ).tolist()
+        players = []
+        for i, name in enumerate(self.roster.names):
+            player = {'name': name, 'position': self.roster.positions[i]}
+            for j, stat in enumerate(PLAYER_STATS):
+                player[stat] = {
+                    f"p{round(q * 100)}": percentiles[i][j][k]
+                    for k, q in enumerate(PLAYER_QUANTILES)
+                }
+            players.append(player)
+        return players
+
+
+class MatchupAggregate:
+    """Running aggregate of many simulated games between two rosters."""
+
+    def __init__(self, home_team, away_team, home, away):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.runs = 0
+        self.home_wins = 0
+        self.overtime_games = 0
+        self.home_scores = IntHistogram(0, 250)
+        self.away_scores = IntHistogram(0, 250)
+        self.spreads = IntHistogram(-100, 100)
+        self.totals = IntHistogram(100, 400)
+        self.home_players = PlayerStatCounts(home)
+        self.away_players = PlayerStatCounts(away)
+
+    def add(self, batch):
+        """Fold a BatchResult into the aggregate."""
+        self.runs += batch.n_games
+        self.home_wins += int((batch.home_scores > batch.away_scores).sum())
+        self.overtime_games += int((batch.ot_periods > 0).sum())
+        self.home_scores.add(batch.home_scores)
+        self.away_scores.add(batch.away_scores)
+        self.spreads.add(batch.home_scores - batch.away_scores)
+        self.totals.add(batch.home_scores + batch.away_scores)
+        self.home_players.add(batch.home_minutes, batch.home_stats)
+        self.away_players.add(batch.away_minutes, batch.away_stats)
+
+    def merge(self, other):
+        """Fold another aggregate of the same matchup into this one."""
+        self.runs += other.runs
+        self.home_wins += other.home_wins
+        self.overtime_games += other.overtime_games
+        self.home_scores.merge(other.home_scores)
+        self.away_scores.merge(other.away_scores)
+        self.spreads.merge(other.spreads)
+        self.totals.merge(other.totals)
+        self.home_players.merge(other.home_players)
+        self.away_players.merge(other.away_players)
+
+    def summary(self):
+        runs = self.runs or 1
+        return {
+            'home_team': self.home_team,
+            'away_team': self.away_team,
+            'runs': self.runs,
+            'home_win_probability': round(self.home_wins / runs, 4),
+            'overtime_frequency': round(self.overtime_games / runs, 4),
+            'home_score': self.home_scores.mean(),
+            'away_score': self.away_scores.mean(),
+            'spread': self.spreads.summary(),
+            'total': self.totals.summary(),
+            'players': {
+                'home': self.home_players.summary(),
+                'away': self.away_players.summary()
+            }
+        }
+
+
+def iter_matchup(home_team, away_team, home, away, runs,
+                 batch_size=DEFAULT_BATCH_SIZE, seed=None, engine=DEFAULT_ENGINE):
+    """
+    Simulate runs games with the ENGINES entry named engine, yielding the
+    MatchupAggregate after every batch_size games or so, so callers can
+    report partial results. The last yield covers every run.
+
+    Games are played in the fixed chunks of rng.chunk_sequences under the
+    matchup's stream of seed, so a seed gives the same aggregate whatever
+    the batch size, and the same one simulate_slate computes.
+    """
+    simulate = ENGINES[engine]
+    streams = chunk_sequences(matchup_sequence(seed, home_team, away_team), runs)
+    timer = STAGE_SECONDS.labels('simulate')
+    games = SIMULATED_GAMES.labels(engine)
+
+    aggregate = MatchupAggregate(home_team, away_team, home, away)
+    pending = 0
+    for i, (n_games, sequence) in enumerate(streams):
+        with timer.time():
+            aggregate.add(simulate(home, away, n_games, generator(sequence)))
+        games.inc(n_games)
+        pending += n_games
+        if pending >= batch_size or i == len(streams) - 1:
+            pending = 0
+            yield aggregate
@@ -0,0 +1,299 @@
+import numpy as np
+from .batch_engine import (
+    BatchResult, MAX_OVERTIME_PERIODS, OVERTIME_MINUTES, REGULATION_MINUTES, STAT_NAMES, draw_minutes
+)
+
+# Possessions per team in regulation and in each overtime period
+REGULATION_POSSESSIONS = 100
+# (REGULATION_MINUTES counts all five players, so a game lasts a fifth of it)
+OVERTIME_POSSESSIONS = round(REGULATION_POSSESSIONS * OVERTIME_MINUTES * 5 / REGULATION_MINUTES)
+
+# League-average event rates; the rosters decide who is involved in each event
+THREE_POINT_RATE = 0.39         # share of shots from three, for players who shoot threes
+SHOOTING_FOUL_RATE = 0.11       # attempts that end in free throws instead of a field goal
+OFFENSIVE_REBOUND_RATE = 0.24   # missed shots rebounded by the offense
+ASSIST_RATE = 0.62              # made field goals that are assisted
+BLOCK_RATE = 0.09               # missed field goals that are blocked
+STEAL_RATE = 0.55               # turnovers that are steals
+MAX_TURNOVER_RATE = 0.5
+
+# Shots per possession before the defense is awarded the ball regardless
+MAX_ATTEMPTS = 3
+
+# Entries per player-selection lookup table; a power of two for masking
+TABLE_SIZE = 1024
+
+# Random 16-bit words drawn per attempt: turnover or foul, shooter, three,
+# make, three free throws, offensive rebound
+DRAWS_PER_ATTEMPT = 8
+
+# Index of each stat in the tensors shared with the batch engine
+POINTS, REBOUNDS, ASSISTS, STEALS, BLOCKS, TURNOVERS = range(len(STAT_NAMES))
+
+# Games simulated per vectorized pass, bounding the size of the event log
+CHUNK_SIZE = 4096
+
+
+def _threshold(probabilities):
+    """Probabilities as uint16 thresholds for comparison with uint16 draws."""
+    return np.rint(np.clip(probabilities, 0, 1) * 65535).astype(np.uint16)
+
+
+def _pick_table(weights):
+    """
+    Lookup table mapping TABLE_SIZE equal slices of [0, 1) to player
+    indices in proportion to weights.
+    """
+    cumulative = np.cumsum(weights) / weights.sum()
+    slots = (np.arange(TABLE_SIZE) + 0.5) / TABLE_SIZE
+    return np.minimum(np.searchsorted(cumulative, slots), len(weights) - 1)
+
+
+def _shares(weights):
+    """Normalized non-negative weights, uniform when they are all zero."""
+    weights = np.maximum(np.asarray(weights, dtype=np.float64), 0)
+    if weights.sum() <= 0:
+        weights = np.ones_like(weights)
+    return weights / weights.sum()
+
+
+_FOUL_THRESHOLD = _threshold(SHOOTING_FOUL_RATE)
+_OFFENSIVE_REBOUND_THRESHOLD = _threshold(OFFENSIVE_REBOUND_RATE)
+
+
+# Rows of the per-slot event counters, all counted on the offense slot.
+# Steals, assists and blocks are independent thinnings of turnovers, made
+# and missed field goals, so they are drawn from these counts at the end.
+_TURNOVERS, _MADE, _MISSED, _OFFENSIVE_REBOUNDS, _DEFENSIVE_REBOUNDS = range(5)
+
+# Stats other than points, shared out among players after the possessions
+_STAT_ORDER = (REBOUNDS, ASSISTS, STEALS, BLOCKS, TURNOVERS)
+
+
+class _Matchup:
+    """Shooter tables, team rates and per-player shooting thresholds for two rosters."""
+
+    def __init__(self, home, away):
+        self.n_home = len(home)
+        self.n_players = len(home) + len(away)
+        event_tables = {stat: [] for stat in range(len(STAT_NAMES))}
+        turnover_thresholds = []
+        shooting = []
+        for roster, offset in ((home, 0), (away, self.n_home)):
+            # Season averages per game decide who shoots, rebounds, and so on
+            averages = roster.rates * roster.mpg[:, None]
+            for stat, tables in event_tables.items():
+                tables.append(_pick_table(_shares(averages[:, stat])) + offset)
+
+            # Team turnovers per possession, with averages scaled to 240 minutes
+            total_minutes = float(roster.mpg.sum())
+            scale = REGULATION_MINUTES / total_minutes if total_minutes > 0 else 0
+            turnovers = averages[:, TURNOVERS].sum() * scale / REGULATION_POSSESSIONS
+            turnover_thresholds.append(_threshold(min(turnovers, MAX_TURNOVER_RATE)))
+
+            field_goal, three_point, free_throw = roster.shooting.T
+            three_rate = np.where(three_point > 0, THREE_POINT_RATE, 0)
+            # Two point percentage implied by the overall and three point ones
+            two_point = (field_goal - three_rate * three_point) / (1 - three_rate)
+            shooting.append(np.stack([three_rate, three_point, two_point, free_throw]))
+
+        # Tables are indexed by side * TABLE_SIZE + slot, side 0 being home;
+        # event_tables stacks the other stats' tables in the order of
+        # _STAT_ORDER, each home then away
+        self.shooters = np.concatenate(event_tables[POINTS]).astype(np.intp)
+        self.event_tables = np.concatenate([
+            table for stat in _STAT_ORDER for table in event_tables[stat]
+        ]).astype(np.intp)
+        self.turnover = np.array(turnover_thresholds, dtype=np.uint16)
+
+        # Three rate, three point, two point and free throw thresholds of each
+        # player (home then away) packed into one word, so a single gather
+        # fetches all four for the drawn shooters
+        thresholds = _threshold(np.concatenate(shooting, axis=1))
+        self.shooting = np.ascontiguousarray(thresholds.T).view(np.uint64).ravel()
+
+
+def _attempt(matchup, rng, rows, table_offset, turnover_threshold, foul_threshold,
+             keys, counts, scores, log):
+    """
+    Play one attempt for each offense slot in rows (an index array, or a
+    slice for every slot): a turnover, free throws or a field goal try.
+    Points are logged per shooter; every other event is only counted per
+    slot. Returns the mask of rows that keep the ball after an offensive
+    rebound.
+    """
+    n = len(keys)
+    raw = rng.bit_generator.random_raw((n * DRAWS_PER_ATTEMPT + 3) // 4)
+    draws = raw.view(np.uint16)[:n * DRAWS_PER_ATTEMPT].reshape(DRAWS_PER_ATTEMPT, n)
+
+    # One draw decides between a turnover, a shooting foul and a shot
+    turnover = draws[0] < turnover_threshold
+    shot = draws[0] >= foul_threshold
+    fouled = ~(turnover | shot)
+    counts[_TURNOVERS, rows] += turnover
+
+    shooter = matchup.shooters[table_offset + (draws[1] & (TABLE_SIZE - 1))]
+    three_rate, three_point, two_point, free_throws = matchup.shooting[shooter].view(np.uint16).reshape(n, 4).T
+    three = draws[2] < three_rate
+    made = shot & (draws[3] < np.where(three, three_point, two_point))
+    missed = shot ^ made
+    counts[_MADE, rows] += made
+    counts[_MISSED, rows] += missed
+    points = (made.view(np.uint8) << 1) | (made & three).view(np.uint8)
+
+    # Fouled shots, a small share, go to the line for two, or three on a
+    # three point try; a missed last free throw is rebounded like a miss
+    rebound = missed
+    fouled = np.flatnonzero(fouled)
+    if fouled.size:
+        free_throws = free_throws[fouled]
+        three = three[fouled]
+        second = draws[5, fouled] < free_throws
+        third = three & (draws[6, fouled] < free_throws)
+        points[fouled] = (draws[4, fouled] < free_throws).view(np.uint8) + second + third
+        rebound[fouled[~np.where(three, third, second)]] = True
+
+    scores[rows] += points
+    log.append((keys + shooter, points))
+
+    offensive = rebound & (draws[7] < _OFFENSIVE_REBOUND_THRESHOLD)
+    counts[_OFFENSIVE_REBOUNDS, rows] += offensive
+    counts[_DEFENSIVE_REBOUNDS, rows] += rebound & ~offensive
+    return offensive
+
+
+def _play_possessions(matchup, rng, games, n_games, n_possessions, counts, scores, log):
+    """Play n_possessions for both teams of each listed game."""
+    # Offense slots: home offense of each game at its index, away offense n_games later
+    everyone = len(games) == n_games
+    rows = np.concatenate([games, games + n_games])
+    side = np.repeat(np.array([0, 1], dtype=np.intp), len(games))
+    table_offset = side * TABLE_SIZE
+    turnover_threshold = matchup.turnover[side]
+    foul_threshold = turnover_threshold + _FOUL_THRESHOLD
+    keys = np.concatenate([games, games]) * matchup.n_players
+    for _ in range(n_possessions):
+        # Regulation covers every slot, where a slice avoids fancy indexing
+        active = np.flatnonzero(_attempt(
+            matchup, rng, slice(None) if everyone else rows, table_offset,
+            turnover_threshold, foul_threshold, keys, counts, scores, log
+        ))
+        # Slots that rebound their own miss shoot again
+        for _ in range(MAX_ATTEMPTS - 1):
+            if not active.size:
+                break
+            keep = _attempt(
+                matchup, rng, rows[active], table_offset[active],
+                turnover_threshold[active], foul_threshold[active], keys[active],
+                counts, scores, log
+            )
+            active = active[keep]
+
+
+def _settle(matchup, rng, games, n_games, scores, log):
+    """
+    Decide games still tied after MAX_OVERTIME_PERIODS with one point to a
+    random side, scored by a player drawn from its shooter table. Rosters
+    that cannot score, such as players without shooting percentages, would
+    otherwise play overtime forever.
+    """
+    raw = rng.bit_generator.random_raw((2 * len(games) + 3) // 4)
+    draws = raw.view(np.uint16)[:2 * len(games)].reshape(2, len(games))
+    side = (draws[0] & 1).astype(np.intp)
+    shooter = matchup.shooters[side * TABLE_SIZE + (draws[1] & (TABLE_SIZE - 1))]
+    scores[games + side * n_games] += 1
+    log.append((games * matchup.n_players + shooter, np.ones(len(games), dtype=np.uint8)))
+
+
+def _simulate_chunk(home, away, n_games, rng):
+    matchup = _Matchup(home, away)
+    # Per-slot event counts and scores; slots are home offense of each game,
+    # then away offense
+    counts = np.zeros((5, 2 * n_games), dtype=np.int32)
+    scores = np.zeros(2 * n_games, dtype=np.int32)
+    ot_periods = np.zeros(n_games, dtype=np.int32)
+    log = []
+
+    _play_possessions(matchup, rng, np.arange(n_games), n_games, REGULATION_POSSESSIONS, counts, scores, log)
+
+    # Overtime periods are played until every game is decided, up to the
+    # cap box mode uses
+    tied = np.flatnonzero(scores[:n_games] == scores[n_games:])
+    for _ in range(MAX_OVERTIME_PERIODS):
+        if not tied.size:
+            break
+        ot_periods[tied] += 1
+        _play_possessions(matchup, rng, tied, n_games, OVERTIME_POSSESSIONS, counts, scores, log)
+        tied = tied[scores[tied] == scores[tied + n_games]]
+    if tied.size:
+        _settle(matchup, rng, tied, n_games, scores, log)
+
+    # Points go to the logged shooters in one pass
+    points = np.bincount(
+        np.concatenate([entry[0] for entry in log]),
+        weights=np.concatenate([entry[1] for entry in log]),
+        minlength=n_games * matchup.n_players
+    ).reshape(n_games, matchup.n_players)
+
+    # Team totals per slot, with defensive events moved to the defending slot
+    opposing = np.roll(counts, n_games, axis=1)
+    team_totals = {  # in _STAT_ORDER
+        REBOUNDS: counts[_OFFENSIVE_REBOUNDS] + opposing[_DEFENSIVE_REBOUNDS],
+        ASSISTS: rng.binomial(counts[_MADE], ASSIST_RATE),
+        STEALS: rng.binomial(opposing[_TURNOVERS], STEAL_RATE),
+        BLOCKS: rng.binomial(opposing[_MISSED], BLOCK_RATE),
+        TURNOVERS: counts[_TURNOVERS]
+    }
+
+    # and shared out among a team's players by their season averages: each
+    # event picks its player from the lookup table of its stat and side.
+    # Costs scale with the number of events rather than games * players
+    # as a multinomial draw per game would.
+    stats = np.zeros((n_games, matchup.n_players, len(STAT_NAMES)), dtype=np.int32)
+    stats[:, :, POINTS] = points
+    game_keys = np.arange(n_games) * matchup.n_players
+    for table, (stat, totals) in enumerate(
+        (stat, totals) for stat in _STAT_ORDER for totals in np.split(team_totals[stat], 2)
+    ):
+        keys = np.repeat(game_keys, totals)
+        raw = rng.bit_generator.random_raw((len(keys) + 3) // 4)
+        slots = table * TABLE_SIZE + (raw.view(np.uint16)[:len(keys)] & (TABLE_SIZE - 1))
+        stats[:, :, stat] += np.bincount(
+            keys + matchup.event_tables[slots], minlength=n_games * matchup.n_players
+        ).reshape(n_games, matchup.n_players).astype(np.int32)
+    sides = [stats[:, :matchup.n_home], stats[:, matchup.n_home:]]
+
+    target = REGULATION_MINUTES + OVERTIME_MINUTES * ot_periods
+    return BatchResult(
+        draw_minutes(home, target, rng).astype(np.int32), sides[0],
+        draw_minutes(away, target, rng).astype(np.int32), sides[1],
+        scores[:n_games], scores[n_games:], ot_periods
+    )
+
+
+def simulate_possessions(home, away, n_games, rng=None):
+    """
+    Simulate n_games possession by possession; a drop-in alternative to
+    batch_engine.simulate_games that returns the same BatchResult.
+
+    Each possession ends in a turnover, free throws or field goal tries
+    whose makes are drawn from the shooter's field goal, three point and
+    free throw percentages, so team scores follow from shooting rather than
+    from summed point totals. Games are vectorized: every possession is
+    played for all games at once, drawing 16-bit random words in bulk and
+    picking players from fixed lookup tables, and player events are only
+    logged as id arrays until one bincount per stat at the end.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    chunks = [
+        _simulate_chunk(home, away, min(CHUNK_SIZE, n_games - start), rng)
+        for start in range(0, n_games, CHUNK_SIZE)
+    ]
+    if len(chunks) == 1:
+        return chunks[0]
+    return BatchResult(*(
+        np.concatenate([getattr(chunk, field) for chunk in chunks])
+        for field in BatchResult.__slots__
+    ))
@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from ..database_agent import data_version
+from ..metrics import Callback, registry
+
+# Raised whenever the same parameters start producing different results, so
+# the disk tier never serves results of the previous scheme
+KEY_VERSION = 2
+
+
+def cache_key(kind, version, *params):
+    """Key of a cached result: the request kind, data version and parameters."""
+    return json.dumps([KEY_VERSION, kind, version] + list(params), separators=(',', ':'))
+
+
+class DiskTier:
+    """
+    SQLite store of serialized results, shared by the processes of one host.
+    Rows carry their data version; once a newer version is written the older
+    rows are dropped (a process still on an older version never deletes
+    newer rows), and the least recently read rows go first when the
+    store outgrows max_bytes.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                value BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed_idx ON results (accessed_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return bytes(row[0])
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM results WHERE version < ?", (version,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, version, value, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, version, value, time.time())
+                )
+                total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results").fetchone()[0]
+                if total > self.max_bytes:
+                    # Drop the least recently read rows until the store fits again
+                    excess = total - self.max_bytes
+                    for old_key, size in self._conn.execute(
+                        "SELECT key, LENGTH(value) FROM results ORDER BY accessed_at"
+                    ).fetchall():
+                        if excess <= 0:
+                            break
+                        self._conn.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                        excess -= size
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+
+class ResultCache:
+    """
+    LRU cache of serialized simulation results, bounded by total bytes.
+
+    Keys include the data version (see cache_key), so results computed from
+    older player data are never served. A load in this process clears the
+    cache outright; loads elsewhere are picked up when the roster cache
+    revalidates the version. Entries evicted from memory can be found again
+    in the optional DiskTier.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _store(self, key, value):
+        """Insert into the memory tier and evict down to max_bytes. Caller holds the lock."""
+        if len(value) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = value
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def get(self, key):
+        """Return the cached bytes for key, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            generation = self._generation
+
+        value = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                if generation == self._generation:
+                    self._store(key, value)
+        return value
+
+    def put(self, key, version, value):
+        """Cache value (bytes) under key, computed from data version."""
+        with self._lock:
+            self._store(key, value)
+        if self.disk is not None:
+            self.disk.put(key, version or 0, value)
+
+    def get_or_compute(self, key, version, compute):
+        """Return the cached bytes for key, calling compute() to fill a miss."""
+        value = self.get(key)
+        if value is None:
+            with self._lock:
+                generation = self._generation
+            value = compute()
+            # Skip storing results computed while a load in this process invalidated the cache
+            with self._lock:
+                current = generation == self._generation
+            if current:
+                self.put(key, version, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses
+            }
+
+
+def _disk_tier():
+    path = os.getenv('RESULT_CACHE_PATH')
+    if not path:
+        return None
+    try:
+        return DiskTier(path, int(float(os.getenv('RESULT_CACHE_DISK_MB', '512')) * 1024 * 1024))
+    except sqlite3.Error as e:
+        print(f"Result cache disk tier disabled: {str(e)}")
+        return None
+
+
+result_cache = ResultCache(
+    max_bytes=int(float(os.getenv('RESULT_CACHE_MB', '64')) * 1024 * 1024),
+    disk=_disk_tier()
+)
+registry.register(Callback(
+    'nba_sim_result_cache_lookups_total',
+    'Result cache lookups, by memory hit, disk hit or miss.',
+    lambda: {(result,): result_cache.stats()[key]
+             for result, key in (('hit', 'hits'), ('disk_hit', 'disk_hits'), ('miss', 'misses'))},
+    ('result',), kind='counter'
+))
+registry.register(Callback(
+    'nba_sim_result_cache_bytes',
+    'Bytes of encoded results held in memory by the result cache.',
+    lambda: result_cache.stats()['bytes']
+))
+data_version.add_listener(result_cache.invalidate)
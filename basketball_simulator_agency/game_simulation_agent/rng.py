@@ -0,0 +1,77 @@
+import secrets
+import zlib
+import numpy as np
+
+# Games simulated per independent random stream. Streams are cut by game
+# count, never by worker or batch count, so a seed reproduces the same games
+# however the work is split.
+STREAM_CHUNK_SIZE = 1000
+
+# Bits of generated seeds, small enough to survive a round trip through a
+# JSON number in JavaScript
+SEED_BITS = 53
+
+
+def resolve_seed(seed=None):
+    """
+    Return seed as an int, drawing a fresh one from OS entropy when it is
+    None, so an unseeded run can report the seed that reproduces it.
+    """
+    if seed is None:
+        return secrets.randbits(SEED_BITS)
+    return int(seed)
+
+
+def seed_sequence(seed=None):
+    """SeedSequence for seed: an int, a SeedSequence (returned as is) or None."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def _name_key(name):
+    """Stable 32-bit key of a team name; hash() is salted per process."""
+    return zlib.crc32(name.encode('utf-8'))
+
+
+def matchup_sequence(seed, home_team, away_team):
+    """
+    Stream of one matchup under seed. It is derived from the team names
+    rather than spawned in order, so a matchup draws the same streams
+    whether it is simulated alone, on a slate or in another process.
+    """
+    root = seed_sequence(seed)
+    return np.random.SeedSequence(
+        root.entropy,
+        spawn_key=tuple(root.spawn_key) + (_name_key(home_team), _name_key(away_team))
+    )
+
+
+def chunk_sequences(sequence, n_games, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Independent child streams of sequence for consecutive chunks of
+    chunk_size games, paired with each chunk's game count.
+    """
+    n_chunks = -(-n_games // chunk_size)
+    children = np.random.SeedSequence(
+        sequence.entropy, spawn_key=tuple(sequence.spawn_key)
+    ).spawn(n_chunks)
+    return [
+        (min(chunk_size, n_games - i * chunk_size), child)
+        for i, child in enumerate(children)
+    ]
+
+
+def game_sequence(seed, home_team, away_team):
+    """
+    Stream of the single game of a matchup under seed: the first chunk of
+    its matchup stream, played as a batch of one. SimulateGameTool plays it,
+    and slates report it as their sample game, so a slate game's seed
+    reproduces it through the single-game routes.
+    """
+    return chunk_sequences(matchup_sequence(seed, home_team, away_team), 1)[0][1]
+
+
+def generator(sequence):
+    """NumPy Generator for a SeedSequence."""
+    return np.random.default_rng(sequence)
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from .batch_engine import RosterArrays
+from ..database_agent import data_version, player_rates, roster_snapshot
+from ..metrics import ROSTER_CACHE_LOOKUPS, timed
+
+
+def fetch_rosters(cur, team_names):
+    """
+    Fetch the precomputed rates of several teams' players with a single
+    query; player_rates only holds players with minutes.
+    """
+    cur.execute(f"""
+        SELECT r.current_team, p.name, p.position, {player_rates.ROSTER_COLUMNS}
+        FROM player_rates r
+        JOIN players p ON p.id = r.player_id
+        WHERE r.current_team = ANY(%s)
+        ORDER BY r.current_team, r.minutes_per_game DESC;
+    """, (list(team_names),))
+
+    players_by_team = {}
+    for row in cur.fetchall():
+        players_by_team.setdefault(row[0], []).append(row[1:])
+    return {team: RosterArrays.from_rates(players) for team, players in players_by_team.items()}
+
+
+def snapshot_rosters(team_names, version, cur=None):
+    """
+    Rosters of the named teams from the roster snapshot of data version, or
+    None when there is no such snapshot. Given a cursor, a missing snapshot
+    is exported first, so processes started after a load map the same files.
+    """
+    if version is None:
+        return None
+    snapshot = roster_snapshot.current()
+    if (snapshot is None or snapshot.version != version) and cur is not None:
+        try:
+            snapshot = roster_snapshot.export(cur)
+        except OSError as e:
+            print(f"Roster snapshot not written: {str(e)}")
+    if snapshot is None or snapshot.version != version:
+        return None
+    return snapshot.rosters(team_names)
+
+
+class RosterCache:
+    """
+    LRU cache of RosterArrays keyed by team name.
+
+    Cached rosters are served without touching the database until the TTL
+    runs out. After that, the next lookup reads the data_version row: if the
+    version is unchanged every entry stays valid for another TTL, otherwise
+    the cache is cleared. Loads in this process clear it immediately.
+    Misses are mapped from the roster snapshot of the cached version when
+    there is one, and read from player_rates otherwise.
+    """
+
+    def __init__(self, max_teams=64, ttl=300):
+        self.max_teams = max_teams
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._version = None
+        self._validated_at = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._validated_at = None
+            self._generation += 1
+
+    def _lookup(self, team_names):
+        """Split team names into cached rosters and misses. Caller holds the lock."""
+        found = {}
+        missing = []
+        for team in team_names:
+            roster = self._entries.get(team)
+            if roster is None:
+                missing.append(team)
+            else:
+                self._entries.move_to_end(team)
+                found[team] = roster
+        return found, missing
+
+    def get_many(self, team_names, connection):
+        """
+        Return {team: RosterArrays} for the teams that have players. connection
+        returns a connection context manager and is only called, once, when
+        the cache needs to revalidate or load a team.
+        """
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._validated_at is not None and now - self._validated_at < self.ttl
+            found, missing = self._lookup(team_names)
+            if fresh and not missing:
+                ROSTER_CACHE_LOOKUPS.labels('hit').inc(len(found))
+                return found
+            version = self._version
+            generation = self._generation
+
+        # Within the TTL a snapshot of the cached version needs no connection
+        loaded = None
+        if fresh:
+            with timed('roster_fetch'):
+                loaded = snapshot_rosters(missing, version)
+
+        if loaded is None:
+            with connection() as conn:
+                cur = conn.cursor()
+                if not fresh:
+                    version = data_version.current(cur)
+                    with self._lock:
+                        if version != self._version:
+                            self._entries.clear()
+                            self._version = version
+                        self._validated_at = now
+                        found, missing = self._lookup(team_names)
+
+                with self._lock:
+                    generation = self._generation
+                if missing:
+                    with timed('roster_fetch'):
+                        loaded = snapshot_rosters(missing, version, cur)
+                        if loaded is None:
+                            loaded = fetch_rosters(cur, missing)
+                else:
+                    loaded = {}
+                cur.close()
+
+        with self._lock:
+            # Skip storing rosters read while a load in this process invalidated the cache
+            if generation == self._generation:
+                self._entries.update(loaded)
+                while len(self._entries) > self.max_teams:
+                    self._entries.popitem(last=False)
+        ROSTER_CACHE_LOOKUPS.labels('hit').inc(len(found))
+        ROSTER_CACHE_LOOKUPS.labels('miss').inc(len(missing))
+        found.update(loaded)
+        return found
+
+    def version(self, connection):
+        """
+        Return the data version the cached rosters belong to. Like get_many,
+        this only calls connection to revalidate once the TTL has run out.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._validated_at is not None and now - self._validated_at < self.ttl:
+                return self._version
+
+        with connection() as conn:
+            cur = conn.cursor()
+            version = data_version.current(cur)
+            cur.close()
+
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._validated_at = now
+            return version
+
+
+roster_cache = RosterCache(
+    max_teams=int(os.getenv('ROSTER_CACHE_SIZE', '64')),
+    ttl=float(os.getenv('ROSTER_CACHE_TTL', '300'))
+)
+data_version.add_listener(roster_cache.invalidate)
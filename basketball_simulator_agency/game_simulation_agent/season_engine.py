@@ -0,0 +1,283 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .batch_engine import simulate_games
+
+# Conferences and divisions, using the team names of ScrapePlayersTool.NBA_TEAMS
+CONFERENCES = {
+    'East': {
+        'Atlantic': ['Boston Celtics', 'Brooklyn Nets', 'New York Knicks', 'Philadelphia 76ers', 'Toronto Raptors'],
+        'Central': ['Chicago Bulls', 'Cleveland Cavaliers', 'Detroit Pistons', 'Indiana Pacers', 'Milwaukee Bucks'],
+        'Southeast': ['Atlanta Hawks', 'Charlotte Hornets', 'Miami Heat', 'Orlando Magic', 'Washington Wizards']
+    },
+    'West': {
+        'Northwest': ['Denver Nuggets', 'Minnesota Timberwolves', 'Oklahoma City Thunder', 'Portland Trail Blazers', 'Utah Jazz'],
+        'Pacific': ['Golden State Warriors', 'LA Clippers', 'Los Angeles Lakers', 'Phoenix Suns', 'Sacramento Kings'],
+        'Southwest': ['Dallas Mavericks', 'Houston Rockets', 'Memphis Grizzlies', 'New Orleans Pelicans', 'San Antonio Spurs']
+    }
+}
+
+# Games per team in a season; win totals are tracked up to this many
+MAX_WINS = 82
+
+# Simulated games per pair of teams used to estimate head-to-head win probabilities
+DEFAULT_GAMES_PER_MATCHUP = 4000
+
+# Seasons simulated per vectorized pass, bounding memory for large runs
+SEASON_BATCH_SIZE = 2000
+
+# Seeds 1-6 go straight to the playoffs, 7-10 meet in the play-in
+PLAYOFF_SEEDS = 6
+PLAY_IN_SEEDS = 10
+
+# First-round pairings by seed; winners of adjacent pairs meet in round two
+BRACKET = [(1, 8), (4, 5), (3, 6), (2, 7)]
+
+# Playoff rounds reported per team, in order
+ROUNDS = ('playoffs', 'second_round', 'conference_finals', 'finals', 'champion')
+
+
+def conference_teams(conferences=CONFERENCES):
+    """Teams of each conference, in division order."""
+    return {
+        conference: [team for division in divisions.values() for team in division]
+        for conference, divisions in conferences.items()
+    }
+
+
+def generate_schedule(conferences=CONFERENCES):
+    """
+    Build an 82-game NBA-format schedule as (away_team, home_team) pairs.
+
+    Every team plays its division rivals 4 times, six conference opponents
+    4 times, the other four conference opponents 3 times and every team in
+    the other conference twice, with 41 home games each. The 3-game series
+    rotate between division pairs so each team hosts two of its four.
+    """
+    games = []
+
+    def series(home, away, home_games, away_games):
+        games.extend([(away, home)] * home_games)
+        games.extend([(home, away)] * away_games)
+
+    for divisions in conferences.values():
+        division_lists = list(divisions.values())
+        for teams in division_lists:
+            for i, home in enumerate(teams):
+                for away in teams[i + 1:]:
+                    series(home, away, 2, 2)
+
+        # Team i of one division plays teams i and i+1 of another only 3 times
+        for a in range(len(division_lists)):
+            for b in range(a + 1, len(division_lists)):
+                first, second = division_lists[a], division_lists[b]
+                size = len(first)
+                for i, team in enumerate(first):
+                    for j, opponent in enumerate(second):
+                        if j == i:
+                            series(team, opponent, 2, 1)
+                        elif j == (i + 1) % size:
+                            series(team, opponent, 1, 2)
+                        else:
+                            series(team, opponent, 2, 2)
+
+    east, west = conference_teams(conferences).values()
+    for home in east:
+        for away in west:
+            series(home, away, 1, 1)
+    return games
+
+
+def _simulate_pairs(task):
+    """Estimate the win probability of the first team of each pair inside a worker."""
+    pairs, rosters, games_per_matchup, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    probabilities = []
+    for first, second in pairs:
+        batch = simulate_games(rosters[first], rosters[second], games_per_matchup, rng)
+        wins = np.count_nonzero(batch.home_scores > batch.away_scores)
+        ties = np.count_nonzero(batch.home_scores == batch.away_scores)
+        probabilities.append((wins + 0.5 * ties) / games_per_matchup)
+    return probabilities
+
+
+def win_probability_matrix(teams, rosters, games_per_matchup=DEFAULT_GAMES_PER_MATCHUP,
+                           seed=None, max_workers=None):
+    """
+    Return P with P[i, j] the probability that teams[i] beats teams[j].
+
+    The game engine has no home-court term, so each pair of teams is
+    simulated once and P[j, i] = 1 - P[i, j]. Pairs are split into one
+    task per team, each with its own child of seed (an int or a
+    SeedSequence), across a process pool.
+    """
+    n_teams = len(teams)
+    tasks = []
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(n_teams)
+    for i, seed_sequence in enumerate(seeds):
+        pairs = [(teams[i], teams[j]) for j in range(i + 1, n_teams)]
+        if pairs:
+            needed = {team: rosters[team] for pair in pairs for team in pair}
+            tasks.append((pairs, needed, games_per_matchup, seed_sequence))
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_simulate_pairs, tasks))
+    else:
+        outputs = [_simulate_pairs(task) for task in tasks]
+
+    matrix = np.full((n_teams, n_teams), 0.5)
+    for i, probabilities in enumerate(outputs):
+        for offset, probability in enumerate(probabilities):
+            j = i + 1 + offset
+            matrix[i, j] = probability
+            matrix[j, i] = 1 - probability
+    return matrix
+
+
+def _order(wins, rng):
+    """Indices that sort each season's teams by wins, ties broken at random."""
+    keys = wins + rng.random(wins.shape)
+    return np.argsort(-keys, axis=1, kind='stable')
+
+
+def _series(matrix, first, second, rng, games=7):
+    """
+    Winners of best-of-games series between first[k] and second[k]. The
+    winner of a series is whoever takes a majority of all its games, so
+    every game is drawn at once instead of stopping at four wins.
+    """
+    p_first = matrix[first, second]
+    wins = (rng.random(first.shape + (games,)) < p_first[..., None]).sum(axis=-1)
+    return np.where(wins > games // 2, first, second)
+
+
+class SeasonProjection:
+    """Accumulated standings, seed and playoff counts over simulated seasons."""
+
+    def __init__(self, teams, conferences=CONFERENCES):
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.conferences = {
+            conference: np.array([self.index[team] for team in members])
+            for conference, members in conference_teams(conferences).items()
+        }
+        n_teams = len(self.teams)
+        self.seasons = 0
+        self.total_wins = np.zeros(n_teams)
+        self.win_counts = np.zeros((n_teams, MAX_WINS + 1), dtype=np.int64)
+        self.seed_counts = np.zeros((n_teams, max(len(m) for m in self.conferences.values())), dtype=np.int64)
+        self.round_counts = {name: np.zeros(n_teams, dtype=np.int64) for name in ('play_in',) + ROUNDS}
+
+    def add(self, wins, rounds, seeds):
+        self.seasons += len(wins)
+        self.total_wins += wins.sum(axis=0)
+        for team in range(len(self.teams)):
+            self.win_counts[team] += np.bincount(np.minimum(wins[:, team], MAX_WINS), minlength=MAX_WINS + 1)
+            self.seed_counts[team] += np.bincount(seeds[:, team], minlength=self.seed_counts.shape[1] + 1)[1:]
+        for name, reached in rounds.items():
+            self.round_counts[name] += reached.sum(axis=0)
+
+    def win_quantile(self, team, q):
+        cumulative = np.cumsum(self.win_counts[team])
+        return int(np.searchsorted(cumulative, q * self.seasons))
+
+    def summary(self):
+        """Projected standings per conference, ordered by average wins."""
+        standings = {}
+        for conference, members in self.conferences.items():
+            rows = []
+            for team in members:
+                rows.append({
+                    'team': self.teams[team],
+                    'wins': round(self.total_wins[team] / self.seasons, 1),
+                    'losses': round(MAX_WINS - self.total_wins[team] / self.seasons, 1),
+                    'wins_p10': self.win_quantile(team, 0.1),
+                    'wins_p90': self.win_quantile(team, 0.9),
+                    'seed_probabilities': {
+                        str(seed + 1): round(count / self.seasons, 4)
+                        for seed, count in enumerate(self.seed_counts[team][:len(members)])
+                    },
+                    **{name: round(counts[team] / self.seasons, 4) for name, counts in self.round_counts.items()}
+                })
+            rows.sort(key=lambda row: row['wins'], reverse=True)
+            standings[conference] = rows
+        return {'seasons': self.seasons, 'standings': standings}
+
+
+def simulate_postseason(matrix, projection, wins, rng):
+    """Seed each conference, play the play-in and the playoffs for a batch of seasons."""
+    n_seasons, n_teams = wins.shape
+    rounds = {name: np.zeros((n_seasons, n_teams), dtype=bool) for name in ('play_in',) + ROUNDS}
+    seeds = np.zeros((n_seasons, n_teams), dtype=np.int64)
+    rows = np.arange(n_seasons)
+    champions = []
+
+    for members in projection.conferences.values():
+        ranked = members[_order(wins[:, members], rng)]
+        seeds[rows[:, None], ranked] = np.arange(1, len(members) + 1)
+        by_seed = {seed: ranked[:, seed - 1] for seed in range(1, PLAY_IN_SEEDS + 1)}
+
+        # Play-in: 7 hosts 8 for the 7 seed, 9 hosts 10, the loser of 7-8
+        # hosts that winner for the 8 seed
+        for seed in range(PLAYOFF_SEEDS + 1, PLAY_IN_SEEDS + 1):
+            rounds['play_in'][rows, by_seed[seed]] = True
+        seventh = _series(matrix, by_seed[7], by_seed[8], rng, games=1)
+        loser = np.where(seventh == by_seed[7], by_seed[8], by_seed[7])
+        ninth = _series(matrix, by_seed[9], by_seed[10], rng, games=1)
+        eighth = _series(matrix, loser, ninth, rng, games=1)
+        by_seed[7], by_seed[8] = seventh, eighth
+
+        # Bracket rounds; venues do not matter since the engine has no home court
+        alive = [(by_seed[high], by_seed[low]) for high, low in BRACKET]
+        for high, low in alive:
+            rounds['playoffs'][rows, high] = True
+            rounds['playoffs'][rows, low] = True
+        winners = [_series(matrix, high, low, rng) for high, low in alive]
+        for name in ('second_round', 'conference_finals'):
+            for team in winners:
+                rounds[name][rows, team] = True
+            winners = [
+                _series(matrix, first, second, rng)
+                for first, second in zip(winners[::2], winners[1::2])
+            ]
+        champion = winners[0]
+        rounds['finals'][rows, champion] = True
+        champions.append(champion)
+
+    rounds['champion'][rows, _series(matrix, champions[0], champions[1], rng)] = True
+    return rounds, seeds
+
+
+def simulate_seasons(schedule, teams, matrix, n_seasons, seed=None,
+                     conferences=CONFERENCES, batch_size=SEASON_BATCH_SIZE):
+    """
+    Simulate n_seasons regular seasons and postseasons from a win probability
+    matrix. Every game of schedule is a Bernoulli draw, vectorized over a
+    batch of seasons at a time. Returns a SeasonProjection.
+    """
+    rng = np.random.default_rng(seed)
+    projection = SeasonProjection(teams, conferences)
+    index = projection.index
+    away = np.array([index[away_team] for away_team, _ in schedule])
+    home = np.array([index[home_team] for _, home_team in schedule])
+    p_home = matrix[home, away]
+
+    # One-hot game-to-team maps turn per-game results into win totals with a matmul
+    home_teams = np.zeros((len(schedule), len(teams)), dtype=np.float32)
+    home_teams[np.arange(len(schedule)), home] = 1
+    away_teams = np.zeros_like(home_teams)
+    away_teams[np.arange(len(schedule)), away] = 1
+
+    remaining = n_seasons
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        home_wins = (rng.random((size, len(schedule))) < p_home).astype(np.float32)
+        wins = (home_wins @ home_teams + (1 - home_wins) @ away_teams).astype(np.int64)
+        rounds, seeds = simulate_postseason(matrix, projection, wins, rng)
+        projection.add(wins, rounds, seeds)
+        remaining -= size
+    return projection
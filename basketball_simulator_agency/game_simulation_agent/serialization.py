@@ -0,0 +1,50 @@
+import json
+from ..metrics import timed
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install basketball_simulator_agency[msgpack]
+    msgpack = None
+
+# Response formats of the v2 API and their content types
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'msgpack': 'application/msgpack',
+    'text': 'text/plain; charset=utf-8'
+}
+DEFAULT_FORMAT = 'json'
+
+
+def available_formats():
+    return [fmt for fmt in CONTENT_TYPES if fmt != 'msgpack' or msgpack is not None]
+
+
+def negotiate(requested=None, accept=''):
+    """
+    Pick a response format from an explicit ?format= value, else from the
+    Accept header. Raises ValueError for an unknown or unavailable format.
+    """
+    if requested is None:
+        accept = accept or ''
+        if 'application/msgpack' in accept or 'application/x-msgpack' in accept:
+            requested = 'msgpack'
+        elif 'text/plain' in accept and 'application/json' not in accept:
+            requested = 'text'
+        else:
+            requested = DEFAULT_FORMAT
+    if requested not in available_formats():
+        raise ValueError(f"format must be one of {', '.join(available_formats())}")
+    return requested
+
+
+def encode(payload, fmt):
+    """
+    Serialize a payload of plain types to bytes in fmt; a 'text' payload is
+    already formatted and only encoded.
+    """
+    with timed('serialize'):
+        if fmt == 'text':
+            return payload.encode('utf-8')
+        if fmt == 'msgpack':
+            return msgpack.packb(payload, use_bin_type=True)
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,344 @@
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import numpy as np
+from .game_result import BOX_SCORE_COLUMNS
+from ..metrics import timed
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install basketball_simulator_agency[archive]
+    zstandard = None
+
+# Compression level of zstd partitions; deflate (np.savez_compressed) is used without zstandard
+ZSTD_LEVEL = int(os.getenv('SIMULATION_ARCHIVE_ZSTD_LEVEL', '10'))
+
+# File extension of new partitions; both kinds are read
+PARTITION_EXTENSION = '.npz.zst' if zstandard is not None else '.npz'
+
+# Index columns of an archived game, as returned by SimulationArchive.games
+GAME_COLUMNS = (
+    'run_id', 'game_index', 'game_date', 'away_team', 'home_team', 'home_score', 'away_score',
+    'ot_periods', 'home_win_probability', 'error', 'created_at', 'seed', 'mode', 'replications'
+)
+
+RUN_COLUMNS = ('id', 'game_date', 'created_at', 'seed', 'mode', 'replications', 'path')
+
+
+def slate_arrays(payload):
+    """
+    Columns of the simulated games of a slate payload (see
+    SimulateDailyGamesTool.slate_payload): one row per game, and one row per
+    player line with its game, side (0 home, 1 away) and stats. Names and
+    positions are stored once each and referenced by code.
+    """
+    indexed = [(index, entry) for index, entry in enumerate(payload['games']) if 'game' in entry]
+    games = [entry for _, entry in indexed]
+    lines = []
+    for game_row, entry in enumerate(games):
+        for side, key in enumerate(('home', 'away')):
+            for player in entry['game'][key]['players']:
+                lines.append((game_row, side, player))
+
+    names, name_codes = np.unique(np.array([line[2][0] for line in lines], dtype=str), return_inverse=True)
+    positions, position_codes = np.unique(
+        np.array([line[2][1] or '' for line in lines], dtype=str), return_inverse=True
+    )
+    arrays = {
+        'game_index': np.array([index for index, _ in indexed], dtype=np.int32),
+        'away_team': np.array([entry['away_team'] for entry in games], dtype=str),
+        'home_team': np.array([entry['home_team'] for entry in games], dtype=str),
+        'home_score': np.array([entry['game']['home']['score'] for entry in games], dtype=np.int32),
+        'away_score': np.array([entry['game']['away']['score'] for entry in games], dtype=np.int32),
+        'ot_periods': np.array([entry['game']['ot_periods'] for entry in games], dtype=np.int8),
+        'names': names,
+        'positions': positions,
+        'player_game': np.array([line[0] for line in lines], dtype=np.int32),
+        'player_side': np.array([line[1] for line in lines], dtype=np.int8),
+        'player_name': name_codes.astype(np.int32),
+        'player_position': position_codes.astype(np.int32)
+    }
+    # Minutes and each stat are their own column, after name and position in BOX_SCORE_COLUMNS
+    for offset, column in enumerate(BOX_SCORE_COLUMNS[2:], start=2):
+        arrays[column] = np.array([line[2][offset] for line in lines], dtype=np.int16)
+    return arrays
+
+
+def _write_partition(f, arrays):
+    """Write arrays to the binary file f in the format of PARTITION_EXTENSION."""
+    if zstandard is not None:
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        f.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(buffer.getvalue()))
+    else:
+        np.savez_compressed(f, **arrays)
+
+
+def _read_partition(path):
+    """Every array of a partition, by name."""
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path} needs the zstandard package")
+        with open(path, 'rb') as f:
+            source = io.BytesIO(zstandard.ZstdDecompressor().decompress(f.read()))
+    else:
+        source = path
+    with np.load(source) as partition:
+        return {name: partition[name] for name in partition.files}
+
+
+def _box_score(arrays, rows, team, score):
+    names = arrays['names']
+    positions = arrays['positions']
+    stat_columns = [arrays[column][rows].tolist() for column in BOX_SCORE_COLUMNS[2:]]
+    return {
+        'team': team,
+        'score': score,
+        'players': [
+            [str(names[name]), str(positions[position]) or None] + [column[i] for column in stat_columns]
+            for i, (name, position) in enumerate(zip(
+                arrays['player_name'][rows].tolist(), arrays['player_position'][rows].tolist()
+            ))
+        ]
+    }
+
+
+def _date_filter(column, start, end):
+    """SQL conditions and parameters keeping column between the ISO dates start and end."""
+    clauses, params = [], []
+    if start is not None:
+        clauses.append(f"{column} >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append(f"{column} <= ?")
+        params.append(end)
+    return clauses, params
+
+
+class SimulationArchive:
+    """
+    Append-only history of simulated daily slates.
+
+    Every run is written once, as a compressed columnar partition under
+    <directory>/<game date>/, and never rewritten. A SQLite index beside the
+    partitions holds one row per run and per game, with its date, matchup,
+    score and win probability, so backtests can select past predictions by
+    date and team straight from the index. Box scores are read from only
+    the partitions of the games asked for.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(directory, 'index.sqlite3'), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id TEXT PRIMARY KEY,
+                game_date TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                seed INTEGER,
+                mode TEXT,
+                replications INTEGER,
+                path TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS games (
+                run_id TEXT NOT NULL REFERENCES runs (id),
+                game_index INTEGER NOT NULL,
+                game_date TEXT NOT NULL,
+                away_team TEXT NOT NULL,
+                home_team TEXT NOT NULL,
+                home_score INTEGER,
+                away_score INTEGER,
+                ot_periods INTEGER,
+                home_win_probability REAL,
+                summary TEXT,
+                error TEXT,
+                PRIMARY KEY (run_id, game_index)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS runs_date_idx ON runs (game_date, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS games_date_idx ON games (game_date)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS games_home_idx ON games (home_team, game_date)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS games_away_idx ON games (away_team, game_date)")
+        self._lock = threading.Lock()
+
+    def append(self, payload):
+        """
+        Archive a slate payload (see SimulateDailyGamesTool.slate_payload) and
+        return its run ID. The partition is renamed into place before the
+        index rows are committed, so the index never points at a partial file.
+        """
+        run_id = uuid.uuid4().hex
+        created_at = time.time()
+        game_date = payload['date']
+        partition = os.path.join(self.directory, game_date)
+        os.makedirs(partition, exist_ok=True)
+
+        path = os.path.join(partition, run_id + PARTITION_EXTENSION)
+        with timed('archive_write'):
+            fd, staging = tempfile.mkstemp(prefix=f'.{run_id}.', dir=partition)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    _write_partition(f, slate_arrays(payload))
+                os.replace(staging, path)
+            except Exception:
+                os.remove(staging)
+                raise
+
+        games = []
+        for index, entry in enumerate(payload['games']):
+            game = entry.get('game')
+            summary = entry.get('summary')
+            games.append((
+                run_id, index, game_date, entry['away_team'], entry['home_team'],
+                game['home']['score'] if game else None,
+                game['away']['score'] if game else None,
+                game['ot_periods'] if game else None,
+                summary['home_win_probability'] if summary else None,
+                json.dumps(summary) if summary else None,
+                entry.get('error')
+            ))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO runs (id, game_date, created_at, seed, mode, replications, path) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, game_date, created_at, payload.get('seed'), payload.get('mode'),
+                     payload.get('replications'), os.path.relpath(path, self.directory))
+                )
+                self._conn.executemany(
+                    "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", games
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return run_id
+
+    def runs(self, start=None, end=None, limit=None):
+        """Archived runs with game dates from start to end (ISO dates, inclusive), oldest first."""
+        clauses, params = _date_filter('game_date', start, end)
+        query = f"""
+            SELECT {', '.join(RUN_COLUMNS)} FROM runs
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY game_date, created_at
+        """
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(RUN_COLUMNS, row)) for row in rows]
+
+    def run(self, run_id):
+        """One archived run as a dict, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(RUN_COLUMNS)} FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return dict(zip(RUN_COLUMNS, row)) if row else None
+
+    def games(self, start=None, end=None, team=None, home_team=None, away_team=None,
+              run_id=None, limit=None):
+        """
+        Index rows of archived games, oldest first, filtered by game date
+        (ISO dates, inclusive), a team on either side, either side's team and
+        run. Scores and win probabilities come from the index alone.
+        """
+        clauses, params = _date_filter('g.game_date', start, end)
+        if team is not None:
+            # Two indexed lookups rather than a scan for 'home OR away'
+            clauses.append("g.rowid IN (SELECT rowid FROM games WHERE home_team = ? "
+                           "UNION SELECT rowid FROM games WHERE away_team = ?)")
+            params += [team, team]
+        for column, value in (('home_team', home_team), ('away_team', away_team), ('run_id', run_id)):
+            if value is not None:
+                clauses.append(f"g.{column} = ?")
+                params.append(value)
+        query = f"""
+            SELECT g.run_id, g.game_index, g.game_date, g.away_team, g.home_team, g.home_score,
+                g.away_score, g.ot_periods, g.home_win_probability, g.error, r.created_at,
+                r.seed, r.mode, r.replications
+            FROM games g JOIN runs r ON r.id = g.run_id
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY g.game_date, r.created_at, g.game_index
+        """
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(GAME_COLUMNS, row)) for row in rows]
+
+    def summary(self, run_id, game_index):
+        """Replication summary of an archived game, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM games WHERE run_id = ? AND game_index = ?", (run_id, game_index)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def iter_box_scores(self, games):
+        """
+        Yield (index row, game dict) for each of games (rows from games()),
+        with the game in the format of GameResult.to_dict. Each partition is
+        read once, when its first game comes up; games without a simulated
+        result are skipped.
+        """
+        by_run = {}
+        for row in games:
+            if row['error'] is None:
+                by_run.setdefault(row['run_id'], []).append(row)
+
+        for run_id, rows in by_run.items():
+            run = self.run(run_id)
+            if run is None:
+                continue
+            with timed('archive_read'):
+                arrays = _read_partition(os.path.join(self.directory, run['path']))
+            slots = {index: slot for slot, index in enumerate(arrays['game_index'].tolist())}
+            for row in rows:
+                slot = slots.get(row['game_index'])
+                if slot is None:
+                    continue
+                home = np.flatnonzero((arrays['player_game'] == slot) & (arrays['player_side'] == 0))
+                away = np.flatnonzero((arrays['player_game'] == slot) & (arrays['player_side'] == 1))
+                yield row, {
+                    'home': _box_score(arrays, home, row['home_team'], int(arrays['home_score'][slot])),
+                    'away': _box_score(arrays, away, row['away_team'], int(arrays['away_score'][slot])),
+                    'ot_periods': int(arrays['ot_periods'][slot]),
+                    'columns': list(BOX_SCORE_COLUMNS),
+                    'seed': run['seed'],
+                    'mode': run['mode']
+                }
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """
+    The process's SimulationArchive in SIMULATION_ARCHIVE_DIR, opened on
+    first use. Without it the archive lives under the system temp dir,
+    which hosts such as Render wipe on every deploy or restart.
+    """
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            directory = os.getenv('SIMULATION_ARCHIVE_DIR')
+            if not directory:
+                directory = os.path.join(tempfile.gettempdir(), 'nba_sim_archive')
+                print(f"WARNING: SIMULATION_ARCHIVE_DIR not set; archiving simulations in temporary directory {directory}")
+            _archive = SimulationArchive(directory)
+        return _archive
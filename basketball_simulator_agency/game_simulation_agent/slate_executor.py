@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .game_result import GameResult
+from .monte_carlo import DEFAULT_ENGINE, ENGINES, MatchupAggregate
+from .rng import STREAM_CHUNK_SIZE, chunk_sequences, generator, matchup_sequence
+from ..metrics import SIMULATED_GAMES, timed
+
+# Replications of one game simulated per worker task, rounded to whole random
+# streams. Streams are fixed by the replication count, not the worker count,
+# so results do not depend on cores.
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class SlateGame:
+    """Simulation result for one game of a slate."""
+
+    __slots__ = ('away_team', 'home_team', 'game', 'aggregate')
+
+    def __init__(self, away_team, home_team, game, aggregate):
+        self.away_team = away_team
+        self.home_team = home_team
+        self.game = game
+        self.aggregate = aggregate
+
+
+def _simulate_chunk(task):
+    """
+    Simulate one chunk of replications of a game inside a worker process.
+    The first chunk also plays the sample game, the one SimulateGameTool
+    plays under seed: the first replication when there is only one, else a
+    batch of one on the first stream, as game 0 of a larger batch differs.
+    """
+    index, home_team, away_team, home, away, streams, keep_sample, engine, seed = task
+    simulate = ENGINES[engine]
+    aggregate = MatchupAggregate(home_team, away_team, home, away)
+    sample = None
+    for n_games, sequence in streams:
+        batch = simulate(home, away, n_games, generator(sequence))
+        aggregate.add(batch)
+        if keep_sample and sample is None:
+            if n_games > 1:
+                batch = simulate(home, away, 1, generator(sequence))
+            sample = GameResult.from_batch(batch, 0, home_team, away_team, home, away, seed, engine)
+    return index, sample, aggregate
+
+
+def _slate_tasks(games, rosters, replications, seed, chunk_size, engine):
+    """Worker tasks for a slate, in slate order, and the number of tasks of each game."""
+    streams_per_task = max(1, chunk_size // STREAM_CHUNK_SIZE)
+    tasks = []
+    counts = [0] * len(games)
+    for index, (away_team, home_team) in enumerate(games):
+        if home_team not in rosters or away_team not in rosters:
+            continue
+        streams = chunk_sequences(matchup_sequence(seed, home_team, away_team), replications)
+        for start in range(0, len(streams), streams_per_task):
+            tasks.append((
+                index, home_team, away_team,
+                rosters[home_team], rosters[away_team],
+                streams[start:start + streams_per_task], start == 0, engine, seed
+            ))
+            counts[index] += 1
+    return tasks, counts
+
+
+def _in_slate_order(games, outputs, remaining):
+    """
+    Merge task outputs, in any order, into one SlateGame per game and yield
+    (index, SlateGame or None) in slate order as each prefix completes.
+    """
+    results = [None] * len(games)
+    next_index = 0
+    for index, sample, aggregate in outputs:
+        if results[index] is None:
+            away_team, home_team = games[index]
+            results[index] = SlateGame(away_team, home_team, sample, aggregate)
+        else:
+            results[index].aggregate.merge(aggregate)
+            if sample is not None:
+                results[index].game = sample
+        remaining[index] -= 1
+        while next_index < len(games) and remaining[next_index] == 0:
+            yield next_index, results[next_index]
+            next_index += 1
+    while next_index < len(games):
+        yield next_index, results[next_index]
+        next_index += 1
+
+
+def _counted(slate, engine):
+    """Pass slate results through, counting their games in the parent process."""
+    games = SIMULATED_GAMES.labels(engine)
+    for index, slate_game in slate:
+        if slate_game is not None:
+            games.inc(slate_game.aggregate.runs)
+        yield index, slate_game
+
+
+def iter_slate(games, rosters, replications=1, seed=None,
+               max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, engine=DEFAULT_ENGINE):
+    """
+    Simulate every (away_team, home_team) game of a slate across a process
+    pool, yielding (index, SlateGame) for each game in slate order as soon
+    as it and every game before it are done; the SlateGame is None where a
+    roster is missing. Tasks are submitted in slate order, so the first
+    game arrives after about one game's worth of work.
+
+    rosters maps team names to RosterArrays and is fetched once by the caller.
+    Each game draws from its rng.matchup_sequence under seed, so a given
+    seed reproduces the slate exactly and every game matches a
+    monte_carlo.iter_matchup run of it with that seed. The sample game, a
+    GameResult, is the game SimulateGameTool plays under seed, so its seed
+    reproduces it; the aggregate covers every replication. engine names the monte_carlo.ENGINES entry that plays the games.
+    """
+    tasks, remaining = _slate_tasks(games, rosters, replications, seed, chunk_size, engine)
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        yield from _counted(_in_slate_order(games, map(_simulate_chunk, tasks), remaining), engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_simulate_chunk, task) for task in tasks]
+        try:
+            outputs = (future.result() for future in as_completed(futures))
+            yield from _counted(_in_slate_order(games, outputs, remaining), engine)
+        finally:
+            # A consumer that stops early does not wait for the rest of the slate
+            for future in futures:
+                future.cancel()
+
+
+def simulate_slate(games, rosters, replications=1, seed=None,
+                   max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, engine=DEFAULT_ENGINE):
+    """
+    Simulate a whole slate with iter_slate and return one SlateGame per
+    game, in order, or None where a roster is missing.
+    """
+    results = [None] * len(games)
+    with timed('simulate_slate'):
+        for index, slate_game in iter_slate(games, rosters, replications, seed,
+                                            max_workers, chunk_size, engine):
+            results[index] = slate_game
+    return results
@@ -1,10 +1,18 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from typing import Optional
+from datetime import date
 import os
+import traceback
 from .SimulateGameTool import SimulateGameTool
+from ..monte_carlo import DEFAULT_ENGINE, ENGINES
+from ..rng import resolve_seed
+from ..roster_cache import roster_cache
+from ..simulation_archive import get_archive
+from ..slate_executor import iter_slate
+from ...database_agent.connection_pool import get_connection
+from ...metrics import timed
+from ...web_scraper_agent.schedule import ScheduleFetcher, games_for_date
 
 class SimulateDailyGamesTool(BaseTool):
     """Tool for simulating all NBA games scheduled for today."""
@@ -13,114 +21,64 @@ class SimulateDailyGamesTool(BaseTool):
         default="/tmp/daily_simulations.txt",
         description="Path where the simulation results will be saved"
     )
-    db_name: str = Field(
-        description="Database name"
+    db_name: Optional[str] = Field(
+        default=None,
+        description="Database name; DATABASE_URL or the DB_* variables are used when omitted"
     )
-    db_user: str = Field(
+    db_user: Optional[str] = Field(
+        default=None,
         description="Database user"
     )
-    db_password: str = Field(
+    db_password: Optional[str] = Field(
+        default=None,
         description="Database password"
     )
     db_host: str = Field(
         description="Database host",
         default="localhost"
     )
+    replications: int = Field(
+        default=1,
+        ge=1,
+        description="Number of times to simulate each game; above one, win probabilities are reported"
+    )
+    seed: Optional[int] = Field(
+        default=None,
+        description="Seed for reproducible simulations; random when omitted"
+    )
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Number of worker processes; defaults to the number of CPU cores"
+    )
+    mode: str = Field(
+        default=DEFAULT_ENGINE,
+        description="Simulation engine: 'box' draws box-score totals, 'possession' plays every possession from shooting percentages"
+    )
+    game_date: Optional[str] = Field(
+        default=None,
+        description="Date of the games to simulate as YYYY-MM-DD; today when omitted"
+    )
+    schedule_fixture: Optional[str] = Field(
+        default=None,
+        description="ESPN schedule HTML file to read instead of fetching the schedule (offline mode)"
+    )
+    archive: bool = Field(
+        default=True,
+        description="Append every simulated slate to the simulation archive for backtesting"
+    )
+
+    def schedule_date(self):
+        """The date whose games are simulated."""
+        return date.fromisoformat(self.game_date) if self.game_date else date.today()
 
     def get_todays_games(self):
-        """Scrape today's NBA games from ESPN."""
+        """
+        Get the day's (away_team, home_team) games from the stored schedule,
+        which is refreshed from ESPN only when it has gone stale.
+        """
         try:
-            url = "https://www.espn.com/nba/schedule"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Map of ESPN team names to official names in our database
-            TEAM_NAME_MAP = {
-                'Atlanta': 'Atlanta Hawks',
-                'Boston': 'Boston Celtics',
-                'Brooklyn': 'Brooklyn Nets',
-                'Charlotte': 'Charlotte Hornets',
-                'Chicago': 'Chicago Bulls',
-                'Cleveland': 'Cleveland Cavaliers',
-                'Dallas': 'Dallas Mavericks',
-                'Denver': 'Denver Nuggets',
-                'Detroit': 'Detroit Pistons',
-                'Golden State': 'Golden State Warriors',
-                'Houston': 'Houston Rockets',
-                'Indiana': 'Indiana Pacers',
-                'LA': 'Los Angeles Clippers',
-                'Los Angeles': 'Los Angeles Lakers',
-                'Memphis': 'Memphis Grizzlies',
-                'Miami': 'Miami Heat',
-                'Milwaukee': 'Milwaukee Bucks',
-                'Minnesota': 'Minnesota Timberwolves',
-                'New Orleans': 'New Orleans Pelicans',
-                'New York': 'New York Knicks',
-                'Oklahoma City': 'Oklahoma City Thunder',
-                'Orlando': 'Orlando Magic',
-                'Philadelphia': 'Philadelphia 76ers',
-                'Phoenix': 'Phoenix Suns',
-                'Portland': 'Portland Trail Blazers',
-                'Sacramento': 'Sacramento Kings',
-                'San Antonio': 'San Antonio Spurs',
-                'Toronto': 'Toronto Raptors',
-                'Utah': 'Utah Jazz',
-                'Washington': 'Washington Wizards'
-            }
-            
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                print(f"Failed to fetch schedule: {response.status_code}")
-                return []
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            print("Fetched schedule page. Looking for games...")
-            
-            games = []
-            
-            # Find the first (current day) schedule table
-            schedule_table = soup.find('div', class_='ScheduleTables mb5 ScheduleTables--nba ScheduleTables--basketball')
-            if not schedule_table:
-                print("Could not find today's schedule table")
-                return []
-            
-            # Get the date from the table header
-            date_header = schedule_table.find('div', class_='Table__Title')
-            if date_header:
-                print(f"Processing games for: {date_header.text.strip()}")
-            
-            # Find all game rows in the table
-            game_rows = schedule_table.find_all('tr', class_='Table__TR')
-            print(f"Found {len(game_rows)} potential game rows")
-            
-            for row in game_rows:
-                # Skip header rows
-                if row.find('th'):
-                    continue
-                    
-                # Find away team
-                away_team_elem = row.find('td', class_=['Table__TD'])
-                if away_team_elem:
-                    away_team_name = away_team_elem.find('span', class_='Table__Team')
-                    if away_team_name:
-                        away_team = away_team_name.text.strip()
-                        
-                        # Find home team
-                        home_team_elem = away_team_elem.find_next_sibling('td', class_=['Table__TD'])
-                        if home_team_elem:
-                            home_team_name = home_team_elem.find('span', class_='Table__Team')
-                            if home_team_name:
-                                home_team = home_team_name.text.strip()
-                                
-                                # Map to official team names
-                                if away_team in TEAM_NAME_MAP and home_team in TEAM_NAME_MAP:
-                                    away_team_full = TEAM_NAME_MAP[away_team]
-                                    home_team_full = TEAM_NAME_MAP[home_team]
-                                    print(f"Found game: {away_team_full} @ {home_team_full}")
-                                    games.append((away_team_full, home_team_full))
-                                else:
-                                    print(f"Warning: Could not map team names: {away_team} @ {home_team}")
+            fetcher = ScheduleFetcher(fixture_path=self.schedule_fixture) if self.schedule_fixture else None
+            games = games_for_date(self.connection, self.schedule_date(), fetcher=fetcher)
             
             if not games:
                 print("No games found in today's schedule")
@@ -130,49 +88,193 @@ class SimulateDailyGamesTool(BaseTool):
             return games
             
         except Exception as e:
-            print(f"Error scraping schedule: {str(e)}")
+            print(f"Error getting schedule: {str(e)}")
             return []
 
+    def connection(self):
+        """Check out a pooled connection for the constructor parameters, if given."""
+        if self.db_name is None:
+            return get_connection()
+        return get_connection(
+            dbname=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            host=self.db_host
+        )
+
+    def get_rosters(self, team_names):
+        """Get the roster arrays of every team on the slate through the roster cache."""
+        return roster_cache.get_many(team_names, self.connection)
+
+    def format_summary(self, aggregate):
+        """One-line summary of the replications of a game."""
+        summary = aggregate.summary()
+        return (
+            f"\nWin Probability: {summary['home_team']} {summary['home_win_probability']:.1%} over "
+            f"{summary['runs']} simulations | Avg Score: {summary['home_score']:.1f} - "
+            f"{summary['away_score']:.1f} | Median Spread: {summary['spread']['quantiles']['p50']:+d}\n"
+        )
+
+    def schedule(self):
+        """
+        Fetch today's (away_team, home_team) games and the rosters of every
+        team on them; both are empty when no games are scheduled.
+        """
+        if self.mode not in ENGINES:
+            raise ValueError(f"Unknown mode: {self.mode} (expected one of {', '.join(ENGINES)})")
+
+        # Get today's games
+        print("\nFetching today's games...")
+        games = self.get_todays_games()
+        if not games:
+            return [], {}
+
+        # Fetch every roster once for the whole slate
+        return games, self.get_rosters({team for game in games for team in game})
+
+    def iter_games(self, games, rosters, seed):
+        """
+        Simulate the slate in parallel under seed, yielding (index, SlateGame)
+        in slate order as games finish; the SlateGame is None where a roster
+        is missing.
+        """
+        return iter_slate(
+            games, rosters,
+            replications=self.replications,
+            seed=seed,
+            max_workers=self.max_workers,
+            engine=self.mode
+        )
+
+    def simulate(self, seed):
+        """
+        Simulate today's slate under seed. Returns the (away_team, home_team)
+        games, their rosters and one SlateGame per game, None where a roster
+        is missing.
+        """
+        games, rosters = self.schedule()
+        with timed('simulate_slate'):
+            slate = [slate_game for _, slate_game in self.iter_games(games, rosters, seed)]
+        self.archive_slate(games, rosters, slate, seed)
+        return games, rosters, slate
+
+    def archive_slate(self, games, rosters, slate, seed):
+        """
+        Append a simulated slate to the simulation archive, unless archiving
+        is off or there were no games. Returns the run ID, or None; a failed
+        write is reported without failing the simulation.
+        """
+        if not self.archive or not games:
+            return None
+        try:
+            run_id = get_archive().append(self.slate_payload(games, rosters, slate, seed))
+            print(f"Archived simulation run {run_id}")
+            return run_id
+        except Exception as e:
+            # The slate is already simulated; losing its archive copy must not lose the results
+            print(f"Error archiving simulation run: {str(e)}")
+            print(traceback.format_exc())
+            return None
+
+    def missing_roster(self, rosters, away_team, home_team):
+        """Message for a game that could not be simulated."""
+        missing = home_team if home_team not in rosters else away_team
+        side = "home" if missing == home_team else "away"
+        return f"No players found for {side} team: {missing}"
+
+    def format_title(self):
+        today = self.schedule_date().strftime("%A, %B %d, %Y")
+        return f"NBA Game Simulations for {today}"
+
+    def format_header(self, seed):
+        """Heading of a formatted slate."""
+        result = f"{self.format_title()}\n"
+        result += f"Seed: {seed}\n"
+        result += "=" * 80 + "\n\n"
+        return result
+
+    def format_slate_game(self, rosters, away_team, home_team, slate_game):
+        """Format one game of a simulated slate for display."""
+        result = f"Game: {away_team} @ {home_team}\n"
+        result += "-" * 80 + "\n"
+        
+        if slate_game is None:
+            result += self.missing_roster(rosters, away_team, home_team)
+        else:
+            simulator = SimulateGameTool(
+                home_team=home_team,
+                away_team=away_team,
+                db_name=self.db_name,
+                db_user=self.db_user,
+                db_password=self.db_password,
+                db_host=self.db_host
+            )
+            result += simulator.format_game(slate_game.game.as_tuple())
+            if self.replications > 1:
+                result += self.format_summary(slate_game.aggregate)
+        
+        # Add game results
+        result += "\n" + "=" * 80 + "\n\n"
+        return result
+
+    def format_slate(self, games, rosters, slate, seed):
+        """Format every game of a simulated slate for display."""
+        result = self.format_header(seed)
+        for (away_team, home_team), slate_game in zip(games, slate):
+            result += self.format_slate_game(rosters, away_team, home_team, slate_game)
+        return result
+
+    def game_payload(self, rosters, away_team, home_team, slate_game):
+        """Structured result of one game of a slate, in plain types for serialization."""
+        entry = {'away_team': away_team, 'home_team': home_team}
+        if slate_game is None:
+            entry['error'] = self.missing_roster(rosters, away_team, home_team)
+        else:
+            entry['game'] = slate_game.game.to_dict()
+            if self.replications > 1:
+                entry['summary'] = slate_game.aggregate.summary()
+        return entry
+
+    def slate_payload(self, games, rosters, slate, seed):
+        """Structured results of a simulated slate, in plain types for serialization."""
+        return {
+            'date': self.schedule_date().isoformat(),
+            'seed': seed,
+            'replications': self.replications,
+            'mode': self.mode,
+            'games': [
+                self.game_payload(rosters, away_team, home_team, slate_game)
+                for (away_team, home_team), slate_game in zip(games, slate)
+            ]
+        }
+
     def run(self) -> str:
         """Run daily game simulations."""
         try:
-            # Get today's games
-            print("\nFetching today's games...")
-            games = self.get_todays_games()
+            seed = resolve_seed(self.seed)
+            games, rosters = self.schedule()
             if not games:
                 return "No games scheduled for today. (If this seems incorrect, there might be an issue with the schedule scraping)"
 
             # Create output directory if it doesn't exist
             os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
 
-            # Prepare the output
-            today = datetime.now().strftime("%A, %B %d, %Y")
-            result = f"NBA Game Simulations for {today}\n"
-            result += "=" * 80 + "\n\n"
-
-            # Simulate each game
-            for away_team, home_team in games:
-                result += f"Game: {away_team} @ {home_team}\n"
-                result += "-" * 80 + "\n"
-                
-                # Create a new simulator instance for each game with proper parameters
-                simulator = SimulateGameTool(
-                    home_team=home_team,
-                    away_team=away_team,
-                    db_name=self.db_name,
-                    db_user=self.db_user,
-                    db_password=self.db_password,
-                    db_host=self.db_host
-                )
-                game_result = simulator.run()
-                
-                # Add game results
-                result += game_result
-                result += "\n" + "=" * 80 + "\n\n"
-
-            # Save to file
+            # Write each game to the file as soon as it is simulated
+            result = self.format_header(seed)
+            slate = [None] * len(games)
             with open(self.output_file, 'w') as f:
                 f.write(result)
+                f.flush()
+                for index, slate_game in self.iter_games(games, rosters, seed):
+                    away_team, home_team = games[index]
+                    text = self.format_slate_game(rosters, away_team, home_team, slate_game)
+                    f.write(text)
+                    f.flush()
+                    result += text
+                    slate[index] = slate_game
+
+            # The output file only holds the latest run; the archive keeps them all
+            self.archive_slate(games, rosters, slate, seed)
 
             # Return the actual results instead of just a success message
             return result
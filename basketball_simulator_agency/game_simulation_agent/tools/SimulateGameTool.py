@@ -1,9 +1,14 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import psycopg2
-import random
+from typing import Optional
 from dotenv import load_dotenv
-import os
+from ..batch_engine import RosterArrays
+from ..game_result import GameResult
+from ..monte_carlo import DEFAULT_BATCH_SIZE, DEFAULT_ENGINE, ENGINES, iter_matchup
+from ..rng import game_sequence, generator, resolve_seed
+from ..roster_cache import roster_cache
+from ...database_agent.connection_pool import get_connection
+from ...metrics import SIMULATED_GAMES, timed
 
 class SimulateGameTool(BaseTool):
     """Tool for simulating a basketball game between two teams."""
@@ -14,13 +19,24 @@ class SimulateGameTool(BaseTool):
     away_team: str = Field(
         description="Name of the away team"
     )
-    db_name: str = Field(
-        description="Database name"
+    seed: Optional[int] = Field(
+        default=None,
+        description="Seed for reproducible simulations; random when omitted"
     )
-    db_user: str = Field(
+    mode: str = Field(
+        default=DEFAULT_ENGINE,
+        description="Simulation engine: 'box' draws box-score totals, 'possession' plays every possession from shooting percentages"
+    )
+    db_name: Optional[str] = Field(
+        default=None,
+        description="Database name; DATABASE_URL or the DB_* variables are used when omitted"
+    )
+    db_user: Optional[str] = Field(
+        default=None,
         description="Database user"
     )
-    db_password: str = Field(
+    db_password: Optional[str] = Field(
+        default=None,
         description="Database password"
     )
     db_host: str = Field(
@@ -28,102 +44,28 @@ class SimulateGameTool(BaseTool):
         default="localhost"
     )
 
-    def get_team_players(self, cur, team_name):
-        """Get players and their stats for a team."""
-        cur.execute("""
-            SELECT 
-                p.name,
-                p.position,
-                p.minutes_per_game,
-                p.points_per_game,
-                p.rebounds_per_game,
-                p.assists_per_game,
-                p.steals_per_game,
-                p.blocks_per_game,
-                p.field_goal_percentage,
-                p.three_point_percentage,
-                p.free_throw_percentage,
-                p.turnovers_per_game
-            FROM players p
-            WHERE p.current_team = %s
-            AND p.minutes_per_game > 0
-            ORDER BY p.minutes_per_game DESC;
-        """, (team_name,))
-        
-        return cur.fetchall()
-
     def simulate_game(self, home_players, away_players):
-        """Simulate a game between two teams."""
-        # Initialize game stats
-        home_score = 0
-        away_score = 0
-        home_box_score = []
-        away_box_score = []
-        is_overtime = False
-        overtime_periods = 0
-        
-        def adjust_minutes(players, is_ot=False):
-            """Adjust player minutes to sum to 240 (or more if overtime)"""
-            nonlocal overtime_periods
-            if is_ot:
-                overtime_periods = random.randint(1, 4)  # 1-4 OT periods
-            target_minutes = 240 if not is_ot else 240 + (5 * overtime_periods)
-            
-            # First pass: simulate minutes based on averages
-            box_score = []
-            total_minutes = 0
-            for player in players:
-                # Base minutes on player's average with some randomness
-                minutes = min(48, max(0, random.gauss(player[2], 2)))
-                total_minutes += minutes
-                box_score.append({
-                    'name': player[0],
-                    'position': player[1],
-                    'minutes': minutes,
-                    'original_mpg': player[2]  # Store original MPG for ratio calculations
-                })
-            
-            # Adjust minutes to hit target
-            scale_factor = target_minutes / total_minutes if total_minutes > 0 else 0
-            for player in box_score:
-                player['minutes'] = round(player['minutes'] * scale_factor)
-            
-            # Simulate other stats based on adjusted minutes
-            for player in box_score:
-                minutes = player['minutes']
-                mpg_ratio = minutes / player['original_mpg'] if player['original_mpg'] > 0 else 0
-                
-                # Calculate stats based on minutes played ratio
-                points = max(0, random.gauss(players[box_score.index(player)][3] * mpg_ratio, 3))
-                rebounds = max(0, random.gauss(players[box_score.index(player)][4] * mpg_ratio, 2))
-                assists = max(0, random.gauss(players[box_score.index(player)][5] * mpg_ratio, 2))
-                steals = max(0, random.gauss(players[box_score.index(player)][6] * mpg_ratio, 1))
-                blocks = max(0, random.gauss(players[box_score.index(player)][7] * mpg_ratio, 1))
-                turnovers = max(0, random.gauss(players[box_score.index(player)][11] * mpg_ratio, 1))
-                
-                # Update player stats
-                player.update({
-                    'points': int(points),
-                    'rebounds': int(rebounds),
-                    'assists': int(assists),
-                    'steals': int(steals),
-                    'blocks': int(blocks),
-                    'turnovers': int(turnovers)
-                })
-                
-            return box_score, sum(p['points'] for p in box_score)
-        
-        # Simulate initial 48 minutes
-        home_box_score, home_score = adjust_minutes(home_players)
-        away_box_score, away_score = adjust_minutes(away_players)
-        
-        # If scores are tied, simulate overtime
-        if home_score == away_score:
-            is_overtime = True
-            home_box_score, home_score = adjust_minutes(home_players, is_ot=True)
-            away_box_score, away_score = adjust_minutes(away_players, is_ot=True)
-        
-        return home_score, away_score, home_box_score, away_box_score, is_overtime, overtime_periods
+        """Simulate a game between two teams given as RosterArrays.from_rows player rows."""
+        home = RosterArrays.from_rows(home_players)
+        away = RosterArrays.from_rows(away_players)
+        batch = self.engine()(home, away, 1, self.rng())
+        return batch.game(0, home, away)
+
+    def simulate_games(self, home_players, away_players, n_games):
+        """Simulate a batch of games between two teams in one vectorized pass."""
+        home = RosterArrays.from_rows(home_players)
+        away = RosterArrays.from_rows(away_players)
+        return self.engine()(home, away, n_games, self.rng())
+
+    def engine(self):
+        """The game engine selected by mode."""
+        if self.mode not in ENGINES:
+            raise ValueError(f"Unknown mode: {self.mode} (expected one of {', '.join(ENGINES)})")
+        return ENGINES[self.mode]
+
+    def rng(self, seed=None):
+        """Generator on this matchup's single-game stream of seed, or of the seed field."""
+        return generator(game_sequence(self.seed if seed is None else seed, self.home_team, self.away_team))
 
     def format_box_score(self, team_name, box_score):
         """Format box score for display."""
@@ -142,44 +84,96 @@ class SimulateGameTool(BaseTool):
         
         return result
 
+    def format_game(self, game):
+        """Format the final score and both box scores of a simulated game."""
+        with timed('format'):
+            return self._format_game(game)
+
+    def _format_game(self, game):
+        home_score, away_score, home_box_score, away_box_score, is_overtime, ot_periods = game
+        
+        result = f"\nFinal Score: {self.home_team} {home_score} - {away_score} {self.away_team}"
+        if is_overtime:
+            result += f" ({ot_periods}OT)" if ot_periods == 1 else f" ({ot_periods}OTs)"
+        result += "\n"
+        result += self.format_box_score(self.home_team, home_box_score)
+        result += "\n"
+        result += self.format_box_score(self.away_team, away_box_score)
+        
+        return result
+
+    def connection(self):
+        """Check out a pooled connection for the constructor parameters, if given."""
+        if self.db_name is None:
+            return get_connection()
+        return get_connection(
+            dbname=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            host=self.db_host
+        )
+
+    def load_rosters(self):
+        """
+        Get roster arrays for both teams from the roster cache, which only
+        queries the database on a miss. A team without players maps to None.
+        """
+        rosters = roster_cache.get_many([self.home_team, self.away_team], self.connection)
+        return rosters.get(self.home_team), rosters.get(self.away_team)
+
+    def simulate_matchup(self, runs, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Simulate the matchup runs times. Returns a generator that yields the
+        running MatchupAggregate after every batch of games.
+        """
+        self.engine()
+        home, away = self.load_rosters()
+        
+        if home is None:
+            raise ValueError(f"No players found for home team: {self.home_team}")
+        if away is None:
+            raise ValueError(f"No players found for away team: {self.away_team}")
+        
+        return iter_matchup(
+            self.home_team, self.away_team, home, away, runs, batch_size,
+            seed=self.seed, engine=self.mode
+        )
+
+    def play(self, home, away, seed):
+        """Simulate one game between the rosters under seed and return its GameResult."""
+        with timed('simulate'):
+            batch = self.engine()(home, away, 1, self.rng(seed))
+        SIMULATED_GAMES.labels(self.mode).inc()
+        return GameResult.from_batch(batch, 0, self.home_team, self.away_team, home, away, seed, self.mode)
+
+    def simulate_result(self, seed):
+        """Simulate one game under seed; raises ValueError if a team has no players."""
+        home, away = self.load_rosters()
+        
+        if home is None:
+            raise ValueError(f"No players found for home team: {self.home_team}")
+        if away is None:
+            raise ValueError(f"No players found for away team: {self.away_team}")
+        
+        return self.play(home, away, seed)
+
+    def simulate(self, seed):
+        """Simulate one game under seed and return it formatted."""
+        home, away = self.load_rosters()
+        
+        if home is None:
+            return f"No players found for home team: {self.home_team}"
+        if away is None:
+            return f"No players found for away team: {self.away_team}"
+        
+        return self.format_game(self.play(home, away, seed).as_tuple())
+
     def run(self) -> str:
         """Run the game simulation."""
         try:
-            # Connect to the database using constructor parameters
-            conn = psycopg2.connect(
-                dbname=self.db_name,
-                user=self.db_user,
-                password=self.db_password,
-                host=self.db_host
-            )
-            
-            cur = conn.cursor()
-            
-            # Get players for both teams
-            home_players = self.get_team_players(cur, self.home_team)
-            away_players = self.get_team_players(cur, self.away_team)
-            
-            if not home_players:
-                return f"No players found for home team: {self.home_team}"
-            if not away_players:
-                return f"No players found for away team: {self.away_team}"
-            
-            # Simulate the game
-            home_score, away_score, home_box_score, away_box_score, is_overtime, ot_periods = self.simulate_game(home_players, away_players)
-            
-            # Format the results
-            result = f"\nFinal Score: {self.home_team} {home_score} - {away_score} {self.away_team}"
-            if is_overtime:
-                result += f" ({ot_periods}OT)" if ot_periods == 1 else f" ({ot_periods}OTs)"
-            result += "\n"
-            result += self.format_box_score(self.home_team, home_box_score)
-            result += "\n"
-            result += self.format_box_score(self.away_team, away_box_score)
-            
-            cur.close()
-            conn.close()
-            
-            return result
+            # Report the seed that reproduces the game
+            seed = resolve_seed(self.seed)
+            return self.simulate(seed) + f"\nSeed: {seed}\n"
 
         except Exception as e:
             return f"Error simulating game: {str(e)}"
@@ -0,0 +1,137 @@
+from agency_swarm.tools import BaseTool
+from pydantic import Field
+from typing import Optional
+import csv
+from ..rng import resolve_seed, seed_sequence
+from ..roster_cache import roster_cache
+from ..season_engine import (
+    CONFERENCES, DEFAULT_GAMES_PER_MATCHUP, conference_teams, generate_schedule,
+    simulate_seasons, win_probability_matrix
+)
+from ...database_agent.connection_pool import get_connection
+from ...metrics import timed
+from ...team_names import get_resolver
+
+class SimulateSeasonTool(BaseTool):
+    """Tool for simulating full NBA seasons and projecting standings and playoff odds."""
+
+    seasons: int = Field(
+        default=10000,
+        description="Number of seasons to simulate"
+    )
+    games_per_matchup: int = Field(
+        default=DEFAULT_GAMES_PER_MATCHUP,
+        description="Games simulated per pair of teams to estimate head-to-head win probabilities"
+    )
+    schedule_file: Optional[str] = Field(
+        default=None,
+        description="CSV with away_team and home_team columns; an NBA-format 82-game schedule is generated when omitted"
+    )
+    seed: Optional[int] = Field(
+        default=None,
+        description="Seed for reproducible simulations; random when omitted"
+    )
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Number of worker processes; defaults to the number of CPU cores"
+    )
+    db_name: Optional[str] = Field(
+        default=None,
+        description="Database name; DATABASE_URL or the DB_* variables are used when omitted"
+    )
+    db_user: Optional[str] = Field(
+        default=None,
+        description="Database user"
+    )
+    db_password: Optional[str] = Field(
+        default=None,
+        description="Database password"
+    )
+    db_host: str = Field(
+        description="Database host",
+        default="localhost"
+    )
+
+    def connection(self):
+        """Check out a pooled connection for the constructor parameters, if given."""
+        if self.db_name is None:
+            return get_connection()
+        return get_connection(
+            dbname=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            host=self.db_host
+        )
+
+    def get_rosters(self, teams):
+        """Get the roster arrays of every team, read under the name its players are stored with."""
+        with self.connection() as conn:
+            cur = conn.cursor()
+            resolver = get_resolver(cur)
+            cur.close()
+        stored = {team: resolver.resolve(team) or team for team in teams}
+        found = roster_cache.get_many(set(stored.values()), self.connection)
+        return {team: found[name] for team, name in stored.items() if name in found}
+
+    def load_schedule(self):
+        """Read (away_team, home_team) games from schedule_file, or generate a schedule."""
+        if self.schedule_file is None:
+            return generate_schedule()
+        with open(self.schedule_file, newline='', encoding='utf-8') as f:
+            return [(row['away_team'], row['home_team']) for row in csv.DictReader(f)]
+
+    def project(self, seed=None):
+        """Simulate the seasons under seed, or the seed field, and return the SeasonProjection."""
+        teams = [team for members in conference_teams(CONFERENCES).values() for team in members]
+        rosters = self.get_rosters(teams)
+        missing = [team for team in teams if team not in rosters]
+        if missing:
+            raise ValueError(f"No players found for: {', '.join(missing)}")
+
+        schedule = self.load_schedule()
+        unknown = {team for game in schedule for team in game} - set(teams)
+        if unknown:
+            raise ValueError(f"Unknown teams in schedule: {', '.join(sorted(unknown))}")
+
+        # Head-to-head odds come from the game engine; seasons are drawn from them
+        matrix_seed, season_seed = seed_sequence(self.seed if seed is None else seed).spawn(2)
+        print(f"Estimating head-to-head win probabilities ({self.games_per_matchup} games per matchup)...")
+        with timed('win_probability_matrix'):
+            matrix = win_probability_matrix(
+                teams, rosters,
+                games_per_matchup=self.games_per_matchup,
+                seed=matrix_seed,
+                max_workers=self.max_workers
+            )
+        print(f"Simulating {self.seasons} seasons of {len(schedule)} games...")
+        with timed('simulate_seasons'):
+            return simulate_seasons(schedule, teams, matrix, self.seasons, seed=season_seed)
+
+    def format_standings(self, summary):
+        """Format projected standings and playoff odds for display."""
+        result = f"Projected Standings over {summary['seasons']} simulated seasons\n"
+        for conference, rows in summary['standings'].items():
+            result += "\n" + "=" * 80 + "\n"
+            result += f"{conference} Conference\n"
+            result += "-" * 80 + "\n"
+            result += f"{'Team':<25} {'W':>5} {'L':>5} {'Range':>7} {'#1':>6} {'Playoff':>8} {'Finals':>7} {'Title':>6}\n"
+            result += "-" * 80 + "\n"
+            for row in rows:
+                result += f"{row['team']:<25} {row['wins']:>5.1f} {row['losses']:>5.1f} "
+                result += f"{row['wins_p10']:>3d}-{row['wins_p90']:<3d} {row['seed_probabilities']['1']:>6.1%} "
+                result += f"{row['playoffs']:>8.1%} {row['finals']:>7.1%} {row['champion']:>6.1%}\n"
+        return result
+
+    def run(self) -> str:
+        """Run the season simulation."""
+        try:
+            seed = resolve_seed(self.seed)
+            projection = self.project(seed)
+            return self.format_standings(projection.summary()) + f"\nSeed: {seed}\n"
+
+        except Exception as e:
+            return f"Error simulating season: {str(e)}"
+
+if __name__ == "__main__":
+    tool = SimulateSeasonTool()
+    print(tool.run())
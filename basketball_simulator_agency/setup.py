@@ -20,4 +20,12 @@ setup(
         'instructor>=0.4.5',
         'termcolor>=2.3.0',
     ],
+    extras_require={
+        # MessagePack responses from the v2 API
+        'msgpack': ['msgpack>=1.0.0'],
+        # Faster HTML parser backends for the scrapers
+        'fastparse': ['selectolax>=0.3.17', 'lxml>=4.9.0'],
+        # zstd-compressed simulation archive partitions
+        'archive': ['zstandard>=0.21.0'],
+    },
 ) 
\ No newline at end of file
@@ -0,0 +1,190 @@
+import re
+import threading
+import psycopg2
+from .database_agent import data_version
+from .database_agent.connection_pool import get_connection
+from .web_scraper_agent.tools.ScrapePlayersTool import ScrapePlayersTool
+
+# Abbreviations and nicknames of each franchise, keyed by its ScrapePlayersTool.NBA_TEAMS
+# name. Full names, cities, team nicknames and ESPN URL codes are derived.
+# ESPN lists the Clippers' city as 'LA' and the Lakers' as 'Los Angeles'.
+TEAM_ALIASES = {
+    'Atlanta Hawks': ('ATL',),
+    'Boston Celtics': ('BOS', 'Celts'),
+    'Brooklyn Nets': ('BKN', 'BRK'),
+    'Charlotte Hornets': ('CHA', 'CHO'),
+    'Chicago Bulls': ('CHI',),
+    'Cleveland Cavaliers': ('CLE', 'Cavs'),
+    'Dallas Mavericks': ('DAL', 'Mavs'),
+    'Denver Nuggets': ('DEN', 'Nugs'),
+    'Detroit Pistons': ('DET',),
+    'Golden State Warriors': ('GSW', 'Dubs'),
+    'Houston Rockets': ('HOU',),
+    'Indiana Pacers': ('IND',),
+    'LA Clippers': ('LAC', 'Los Angeles Clippers', 'Clips'),
+    'Los Angeles Lakers': ('LAL', 'LA Lakers'),
+    'Memphis Grizzlies': ('MEM', 'Grizz'),
+    'Miami Heat': ('MIA',),
+    'Milwaukee Bucks': ('MIL',),
+    'Minnesota Timberwolves': ('MIN', 'Wolves', 'T-Wolves'),
+    'New Orleans Pelicans': ('NOP', 'NOLA', 'Pels'),
+    'New York Knicks': ('NYK',),
+    'Oklahoma City Thunder': ('OKC',),
+    'Orlando Magic': ('ORL',),
+    'Philadelphia 76ers': ('PHI', 'Sixers'),
+    'Phoenix Suns': ('PHX', 'PHO'),
+    'Portland Trail Blazers': ('POR', 'Blazers'),
+    'Sacramento Kings': ('SAC',),
+    'San Antonio Spurs': ('SAS',),
+    'Toronto Raptors': ('TOR', 'Raps'),
+    'Utah Jazz': ('UTA',),
+    'Washington Wizards': ('WAS', 'Wiz')
+}
+
+# Team nicknames of more than one word, which the city split would cut
+MULTI_WORD_NICKNAMES = ('Trail Blazers',)
+
+# Queries shorter than this only match aliases exactly
+MIN_FUZZY_LENGTH = 3
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(name):
+    """Lowercase name with runs of punctuation and whitespace turned into single spaces."""
+    return _NON_ALPHANUMERIC.sub(' ', name.lower()).strip()
+
+
+def _trigrams(key):
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def _split(name):
+    """(city, nickname) of a full team name."""
+    for nickname in MULTI_WORD_NICKNAMES:
+        if name.endswith(' ' + nickname):
+            return name[:-len(nickname) - 1], nickname
+    city, _, nickname = name.rpartition(' ')
+    return city, nickname
+
+
+class TeamResolver:
+    """
+    In-memory index from team aliases to canonical team names.
+
+    Every franchise of nba_teams (name -> ESPN path) is known by its full
+    name, city, nickname, ESPN code and TEAM_ALIASES entries. A name from
+    db_teams that is one of those aliases becomes its franchise's canonical
+    name, so resolved names match the teams and players tables; other
+    db_teams names are franchises of their own.
+
+    Exact aliases are one dict lookup. Anything else is matched as a
+    substring of the aliases through a trigram index, the way ILIKE
+    '%name%' matched team names, without scanning them.
+    """
+
+    def __init__(self, nba_teams, db_teams=()):
+        franchises = {}
+        for name, path in nba_teams.items():
+            city, nickname = _split(name)
+            franchises[name] = [name, city, nickname, path.split('/')[0]] + list(TEAM_ALIASES.get(name, ()))
+
+        self._aliases = {}
+        for franchise, aliases in franchises.items():
+            for alias in aliases:
+                self._aliases.setdefault(normalize(alias), set()).add(franchise)
+
+        canonical = {franchise: franchise for franchise in franchises}
+        for name in db_teams:
+            owners = self._aliases.get(normalize(name), ())
+            if len(owners) == 1:
+                canonical[next(iter(owners))] = name
+            else:
+                canonical[name] = name
+                self._aliases.setdefault(normalize(name), set()).add(name)
+
+        # Aliases map straight to canonical names from here on
+        self._aliases = {
+            key: frozenset(canonical[franchise] for franchise in owners)
+            for key, owners in self._aliases.items()
+        }
+        self.teams = sorted(canonical.values())
+        self._trigram_index = {}
+        for key in self._aliases:
+            for trigram in _trigrams(key):
+                self._trigram_index.setdefault(trigram, set()).add(key)
+
+    def matches(self, name):
+        """Sorted canonical names name may refer to; empty when it matches none."""
+        key = normalize(name)
+        exact = self._aliases.get(key)
+        if exact is not None:
+            return sorted(exact)
+        if len(key) < MIN_FUZZY_LENGTH:
+            return []
+
+        # Only aliases sharing the query's rarest trigram can contain it
+        rarest = min((self._trigram_index.get(trigram, ()) for trigram in _trigrams(key)), key=len)
+        found = set()
+        for alias in rarest:
+            if key in alias:
+                found.update(self._aliases[alias])
+        return sorted(found)
+
+    def resolve(self, name):
+        """The canonical name of the one team name refers to, or None if it is unknown or ambiguous."""
+        found = self.matches(name)
+        return found[0] if len(found) == 1 else None
+
+
+_resolver = None
+_generation = 0
+_lock = threading.Lock()
+
+
+def _db_teams(cur):
+    cur.execute("SELECT name FROM teams")
+    return [row[0] for row in cur.fetchall()]
+
+
+def get_resolver(cur=None):
+    """
+    The process's TeamResolver, built on first use from NBA_TEAMS and the
+    teams table, read with cur or a pooled connection. It is rebuilt after
+    a load in this process changes the data. When the database cannot be
+    reached, a resolver of NBA_TEAMS alone is returned and not kept.
+    """
+    global _resolver
+    with _lock:
+        if _resolver is not None:
+            return _resolver
+        generation = _generation
+
+    if cur is not None:
+        db_teams = _db_teams(cur)
+    else:
+        try:
+            with get_connection() as conn:
+                cur = conn.cursor()
+                db_teams = _db_teams(cur)
+                cur.close()
+        except psycopg2.Error as e:
+            print(f"Resolving team names without the teams table: {str(e)}")
+            return TeamResolver(ScrapePlayersTool.NBA_TEAMS)
+
+    resolver = TeamResolver(ScrapePlayersTool.NBA_TEAMS, db_teams)
+    with _lock:
+        # Skip keeping a resolver read while a load in this process changed the teams
+        if generation == _generation:
+            _resolver = resolver
+    return resolver
+
+
+def invalidate():
+    global _resolver, _generation
+    with _lock:
+        _resolver = None
+        _generation += 1
+
+
+data_version.add_listener(invalidate)
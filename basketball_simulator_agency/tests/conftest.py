@@ -0,0 +1,21 @@
+import pytest
+from basketball_simulator_agency.game_simulation_agent.batch_engine import RosterArrays
+
+
+def roster_rows(team, shooting=(45.0, 35.0, 80.0), players=10):
+    """RosterArrays.from_rows player rows of a made-up team, best players first."""
+    rows = []
+    for index in range(players):
+        mpg = 36.0 - 3 * index
+        rows.append(
+            (f'{team} Player {index}', 'G' if index % 2 else 'F', mpg,
+             mpg * 0.6, mpg * 0.2, mpg * 0.12, mpg * 0.03, mpg * 0.02) +
+            tuple(shooting) + (mpg * 0.05,)
+        )
+    return rows
+
+
+@pytest.fixture
+def make_roster():
+    """Build RosterArrays for a made-up team; keyword arguments go to roster_rows."""
+    return lambda team, **kwargs: RosterArrays.from_rows(roster_rows(team, **kwargs))
@@ -0,0 +1,25 @@
+import numpy as np
+from basketball_simulator_agency.game_simulation_agent.batch_engine import MAX_OVERTIME_PERIODS
+from basketball_simulator_agency.game_simulation_agent.possession_engine import simulate_possessions
+
+
+def test_points_add_up_to_decided_scores(make_roster):
+    home, away = make_roster('Home'), make_roster('Away')
+    batch = simulate_possessions(home, away, 2000, np.random.default_rng(7))
+    np.testing.assert_array_equal(batch.home_stats[:, :, 0].sum(axis=1), batch.home_scores)
+    np.testing.assert_array_equal(batch.away_stats[:, :, 0].sum(axis=1), batch.away_scores)
+    assert (batch.home_scores != batch.away_scores).all()
+    assert batch.ot_periods.max() <= MAX_OVERTIME_PERIODS
+
+
+def test_rosters_that_cannot_score_stop_at_the_overtime_cap(make_roster):
+    # Players without scraped percentages are stored with 0 for each of them
+    home = make_roster('Home', shooting=(0, 0, 0))
+    away = make_roster('Away', shooting=(0, 0, 0))
+    batch = simulate_possessions(home, away, 50, np.random.default_rng(7))
+    assert (batch.ot_periods == MAX_OVERTIME_PERIODS).all()
+    assert (np.abs(batch.home_scores - batch.away_scores) == 1).all()
+    np.testing.assert_array_equal(
+        batch.home_stats[:, :, 0].sum(axis=1) + batch.away_stats[:, :, 0].sum(axis=1),
+        np.ones(50)
+    )
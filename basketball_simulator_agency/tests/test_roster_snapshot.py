@@ -0,0 +1,75 @@
+import os
+import pickle
+import numpy as np
+import pytest
+from basketball_simulator_agency.database_agent import roster_snapshot
+from basketball_simulator_agency.game_simulation_agent.batch_engine import STAT_NAMES, STAT_SIGMAS, MINUTES_SIGMA
+
+
+class RatesCursor:
+    """Cursor answering export's query with player_rates rows of one data version."""
+
+    def __init__(self, version, teams):
+        self.rows = []
+        for team, players in teams.items():
+            for name, mpg in players:
+                self.rows.append(
+                    (version, team, name, 'G', mpg, MINUTES_SIGMA) +
+                    tuple(0.1 * (index + 1) for index in range(len(STAT_NAMES))) +
+                    tuple(float(sigma) for sigma in STAT_SIGMAS) +
+                    (0.45, 0.35, 0.8)
+                )
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    yield str(tmp_path)
+    roster_snapshot._snapshots.clear()
+
+
+def export(directory, version, mpg=30.0):
+    teams = {'Boston Celtics': [('Jayson Tatum', mpg), ('Jaylen Brown', mpg - 2)]}
+    return roster_snapshot.export(RatesCursor(version, teams), directory)
+
+
+def test_roster_pickles_as_snapshot_reference(snapshot_dir):
+    roster = export(snapshot_dir, 1).roster('Boston Celtics')
+    data = pickle.dumps(roster)
+    assert b'load_roster' in data
+
+    roster_snapshot._snapshots.clear()
+    restored = pickle.loads(data)
+    assert restored.names == roster.names
+    np.testing.assert_array_equal(restored.rates, roster.rates)
+
+
+def test_roster_of_pruned_version_pickles_as_arrays(snapshot_dir):
+    roster = export(snapshot_dir, 1).roster('Boston Celtics')
+    export(snapshot_dir, 2, mpg=20.0)
+    export(snapshot_dir, 3, mpg=10.0)
+    assert not os.path.exists(os.path.join(snapshot_dir, 'v1'))
+
+    data = pickle.dumps(roster)
+    roster_snapshot._snapshots.clear()
+    restored = pickle.loads(data)
+    assert restored.names == roster.names
+    np.testing.assert_array_equal(restored.mpg, roster.mpg)
+    np.testing.assert_array_equal(restored.sigmas, roster.sigmas)
+
+
+def test_reference_to_pruned_version_reads_current_snapshot(snapshot_dir):
+    roster = export(snapshot_dir, 1).roster('Boston Celtics')
+    data = pickle.dumps(roster)
+    export(snapshot_dir, 2, mpg=20.0)
+    export(snapshot_dir, 3, mpg=10.0)
+
+    roster_snapshot._snapshots.clear()
+    restored = pickle.loads(data)
+    assert restored.names == roster.names
+    np.testing.assert_array_equal(restored.mpg, np.array([10.0, 8.0], dtype=np.float32))
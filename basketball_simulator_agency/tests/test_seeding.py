@@ -0,0 +1,26 @@
+import pytest
+from basketball_simulator_agency.game_simulation_agent.monte_carlo import ENGINES
+from basketball_simulator_agency.game_simulation_agent.slate_executor import iter_slate
+from basketball_simulator_agency.game_simulation_agent.tools.SimulateGameTool import SimulateGameTool
+
+HOME, AWAY = 'Boston Celtics', 'Miami Heat'
+
+
+@pytest.mark.parametrize('mode', sorted(ENGINES))
+@pytest.mark.parametrize('replications', [1, 1500])
+def test_slate_game_matches_single_game_of_its_seed(make_roster, mode, replications):
+    rosters = {HOME: make_roster(HOME), AWAY: make_roster(AWAY)}
+    [(_, slate_game)] = iter_slate([(AWAY, HOME)], rosters, replications=replications,
+                                   seed=42, max_workers=1, engine=mode)
+    assert slate_game.aggregate.runs == replications
+
+    tool = SimulateGameTool(home_team=HOME, away_team=AWAY, mode=mode)
+    single = tool.play(rosters[HOME], rosters[AWAY], slate_game.game.seed)
+    assert single.to_dict() == slate_game.game.to_dict()
+
+
+def test_seeds_give_different_games(make_roster):
+    home, away = make_roster(HOME), make_roster(AWAY)
+    tool = SimulateGameTool(home_team=HOME, away_team=AWAY)
+    games = {tuple(tool.play(home, away, seed).as_tuple()[:2]) for seed in range(10)}
+    assert len(games) > 1
@@ -0,0 +1,105 @@
+import pytest
+from basketball_simulator_agency.team_names import TeamResolver, normalize
+from basketball_simulator_agency.web_scraper_agent.tools.ScrapePlayersTool import ScrapePlayersTool
+
+# ESPN schedule city names and the teams the schedule parser mapped them to
+# before team names went through TeamResolver
+SCHEDULE_CITIES = {
+    'Atlanta': 'Atlanta Hawks',
+    'Boston': 'Boston Celtics',
+    'Brooklyn': 'Brooklyn Nets',
+    'Charlotte': 'Charlotte Hornets',
+    'Chicago': 'Chicago Bulls',
+    'Cleveland': 'Cleveland Cavaliers',
+    'Dallas': 'Dallas Mavericks',
+    'Denver': 'Denver Nuggets',
+    'Detroit': 'Detroit Pistons',
+    'Golden State': 'Golden State Warriors',
+    'Houston': 'Houston Rockets',
+    'Indiana': 'Indiana Pacers',
+    'LA': 'Los Angeles Clippers',
+    'Los Angeles': 'Los Angeles Lakers',
+    'Memphis': 'Memphis Grizzlies',
+    'Miami': 'Miami Heat',
+    'Milwaukee': 'Milwaukee Bucks',
+    'Minnesota': 'Minnesota Timberwolves',
+    'New Orleans': 'New Orleans Pelicans',
+    'New York': 'New York Knicks',
+    'Oklahoma City': 'Oklahoma City Thunder',
+    'Orlando': 'Orlando Magic',
+    'Philadelphia': 'Philadelphia 76ers',
+    'Phoenix': 'Phoenix Suns',
+    'Portland': 'Portland Trail Blazers',
+    'Sacramento': 'Sacramento Kings',
+    'San Antonio': 'San Antonio Spurs',
+    'Toronto': 'Toronto Raptors',
+    'Utah': 'Utah Jazz',
+    'Washington': 'Washington Wizards'
+}
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    """Resolver over a teams table that stores the Clippers as 'Los Angeles Clippers'."""
+    return TeamResolver(ScrapePlayersTool.NBA_TEAMS, SCHEDULE_CITIES.values())
+
+
+@pytest.mark.parametrize('city, team', sorted(SCHEDULE_CITIES.items()))
+def test_schedule_cities_resolve_as_before(resolver, city, team):
+    assert resolver.resolve(city) == team
+
+
+def test_la_is_the_clippers_and_los_angeles_the_lakers():
+    resolver = TeamResolver(ScrapePlayersTool.NBA_TEAMS)
+    assert resolver.resolve('LA') == 'LA Clippers'
+    assert resolver.resolve('Los Angeles') == 'Los Angeles Lakers'
+
+
+def test_database_name_becomes_canonical(resolver):
+    assert resolver.resolve('LA Clippers') == 'Los Angeles Clippers'
+    assert resolver.resolve('LAC') == 'Los Angeles Clippers'
+    assert 'LA Clippers' not in resolver.teams
+    assert len(resolver.teams) == 30
+
+
+def test_unknown_database_name_is_its_own_team():
+    resolver = TeamResolver(ScrapePlayersTool.NBA_TEAMS, ['Seattle SuperSonics'])
+    assert resolver.resolve('Seattle SuperSonics') == 'Seattle SuperSonics'
+    assert resolver.resolve('sonics') == 'Seattle SuperSonics'
+    assert len(resolver.teams) == 31
+
+
+@pytest.mark.parametrize('name, team', [
+    ('BOS', 'Boston Celtics'),
+    ('gsw', 'Golden State Warriors'),
+    ('Sixers', 'Philadelphia 76ers'),
+    ('Trail Blazers', 'Portland Trail Blazers'),
+    ('  new-york  KNICKS ', 'New York Knicks'),
+])
+def test_aliases_resolve_exactly(resolver, name, team):
+    assert resolver.matches(name) == [team]
+
+
+@pytest.mark.parametrize('name, team', [
+    ('Timber', 'Minnesota Timberwolves'),
+    ('nugg', 'Denver Nuggets'),
+    ('oklahoma', 'Oklahoma City Thunder'),
+])
+def test_substrings_match_through_trigrams(resolver, name, team):
+    assert resolver.matches(name) == [team]
+
+
+def test_ambiguous_name_matches_several_and_resolves_to_none(resolver):
+    found = resolver.matches('ers')
+    assert {'Philadelphia 76ers', 'Indiana Pacers', 'Los Angeles Lakers'} <= set(found)
+    assert resolver.resolve('ers') is None
+
+
+def test_short_and_unknown_names_match_nothing(resolver):
+    assert resolver.matches('bo') == []
+    assert resolver.matches('Seattle') == []
+    assert resolver.resolve('Seattle') is None
+
+
+def test_normalize():
+    assert normalize('  Philadelphia-76ers!! ') == 'philadelphia 76ers'
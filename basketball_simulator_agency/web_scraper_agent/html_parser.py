@@ -0,0 +1,134 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # optional: pip install basketball_simulator_agency[fastparse]
+    HTMLParser = None
+
+try:
+    import lxml
+except ImportError:  # optional: pip install basketball_simulator_agency[fastparse]
+    lxml = None
+
+# Parser backend used when none is named; 'auto' picks the fastest installed
+DEFAULT_BACKEND = os.getenv('HTML_PARSER', 'auto')
+
+
+def has_class(css_class):
+    """
+    SoupStrainer matcher for one class of a multi-valued class attribute,
+    which beautifulsoup4 passes either whole or split depending on version.
+    """
+    def match(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return css_class in classes
+    return match
+
+
+# Only these parts of a page are turned into a tree by the BeautifulSoup backends
+ROSTER_ROWS = SoupStrainer('tr', class_=has_class('Table__TR'))
+SCHEDULE_TABLES = SoupStrainer('div', class_=has_class('ScheduleTables'))
+
+
+class SoupBackend:
+    """
+    BeautifulSoup with a SoupStrainer, so only the roster rows or schedule
+    tables are built into a tree; features names the tree builder.
+    """
+
+    def __init__(self, features):
+        self.features = features
+
+    def roster_rows(self, html):
+        """Cells of every roster row as (text, link text or None) pairs."""
+        soup = BeautifulSoup(html, self.features, parse_only=ROSTER_ROWS)
+        rows = []
+        for row in soup.find_all('tr', class_='Table__TR'):
+            cells = []
+            for cell in row.find_all('td'):
+                link = cell.find('a')
+                cells.append((cell.get_text(strip=True), link.get_text(strip=True) if link else None))
+            rows.append(cells)
+        return rows
+
+    def schedule_tables(self, html):
+        """(title, [(away, home), ...]) for every dated table of a schedule page."""
+        soup = BeautifulSoup(html, self.features, parse_only=SCHEDULE_TABLES)
+        tables = []
+        for table in soup.find_all('div', class_='ScheduleTables'):
+            title = table.find('div', class_='Table__Title')
+            if title is None:
+                continue
+            games = []
+            for row in table.find_all('tr', class_='Table__TR'):
+                # Skip header rows
+                if row.find('th'):
+                    continue
+                teams = [cell.find('span', class_='Table__Team')
+                         for cell in row.find_all('td', class_='Table__TD', limit=2)]
+                if len(teams) == 2 and None not in teams:
+                    games.append((teams[0].get_text(strip=True), teams[1].get_text(strip=True)))
+            tables.append((title.get_text(strip=True), games))
+        return tables
+
+
+class SelectolaxBackend:
+    """selectolax's lexbor HTML parser, queried with CSS selectors."""
+
+    def roster_rows(self, html):
+        rows = []
+        for row in HTMLParser(html).css('tr.Table__TR'):
+            cells = []
+            for cell in row.css('td'):
+                link = cell.css_first('a')
+                cells.append((cell.text(strip=True), link.text(strip=True) if link else None))
+            if cells:
+                rows.append(cells)
+        return rows
+
+    def schedule_tables(self, html):
+        tables = []
+        for table in HTMLParser(html).css('div.ScheduleTables'):
+            title = table.css_first('div.Table__Title')
+            if title is None:
+                continue
+            games = []
+            for row in table.css('tr.Table__TR'):
+                if row.css_first('th') is not None:
+                    continue
+                teams = [cell.css_first('span.Table__Team') for cell in row.css('td.Table__TD')[:2]]
+                if len(teams) == 2 and None not in teams:
+                    games.append((teams[0].text(strip=True), teams[1].text(strip=True)))
+            tables.append((title.text(strip=True), games))
+        return tables
+
+
+BACKENDS = {'html.parser': SoupBackend('html.parser')}
+if lxml is not None:
+    BACKENDS['lxml'] = SoupBackend('lxml')
+if HTMLParser is not None:
+    BACKENDS['selectolax'] = SelectolaxBackend()
+
+# Fastest first
+AUTO_ORDER = ('selectolax', 'lxml', 'html.parser')
+
+
+def backend_name(name=None):
+    """
+    Resolve name, or DEFAULT_BACKEND, to an installed backend. Raises
+    ValueError for an unknown or uninstalled backend.
+    """
+    name = name or DEFAULT_BACKEND
+    if name == 'auto':
+        name = next(backend for backend in AUTO_ORDER if backend in BACKENDS)
+    if name not in BACKENDS:
+        raise ValueError(f"HTML parser must be one of auto, {', '.join(BACKENDS)}")
+    return name
+
+
+def get_backend(name=None):
+    """The parser backend called name, or DEFAULT_BACKEND."""
+    return BACKENDS[backend_name(name)]
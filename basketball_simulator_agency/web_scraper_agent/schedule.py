@@ -0,0 +1,195 @@
+import os
+from datetime import date, datetime, timedelta
+from .html_parser import get_backend
+from .http_client import REQUEST_TIMEOUT, create_session
+from ..metrics import timed
+from ..team_names import get_resolver
+
+# ESPN schedule page listing about a week of games from the given date
+SCHEDULE_URL = "https://www.espn.com/nba/schedule/_/date/{:%Y%m%d}"
+
+# Days of games fetched per refresh, starting at the requested date
+DEFAULT_RANGE_DAYS = 7
+
+# Seconds before a fetched date range is checked for changes again
+REFRESH_INTERVAL = float(os.getenv('SCHEDULE_REFRESH_INTERVAL', '3600'))
+
+# HTML file served instead of ESPN for every schedule request (offline mode)
+FIXTURE_PATH = os.getenv('SCHEDULE_FIXTURE') or None
+
+# Key of the transaction-level advisory lock that serializes refreshes
+SCHEDULE_LOCK_ID = 7410523
+
+
+def parse_schedule(html, parser=None, teams=None):
+    """
+    Parse an ESPN schedule page into {date: [(away_team, home_team), ...]},
+    one entry per dated table, using official team names. parser names the
+    html_parser backend; teams is the team_names.TeamResolver mapping ESPN's
+    city labels to team names (default: the shared one).
+    """
+    teams = teams or get_resolver()
+    with timed('scrape_parse'):
+        tables = get_backend(parser).schedule_tables(html)
+    schedule = {}
+    for title, rows in tables:
+        try:
+            game_date = datetime.strptime(title, "%A, %B %d, %Y").date()
+        except ValueError:
+            print(f"Skipping schedule table with unknown date: {title}")
+            continue
+
+        games = schedule.setdefault(game_date, [])
+        for away_team, home_team in rows:
+            away, home = teams.resolve(away_team), teams.resolve(home_team)
+            if away and home:
+                games.append((away, home))
+            else:
+                print(f"Warning: Could not map team names: {away_team} @ {home_team}")
+    return schedule
+
+
+class ScheduleFetcher:
+    """
+    Fetches schedule pages with conditional requests, or reads them from a
+    fixture file when fixture_path is set.
+    """
+
+    def __init__(self, fixture_path=FIXTURE_PATH, session=None):
+        self.fixture_path = fixture_path
+        self._session = session
+
+    def fetch(self, url, etag=None, last_modified=None):
+        """
+        Return (html, etag, last_modified); html is None when the server
+        answers 304 Not Modified to the validators of the previous fetch.
+        """
+        if self.fixture_path:
+            with open(self.fixture_path, encoding='utf-8') as f:
+                return f.read(), None, None
+
+        if self._session is None:
+            self._session = create_session(pool_size=1)
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        with timed('scrape_fetch'):
+            response = self._session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return None, etag, last_modified
+        response.raise_for_status()
+        return response.text, response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+
+def _stored_fetch(cur, url):
+    """ETag, Last-Modified and last covered date of a fetched page, or None."""
+    cur.execute("""
+        SELECT etag, last_modified, end_date
+        FROM schedule_fetches WHERE url = %s
+    """, (url,))
+    return cur.fetchone()
+
+
+def _covering_fetch_age(cur, game_date):
+    """Seconds since the date was last fetched, or None if it never was."""
+    cur.execute("""
+        SELECT EXTRACT(EPOCH FROM NOW() - MAX(fetched_at))
+        FROM schedule_fetches
+        WHERE %s BETWEEN start_date AND end_date
+    """, (game_date,))
+    age = cur.fetchone()[0]
+    return None if age is None else float(age)
+
+
+def store_schedule(cur, schedule):
+    """Replace the stored games of every date in schedule."""
+    for game_date, games in schedule.items():
+        cur.execute("DELETE FROM games WHERE game_date = %s", (game_date,))
+        for away_team, home_team in games:
+            cur.execute("""
+                INSERT INTO games (game_date, away_team, home_team) VALUES (%s, %s, %s)
+                ON CONFLICT DO NOTHING
+            """, (game_date, away_team, home_team))
+
+
+def refresh(conn, start_date, days=DEFAULT_RANGE_DAYS, fetcher=None):
+    """
+    Fetch and store the games of days dates from start_date, one schedule
+    page at a time, then commit. Pages fetched before are requested with
+    their ETag and Last-Modified, so an unchanged page costs a 304.
+    Returns the number of games stored.
+    """
+    fetcher = fetcher or ScheduleFetcher()
+    end_date = start_date + timedelta(days=days - 1)
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEDULE_LOCK_ID,))
+
+    stored = 0
+    page_date = start_date
+    while page_date <= end_date:
+        url = SCHEDULE_URL.format(page_date)
+        previous = _stored_fetch(cur, url)
+        etag, last_modified, covered_to = previous if previous else (None, None, None)
+        html, etag, last_modified = fetcher.fetch(url, etag, last_modified)
+
+        if html is None:
+            print(f"Schedule unchanged since last fetch: {url}")
+            cur.execute("UPDATE schedule_fetches SET fetched_at = NOW() WHERE url = %s", (url,))
+        else:
+            schedule = parse_schedule(html, teams=get_resolver(cur))
+            store_schedule(cur, schedule)
+            stored += sum(len(games) for games in schedule.values())
+            # A page with no dates from page_date on has nothing further to
+            # offer, so it covers the rest of the range
+            later = [game_date for game_date in schedule if game_date >= page_date]
+            covered_to = max(later) if later else end_date
+            cur.execute("""
+                INSERT INTO schedule_fetches (url, etag, last_modified, start_date, end_date, fetched_at)
+                VALUES (%s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = EXCLUDED.etag,
+                    last_modified = EXCLUDED.last_modified,
+                    start_date = EXCLUDED.start_date,
+                    end_date = EXCLUDED.end_date,
+                    fetched_at = NOW()
+            """, (url, etag, last_modified, page_date, covered_to))
+
+        page_date = covered_to + timedelta(days=1)
+    conn.commit()
+    cur.close()
+    return stored
+
+
+def games_on(cur, game_date):
+    """Stored (away_team, home_team) games of a date, from one indexed lookup."""
+    cur.execute("""
+        SELECT away_team, home_team FROM games
+        WHERE game_date = %s
+        ORDER BY id
+    """, (game_date,))
+    return cur.fetchall()
+
+
+def games_for_date(connection, game_date=None, fetcher=None, max_age=REFRESH_INTERVAL):
+    """
+    Games of game_date (default today). The stored schedule is refreshed
+    first only when that date has not been fetched within max_age seconds;
+    otherwise this is a single indexed query. A failed refresh falls back
+    to the games already stored.
+    """
+    game_date = game_date or date.today()
+    with connection() as conn:
+        cur = conn.cursor()
+        age = _covering_fetch_age(cur, game_date)
+        if age is None or age > max_age:
+            try:
+                stored = refresh(conn, game_date, fetcher=fetcher)
+                print(f"Refreshed schedule from {game_date}: {stored} games")
+            except Exception as e:
+                conn.rollback()
+                print(f"Error refreshing schedule, using stored games: {str(e)}")
+        games = games_on(cur, game_date)
+        cur.close()
+    return [tuple(game) for game in games]
@@ -1,10 +1,69 @@
 from agency_swarm.tools import BaseTool
 from pydantic import Field
-import os
-import pandas as pd
-import requests
-import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from ..http_client import HostLimiter, RateLimiter, create_session
+from ...metrics import timed
+
+# ESPN's internal API endpoint for player stats
+STATS_URL = "https://site.web.api.espn.com/apis/common/v3/sports/basketball/nba/statistics/byathlete"
+
+# CSV columns after the player name, in output order
+STAT_COLUMNS = [
+    'games_played', 'minutes_per_game', 'points_per_game',
+    'rebounds_per_game', 'assists_per_game', 'steals_per_game',
+    'blocks_per_game', 'field_goal_percentage', 'three_point_percentage',
+    'free_throw_percentage', 'turnovers_per_game'
+]
+
+# (category, value index) of each stat column in an athlete's categories
+STAT_SOURCES = {
+    'games_played': ('general', 0),
+    'minutes_per_game': ('general', 1),
+    'rebounds_per_game': ('general', 11),
+    'points_per_game': ('offensive', 0),
+    'field_goal_percentage': ('offensive', 3),
+    'three_point_percentage': ('offensive', 6),
+    'free_throw_percentage': ('offensive', 9),
+    'assists_per_game': ('offensive', 10),
+    'turnovers_per_game': ('offensive', 11),
+    'steals_per_game': ('defensive', 0),
+    'blocks_per_game': ('defensive', 1)
+}
+
+
+class StatsBuffer:
+    """
+    Column-oriented store for parsed player stats: a list of names plus one
+    packed float array per stat, so raw page JSON can be dropped as soon as
+    it is parsed.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.columns = {column: array('d') for column in STAT_COLUMNS}
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, stats):
+        self.names.append(name)
+        for column in STAT_COLUMNS:
+            self.columns[column].append(stats.get(column, 0))
+
+    def extend(self, rows):
+        for name, stats in rows:
+            self.add(name, stats)
+
+    def write_csv(self, path):
+        """Write every buffered row to path in a single pass."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name'] + STAT_COLUMNS)
+            columns = [self.columns[column] for column in STAT_COLUMNS]
+            writer.writerows([name] + [values[i] for values in columns] for i, name in enumerate(self.names))
+
 
 class ScrapePlayerStatsTool(BaseTool):
     """
@@ -15,109 +74,93 @@ class ScrapePlayerStatsTool(BaseTool):
         default="nba_player_stats.csv",
         description="Path where the CSV file will be saved"
     )
+    limit: int = Field(
+        default=50,
+        description="Number of players requested per API page"
+    )
+    max_concurrency: int = Field(
+        default=4,
+        description="Maximum number of API pages fetched at the same time"
+    )
+    requests_per_second: float = Field(
+        default=2.0,
+        description="Upper bound on the rate of API requests"
+    )
+
+    def parse_athlete(self, athlete):
+        """Extract (name, {stat column: value}) from one athlete entry."""
+        name = athlete['athlete']['displayName']
+        values = {category['name']: category['values'] for category in athlete['categories']}
+        stats = {}
+        for column, (category, index) in STAT_SOURCES.items():
+            if category in values:
+                stats[column] = float(values[category][index])
+        return name, stats
+
+    def parse_page(self, data):
+        """Parse every athlete of one API page, skipping malformed entries."""
+        rows = []
+        with timed('scrape_parse'):
+            for athlete in data.get('athletes') or []:
+                try:
+                    rows.append(self.parse_athlete(athlete))
+                except Exception as e:
+                    name = athlete.get('athlete', {}).get('displayName', 'unknown')
+                    print(f"Error processing player {name}: {str(e)}")
+        return rows
+
+    def fetch_page(self, session, limiter, rate_limiter, page):
+        """Fetch one page of the byathlete API and return its JSON."""
+        print(f"\nFetching page {page}...")
+        params = {
+            'region': 'us',
+            'lang': 'en',
+            'contentorigin': 'espn',
+            'isqualified': 'true',
+            'page': page,
+            'limit': self.limit,
+            'category': 'offensive',
+            'sort': 'offensive.avgPoints:desc'
+        }
+        rate_limiter.wait()
+        response = limiter.get(session, STATS_URL, params=params)
+        response.raise_for_status()
+        return response.json()
 
     def run(self):
         """Scrape player statistics from ESPN."""
         try:
             print("Starting player stats scraping...")
-            all_players = []
-            
-            # ESPN's internal API endpoint for player stats
-            url = "https://site.web.api.espn.com/apis/common/v3/sports/basketball/nba/statistics/byathlete?region=us&lang=en&contentorigin=espn&isqualified=true&page=1&limit=50&category=offensive&sort=offensive.avgPoints%3Adesc"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Create output file and write header
-            with open('nba_player_stats.csv', 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'name', 'games_played', 'minutes_per_game', 'points_per_game',
-                    'rebounds_per_game', 'assists_per_game', 'steals_per_game',
-                    'blocks_per_game', 'field_goal_percentage', 'three_point_percentage',
-                    'free_throw_percentage', 'turnovers_per_game'
-                ])
-            
-            page = 1
-            while True:
-                print(f"\nFetching page {page}...")
-                current_url = url.replace("page=1", f"page={page}")
-                
-                response = requests.get(current_url, headers=headers)
-                if response.status_code != 200:
-                    print(f"Error fetching page {page}: {response.status_code}")
-                    break
-                    
-                data = response.json()
-                
-                # Check if we have athlete data
-                if 'athletes' not in data or not data['athletes']:
-                    print("No more players found")
-                    break
-                
-                # Process each player
-                for athlete in data['athletes']:
+            buffer = StatsBuffer()
+
+            with create_session(pool_size=self.max_concurrency) as session:
+                limiter = HostLimiter(self.max_concurrency)
+                rate_limiter = RateLimiter(self.requests_per_second)
+
+                # The first page tells us how many pages there are
+                first = self.fetch_page(session, limiter, rate_limiter, 1)
+                pages = first.get('pagination', {}).get('pages', 1)
+                buffer.extend(self.parse_page(first))
+                del first
+
+                def fetch(page):
                     try:
-                        # Get basic info
-                        player_info = athlete['athlete']
-                        name = player_info['displayName']
-                        
-                        # Initialize stats dictionary
-                        stats = {}
-                        
-                        # Extract stats from each category
-                        for category in athlete['categories']:
-                            if category['name'] == 'general':
-                                stats['GP'] = float(category['values'][0])
-                                stats['MIN'] = float(category['values'][1])
-                                stats['REB'] = float(category['values'][11])
-                            elif category['name'] == 'offensive':
-                                stats['PTS'] = float(category['values'][0])
-                                stats['FG%'] = float(category['values'][3])
-                                stats['3P%'] = float(category['values'][6])
-                                stats['FT%'] = float(category['values'][9])
-                                stats['AST'] = float(category['values'][10])
-                                stats['TO'] = float(category['values'][11])
-                            elif category['name'] == 'defensive':
-                                stats['STL'] = float(category['values'][0])
-                                stats['BLK'] = float(category['values'][1])
-                        
-                        # Create player stats row
-                        player_stats = [
-                            name,
-                            stats.get('GP', 0),
-                            stats.get('MIN', 0),
-                            stats.get('PTS', 0),
-                            stats.get('REB', 0),
-                            stats.get('AST', 0),
-                            stats.get('STL', 0),
-                            stats.get('BLK', 0),
-                            stats.get('FG%', 0),
-                            stats.get('3P%', 0),
-                            stats.get('FT%', 0),
-                            stats.get('TO', 0)
-                        ]
-                        
-                        # Append to file immediately
-                        with open('nba_player_stats.csv', 'a', newline='', encoding='utf-8') as f:
-                            writer = csv.writer(f)
-                            writer.writerow(player_stats)
-                        
-                        print(f"Processed stats for {name}: {stats.get('PTS', 0)} PPG")
-                        
+                        return self.parse_page(self.fetch_page(session, limiter, rate_limiter, page))
                     except Exception as e:
-                        print(f"Error processing player {name if 'name' in locals() else 'unknown'}: {str(e)}")
-                        continue
-                
-                # Be nice to the API
-                time.sleep(2)
-                page += 1
-            
-            print(f"\nFinished! Scraped stats for all available players")
+                        print(f"Error fetching page {page}: {str(e)}")
+                        return []
+
+                # Pages come back in order; each is parsed inside its worker so
+                # only the compact rows are held until they reach the buffer
+                with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                    for rows in executor.map(fetch, range(2, pages + 1)):
+                        buffer.extend(rows)
+
+            buffer.write_csv(self.output_path)
+            print(f"\nFinished! Scraped stats for {len(buffer)} players across {pages} pages")
             return "Successfully scraped player stats"
-            
+
         except Exception as e:
             error_msg = f"Error scraping player stats: {str(e)}"
             print(error_msg)
-            return error_msg 
\ No newline at end of file
+            return error_msg
@@ -1,13 +1,28 @@
 import os
 import csv
-import requests
-from bs4 import BeautifulSoup
-from typing import ClassVar, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import Field
+from typing import ClassVar, Dict, List, Optional
 from agency_swarm.tools import BaseTool
+from ..html_parser import get_backend
+from ..http_client import HostLimiter, create_session
+from ...metrics import timed
 
 class ScrapePlayersTool(BaseTool):
     """Tool for scraping NBA players from ESPN."""
     
+    CSV_COLUMNS: ClassVar[List[str]] = ['name', 'current_team', 'position', 'number', 'height', 'weight', 'age', 'colleges']
+    
+    max_concurrency: int = Field(
+        default=6,
+        description="Maximum number of roster pages fetched from ESPN at the same time"
+    )
+    
+    parser: Optional[str] = Field(
+        default=None,
+        description="HTML parser backend: 'selectolax', 'lxml', 'html.parser' or 'auto' (default: HTML_PARSER env)"
+    )
+    
     NBA_TEAMS: ClassVar[Dict[str, str]] = {
         'Atlanta Hawks': 'atl/atlanta-hawks',
         'Boston Celtics': 'bos/boston-celtics',
@@ -45,11 +60,52 @@ class ScrapePlayersTool(BaseTool):
         """Get list of NBA teams."""
         return list(self.NBA_TEAMS.keys())
 
-    def scrape_team(self, team_name):
-        """Scrape a single team's roster."""
+    def parse_roster(self, html, team_name):
+        """Parse the player rows of an ESPN roster page."""
+        # Only the player rows are parsed; cells are (text, link text) pairs
+        with timed('scrape_parse'):
+            player_rows = get_backend(self.parser).roster_rows(html)
+        
+        players = []
+        for cells in player_rows:
+            if len(cells) >= 4:  # Make sure row has enough cells
+                try:
+                    # Prefer the name link's text over the whole cell
+                    name_text, name_link = cells[1]
+                    name = name_link if name_link is not None else name_text
+                    position = cells[2][0]
+                    
+                    # Get player number from first cell
+                    number_text = cells[0][0]
+                    # Remove any non-numeric characters except for decimal points
+                    number = ''.join(c for c in number_text if c.isdigit())
+                    
+                    players.append([name, team_name, position, number, '', '', '', ''])
+                except Exception as e:
+                    print(f"Error processing player: {str(e)}")
+                    continue
+        return players
+
+    def fetch_roster(self, session, limiter, team_name):
+        """Fetch and parse a single team's roster page."""
         if team_name not in self.NBA_TEAMS:
             raise ValueError(f"Invalid team name: {team_name}")
+        
+        print(f"Scraping {team_name} roster...")
+        team_path = self.NBA_TEAMS[team_name]
+        url = f"https://www.espn.com/nba/team/roster/_/name/{team_path}"
+        
+        response = limiter.get(session, url)
+        response.raise_for_status()
+        players = self.parse_roster(response.content, team_name)
+        print(f"Added {len(players)} players from {team_name}")
+        return players
 
+    def scrape_team(self, team_name):
+        """Scrape a single team's roster and append it to the CSV file."""
+        with create_session(pool_size=1) as session:
+            players = self.fetch_roster(session, HostLimiter(1), team_name)
+        
         # Initialize or append to CSV file
         file_exists = os.path.isfile('nba_active_players.csv')
         mode = 'a' if file_exists else 'w'
@@ -57,54 +113,28 @@ class ScrapePlayersTool(BaseTool):
         with open('nba_active_players.csv', mode, newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             if not file_exists:
-                writer.writerow(['name', 'current_team', 'position', 'number', 'height', 'weight', 'age', 'colleges'])
-
-            print(f"Scraping {team_name} roster...")
-            team_path = self.NBA_TEAMS[team_name]
-            url = f"https://www.espn.com/nba/team/roster/_/name/{team_path}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find all player rows
-            player_rows = soup.find_all('tr', class_='Table__TR')
-            
-            for row in player_rows:
-                cells = row.find_all('td')
-                if len(cells) >= 4:  # Make sure row has enough cells
-                    try:
-                        # Get the name element and its text
-                        name_element = cells[1].find('a')
-                        name = name_element.get_text(strip=True) if name_element else cells[1].get_text(strip=True)
-                        position = cells[2].get_text(strip=True)
-                        
-                        # Get player number from first cell
-                        number_text = cells[0].get_text(strip=True)
-                        # Remove any non-numeric characters except for decimal points
-                        number = ''.join(c for c in number_text if c.isdigit())
-                        
-                        # Write player data
-                        writer.writerow([name, team_name, position, number, '', '', '', ''])
-                        print(f"Added {name} (#{number if number else 'N/A'}) from {team_name}")
-                    except Exception as e:
-                        print(f"Error processing player: {str(e)}")
-                        continue
+                writer.writerow(self.CSV_COLUMNS)
+            writer.writerows(players)
 
     def run(self):
         """Create/update the active players CSV file."""
-        # Create/overwrite the CSV file
+        # Fetch every roster concurrently over one keep-alive session
+        with create_session(pool_size=self.max_concurrency) as session:
+            limiter = HostLimiter(self.max_concurrency)
+            
+            def scrape(team_name):
+                try:
+                    return self.fetch_roster(session, limiter, team_name)
+                except Exception as e:
+                    print(f"Error scraping {team_name}: {str(e)}")
+                    return []
+            
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                rosters = list(executor.map(scrape, self.NBA_TEAMS))
+        
+        # Create/overwrite the CSV file once, in team order
         with open('nba_active_players.csv', 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(['name', 'current_team', 'position', 'number', 'height', 'weight', 'age', 'colleges'])
-        
-        # Scrape each team's roster
-        for team_name in self.NBA_TEAMS:
-            try:
-                self.scrape_team(team_name)
-            except Exception as e:
-                print(f"Error scraping {team_name}: {str(e)}")
-                continue 
\ No newline at end of file
+            writer.writerow(self.CSV_COLUMNS)
+            for players in rosters:
+                writer.writerows(players)